@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Archive Helpers - Build zip archives of generated servers directly from memory.
+No temporary directories are involved: files go from the in-memory files dict
+into the archive, which can be produced whole or streamed chunk by chunk.
+"""
+
+import io
+import zipfile
+from typing import Iterator
+
+# Size of the uncompressed slices fed to the compressor between yields
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkBuffer(io.RawIOBase):
+    """Write-only, non-seekable byte sink that hands out what was written so far"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(archive_files: dict[str, str]) -> Iterator[bytes]:
+    """
+    Yield a zip archive of {archive path: text content} as it is compressed.
+
+    The first bytes are available as soon as the first slice of the first
+    file is compressed, so responses can start before the archive is complete.
+    """
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for path, content in archive_files.items():
+            data = content.encode("utf-8")
+            with zip_file.open(path, "w") as entry:
+                for start in range(0, len(data), CHUNK_SIZE):
+                    entry.write(data[start:start + CHUNK_SIZE])
+                    chunk = buffer.drain()
+                    if chunk:
+                        yield chunk
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    yield buffer.drain()
+
+
+def server_archive_files(name: str, files: dict[str, str]) -> dict[str, str]:
+    """Map generated files into the '<name>/<filename>' layout of the archive"""
+    return {f"{name}/{filename}": content for filename, content in files.items()}
+
+
+def build_zip(archive_files: dict[str, str]) -> bytes:
+    """Build a complete zip archive in memory"""
+    return b"".join(iter_zip(archive_files))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Batch Generation - Render MCP servers in parallel on a process pool.
+Used by the /api/generate-batch endpoint and the generate_mcp_servers_batch tool,
+and to shard the tools, resources and prompts of a single huge server.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import server_templates
+from generation_cache import GenerationCache, cache_key
+
+# Batches with fewer uncached servers than this are rendered inline; the
+# pickling round trip costs more than rendering a couple of small servers.
+MIN_PARALLEL_JOBS = 2
+
+# Sharded rendering: smallest shard worth shipping to a worker, and how many
+# shards to create per worker so uneven items still balance across processes
+MIN_SHARD_SIZE = 256
+SHARDS_PER_WORKER = 4
+
+# Work lost to a dead worker process is retried on a fresh pool, up to this many tries in all
+POOL_ATTEMPTS = 2
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    """
+    Number of worker processes of the shared pool.
+
+    Raises:
+        ValueError: If MCP_GENERATOR_WORKERS is set to anything but a non-negative integer
+    """
+    setting = os.environ.get("MCP_GENERATOR_WORKERS", "").strip()
+    try:
+        workers = int(setting or 0)
+    except ValueError:
+        workers = -1
+    if workers < 0:
+        raise ValueError(f"MCP_GENERATOR_WORKERS must be a number of worker processes (0 for the CPU count), got {setting!r}")
+    return workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, starting it on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=pool_size())
+    return _process_pool
+
+
+def discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a pool whose worker died (it cannot run anything again); the next use starts a fresh one"""
+    global _process_pool
+    if _process_pool is pool:
+        _process_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared process pool (it is restarted on next use)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def validate_job(job: dict) -> Optional[str]:
+    """Return an error message if a batch entry is malformed"""
+    if not isinstance(job, dict):
+        return "Batch entry must be an object"
+    if not job.get("name") or not isinstance(job["name"], str):
+        return "Server name is required"
+    if not job.get("description"):
+        return "Description is required"
+    if job.get("server_type") not in server_templates.SERVER_TYPES:
+        return f"Unknown server type: {job.get('server_type')}"
+    return None
+
+
+def render_job(job: dict) -> dict:
+    """Render one batch entry (runs in a worker process)"""
+    return server_templates.render_server(
+        job["name"], job["description"], job["server_type"], job.get("config") or {}
+    )
+
+
+async def render_jobs_on_pool(jobs: list[dict]) -> list:
+    """
+    Render jobs on the shared pool, returning each result or exception in order.
+    Jobs lost to a dead worker are retried on a fresh pool; if they are lost
+    again, their BrokenProcessPool is reported as their outcome.
+    """
+    loop = asyncio.get_running_loop()
+    outcomes: list = [None] * len(jobs)
+    remaining = list(range(len(jobs)))
+
+    async def render(pool: ProcessPoolExecutor, job: dict) -> dict:
+        # Submitting to a broken pool raises at once; inside a coroutine that becomes the outcome
+        return await loop.run_in_executor(pool, render_job, job)
+
+    for _ in range(POOL_ATTEMPTS):
+        pool = get_process_pool()
+        results = await asyncio.gather(*[render(pool, jobs[index]) for index in remaining], return_exceptions=True)
+        for index, result in zip(remaining, results):
+            outcomes[index] = result
+        remaining = [index for index, result in zip(remaining, results) if isinstance(result, BrokenProcessPool)]
+        if not remaining:
+            break
+        discard_broken_pool(pool)
+    return outcomes
+
+
+async def generate_batch(jobs: list[dict], cache: Optional[GenerationCache] = None) -> list[dict]:
+    """
+    Generate every server of a batch, rendering cache misses in parallel.
+
+    Args:
+        jobs: List of {"name", "description", "server_type", "config"} entries
+        cache: Optional generation cache consulted before and filled after rendering
+
+    Returns:
+        One status dict per job, in order, with 'name', 'success', 'message'
+        and (on success) 'files' mapping filenames to contents
+    """
+    results: list[Optional[dict]] = [None] * len(jobs)
+    pending: list[tuple[int, str]] = []
+    seen_names = set()
+
+    for index, job in enumerate(jobs):
+        error = validate_job(job)
+        name = job.get("name") if isinstance(job, dict) else None
+        if error is None and name in seen_names:
+            error = f"Duplicate server name: {name}"
+        if error:
+            results[index] = {"name": name, "success": False, "message": error}
+            continue
+        seen_names.add(name)
+
+        key = cache_key(name, job["description"], job["server_type"], job.get("config") or {})
+        files = cache.get(key) if cache else None
+        if files is not None:
+            results[index] = {"name": name, "success": True, "message": "Served from cache", "files": files}
+        else:
+            pending.append((index, key))
+
+    if len(pending) >= MIN_PARALLEL_JOBS:
+        outcomes = await render_jobs_on_pool([jobs[index] for index, _ in pending])
+    else:
+        outcomes = []
+        for index, _ in pending:
+            try:
+                outcomes.append(render_job(jobs[index]))
+            except Exception as e:
+                outcomes.append(e)
+
+    for (index, key), outcome in zip(pending, outcomes):
+        name = jobs[index]["name"]
+        if isinstance(outcome, BaseException):
+            results[index] = {"name": name, "success": False, "message": f"Error generating server: {outcome}"}
+            continue
+        if cache:
+            cache.put(key, outcome)
+        results[index] = {"name": name, "success": True, "message": "Generated", "files": outcome}
+
+    return results
+
+
+def batch_archive_files(results: list[dict]) -> dict[str, str]:
+    """Lay out every successful server of a batch as '<name>/<filename>' archive entries"""
+    archive_files = {}
+    for result in results:
+        if result["success"]:
+            for filename, content in result["files"].items():
+                archive_files[f"{result['name']}/{filename}"] = content
+    return archive_files
+
+
+def batch_status(results: list[dict]) -> list[dict]:
+    """Per-config status without file contents"""
+    return [
+        {
+            "name": result["name"],
+            "success": result["success"],
+            "message": result["message"],
+            "files": list(result["files"]) if result["success"] else []
+        }
+        for result in results
+    ]
+
+
+def render_shard(server_type: str, section: str, items: list[dict], options: dict) -> list[tuple[str, ...]]:
+    """Render the fragments of a slice of one config section (runs in a worker process)"""
+    return [server_templates.render_item(server_type, section, item, options) for item in items]
+
+
+def split_shards(items: list, workers: int) -> list[list]:
+    """Split items into contiguous, order-preserving shards"""
+    shard_size = max(MIN_SHARD_SIZE, -(-len(items) // (workers * SHARDS_PER_WORKER)))
+    return [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
+
+
+def render_server_sharded(name: str, description: str, server_type: str, config: dict,
+                          workers: Optional[int] = None) -> dict:
+    """
+    Render one server with its sections split into shards across worker processes.
+
+    Every shard renders its item fragments independently; the
+    shards are stitched back in their original order, so the output is
+    byte-identical to server_templates.render_server. Configs too small to
+    split are rendered serially.
+    """
+    slots = server_templates.section_slots(server_type)
+    options = server_templates.resolve_options(server_type, config)
+    workers = workers or pool_size()
+
+    sharded = {
+        section: split_shards(config.get(section, []), workers)
+        for section in slots
+    }
+    if workers <= 1 or sum(len(shards) for shards in sharded.values()) < MIN_PARALLEL_JOBS:
+        return server_templates.render_server(name, description, server_type, config)
+
+    for attempt in range(POOL_ATTEMPTS):
+        pool = get_process_pool()
+        try:
+            futures = {
+                section: [pool.submit(render_shard, server_type, section, shard, options) for shard in shards]
+                for section, shards in sharded.items()
+            }
+            sections = {
+                section: [fragment for future in section_futures for fragment in future.result()]
+                for section, section_futures in futures.items()
+            }
+            break
+        except BrokenProcessPool:
+            discard_broken_pool(pool)
+            if attempt == POOL_ATTEMPTS - 1:
+                raise
+    features = server_templates.config_features(server_type, config, options)
+    return server_templates.assemble_server(name, description, server_type, sections, options, features)
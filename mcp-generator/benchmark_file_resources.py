@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+File Resource Benchmark - Compares the mmap-backed file resources of generated
+servers with reading the whole file through Path.read_text() on every request.
+
+Every mode runs in a fresh child process, so the peak RSS it reports is its own
+(RSS is not available on Windows).
+
+Usage:
+    python benchmark_file_resources.py
+    python benchmark_file_resources.py --size-mb 2048 --chunk-kb 1024 --json
+"""
+
+import argparse
+import base64
+import json
+import mmap
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from resource_templates import FILE_RUNTIME
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MODES = ("read_text/chunk", "mmap/chunk", "read_text/scan", "mmap/scan")
+
+
+def load_file_resource():
+    """Execute the generated FileResource runtime exactly as a generated server would"""
+    namespace = {
+        "__file__": __file__, "base64": base64, "json": json, "mmap": mmap, "os": os,
+        "parse_qs": parse_qs, "urlsplit": urlsplit
+    }
+    exec(compile(FILE_RUNTIME.render(), "<file_runtime>", "exec"), namespace)
+    return namespace["FileResource"]
+
+
+def write_test_file(path: Path, size_mb: int) -> None:
+    """Write size_mb MiB of numbered log lines"""
+    block = "".join([f"2024-01-01T00:00:00 INFO request {i:08d} served\n" for i in range(20000)]).encode()
+    with open(path, "wb") as file:
+        remaining = size_mb * 1024 * 1024
+        while remaining > 0:
+            file.write(block[:remaining])
+            remaining -= len(block)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+def run_child(mode: str, path: str, chunk_size: int, requests: int) -> dict:
+    """Serve chunks in one mode and report time, bytes served and peak RSS"""
+    size = os.path.getsize(path)
+    chunks = -(-size // chunk_size)
+    picks = random.Random(42).sample(range(chunks), min(requests, chunks))
+    indexes = picks if mode.endswith("/chunk") else range(chunks)
+    served = 0
+
+    start = time.perf_counter()
+    if mode == "read_text/chunk":
+        for index in indexes:
+            text = Path(path).read_text()
+            served += len(text[index * chunk_size:(index + 1) * chunk_size])
+    elif mode == "read_text/scan":
+        text = Path(path).read_text()
+        for index in indexes:
+            served += len(text[index * chunk_size:(index + 1) * chunk_size])
+    else:
+        file_resource = load_file_resource()(path, chunk_size=chunk_size, encoding="text")
+        for index in indexes:
+            served += len(file_resource.read(f"file://bench?chunk={index}"))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "requests": len(indexes),
+        "seconds": elapsed,
+        "served_bytes": served,
+        "peak_rss_mb": peak_rss_mb()
+    }
+
+
+def run(size_mb: int, chunk_kb: int, requests: int) -> list[dict]:
+    """Benchmark every mode against one generated test file"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.log"
+        write_test_file(path, size_mb)
+        for mode in MODES:
+            child = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--file", str(path),
+                 "--chunk-kb", str(chunk_kb), "--requests", str(requests)],
+                check=True, capture_output=True, text=True
+            )
+            result = json.loads(child.stdout)
+            result["ms_per_request"] = round(result["seconds"] * 1000 / result["requests"], 3)
+            result["mb_per_s"] = round(result["served_bytes"] / 1024 / 1024 / result["seconds"], 1)
+            result["seconds"] = round(result["seconds"], 4)
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mmap-backed file resources against read_text")
+    parser.add_argument("--size-mb", type=int, default=256, help="Size of the test file in MiB")
+    parser.add_argument("--chunk-kb", type=int, default=1024, help="Chunk size in KiB")
+    parser.add_argument("--requests", type=int, default=20, help="Random chunk requests in the chunk modes")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.file, args.chunk_kb * 1024, args.requests)))
+        return
+
+    results = run(args.size_mb, args.chunk_kb, args.requests)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.size_mb} MiB file, {args.chunk_kb} KiB chunks")
+    print("=" * 70)
+    print(f"{'mode':<18}{'total':>12}{'per request':>16}{'throughput':>13}{'peak RSS':>11}")
+    print("=" * 70)
+    for row in results:
+        rss = f"{row['peak_rss_mb']:.0f} MiB" if row["peak_rss_mb"] is not None else "-"
+        print(
+            f"{row['mode']:<18}{row['seconds']:>10.3f} s{row['ms_per_request']:>13.3f} ms"
+            f"{row['mb_per_s']:>9.1f} MB/s{rss:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
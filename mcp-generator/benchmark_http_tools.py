@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+HTTP Tool Benchmark - Compares the pooled client of generated http tools with
+opening a new httpx.AsyncClient for every call, against a local stand-in REST
+server (keep-alive HTTP/1.1 on 127.0.0.1).
+
+Requires httpx.
+
+Usage:
+    python benchmark_http_tools.py
+    python benchmark_http_tools.py --calls 5000 --concurrency 50 --json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_templates import DEFAULT_HTTP_POOL, HTTP_RUNTIME
+
+
+class TextContent:
+    """Stand-in for mcp.types.TextContent, so the benchmark runs without mcp"""
+
+    def __init__(self, type: str, text: str):
+        self.type = type
+        self.text = text
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    A tiny REST API: GET /users/<id> echoes the id and query as JSON, and
+    /flaky/<key> answers 503 until it has been asked server.flaky_failures times.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY each response waits on a delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        if parts.path.startswith("/flaky/"):
+            with self.server.lock:
+                count = self.server.flaky_counts[parts.path] = self.server.flaky_counts.get(parts.path, 0) + 1
+            if count <= self.server.flaky_failures:
+                return self.reply(503, {"error": "unavailable"})
+        self.reply(200, {"path": parts.path, "query": dict(urllib.parse.parse_qsl(parts.query))})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        self.reply(200, {"path": self.path, "json": json.loads(body or b"null")})
+
+    def reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stand_in_server(flaky_failures: int = 0) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in API on a free local port; returns (server, base URL)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.flaky_failures = flaky_failures
+    server.flaky_counts = {}
+    server.connections = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def load_http_runtime(pool: dict = None) -> dict:
+    """Execute the generated HTTP tool runtime exactly as a generated server would"""
+    namespace = {
+        "asyncio": asyncio, "random": random, "urllib": urllib, "Any": Any, "TextContent": TextContent
+    }
+    source = HTTP_RUNTIME.render(http_pool=repr(pool or DEFAULT_HTTP_POOL))
+    exec(compile(source, "<http_runtime>", "exec"), namespace)
+    return namespace
+
+
+async def run_pooled(base_url: str, calls: int, concurrency: int) -> float:
+    """Seconds for `calls` tool calls through the generated runtime's shared client"""
+    runtime = load_http_runtime()
+    request = runtime["HttpRequest"]("GET", base_url + "/users/{user_id}", ("user_id",), ("fields",), (), {}, 2, 10.0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(index: int):
+        async with semaphore:
+            await runtime["http_call"](request, {"user_id": str(index), "fields": "name"})
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call(index) for index in range(calls)])
+    elapsed = time.perf_counter() - start
+    await runtime["HTTP_CLIENT"].aclose()
+    return elapsed
+
+
+async def run_per_call(base_url: str, calls: int, concurrency: int) -> float:
+    """Seconds for `calls` requests that each open (and close) their own AsyncClient"""
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(index: int):
+        async with semaphore:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{base_url}/users/{index}", params={"fields": "name"})
+                response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call(index) for index in range(calls)])
+    return time.perf_counter() - start
+
+
+MODES = {"pooled": run_pooled, "per-call client": run_per_call}
+
+
+async def run(calls: int, concurrency: int) -> list[dict]:
+    """Benchmark every mode against a fresh stand-in server each"""
+    results = []
+    for mode, runner in MODES.items():
+        server, base_url = start_stand_in_server()
+        try:
+            seconds = await runner(base_url, calls, concurrency)
+        finally:
+            server.shutdown()
+            server.server_close()
+        results.append({
+            "mode": mode,
+            "calls": calls,
+            "concurrency": concurrency,
+            "seconds": round(seconds, 4),
+            "calls_per_s": round(calls / seconds, 1),
+            "connections": len(server.connections)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled http tools against per-call clients")
+    parser.add_argument("--calls", type=int, default=1000, help="Tool calls per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Calls in flight at once")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.calls, args.concurrency))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{args.calls} calls, {args.concurrency} in flight")
+    print("=" * 60)
+    print(f"{'mode':<18}{'total':>12}{'calls/s':>14}{'connections':>14}")
+    print("=" * 60)
+    for row in results:
+        print(f"{row['mode']:<18}{row['seconds']:>10.3f} s{row['calls_per_s']:>14.1f}{row['connections']:>14}")
+
+
+if __name__ == "__main__":
+    main()
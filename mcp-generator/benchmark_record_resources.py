@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Record Resource Benchmark - Measures jsonl record resources on synthetic JSONL
+files of growing size: building the sidecar offset index, loading it in a fresh
+process, point lookups through it, and the refresh after an append. A scan of
+the file for the same record is the baseline.
+
+Runs the generated runtime in-process, so it needs only the standard library.
+
+Usage:
+    python benchmark_record_resources.py
+    python benchmark_record_resources.py --sizes 10000 100000 --lookups 5000 --json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from record_templates import RECORD_RUNTIME
+from sqlite_templates import uri_route
+
+
+class TextContent:
+    """Stand-in for mcp.types.TextContent, so the benchmark runs without mcp"""
+
+    def __init__(self, type: str, text: str):
+        self.type = type
+        self.text = text
+
+
+def load_record_file():
+    """Execute the generated record runtime exactly as a generated server would"""
+    namespace = {
+        "__file__": __file__, "asyncio": asyncio, "hashlib": hashlib, "json": json, "mmap": mmap,
+        "os": os, "re": re, "threading": threading, "urllib": urllib, "TextContent": TextContent
+    }
+    exec(compile(RECORD_RUNTIME.render(), "<record_runtime>", "exec"), namespace)
+    return namespace["RecordFile"]
+
+
+def write_records(path: Path, first: int, count: int) -> None:
+    """Append count records of about 200 bytes each"""
+    with open(path, "a") as file:
+        for start in range(first, first + count, 10000):
+            file.write("".join([
+                json.dumps({"id": f"rec-{i}", "user": i % 977, "tags": ["alpha", "beta"], "body": "x" * 120}) + "\n"
+                for i in range(start, min(start + 10000, first + count))
+            ]))
+
+
+def scan_for(path: Path, key: str) -> float:
+    """Seconds to find one record by reading and parsing the file line by line"""
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        for line in file:
+            if json.loads(line)["id"] == key:
+                break
+    return time.perf_counter() - start
+
+
+async def run_size(RecordFile, records: int, lookups: int) -> dict:
+    """Build, reload, query and extend one file of `records` records"""
+    _, uri_pattern = uri_route("data://records/{id}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "records.jsonl"
+        write_records(path, 0, records)
+        index = str(path) + ".idx"
+
+        resource = RecordFile(str(path), "id", index, uri_pattern)
+        start = time.perf_counter()
+        await resource.read("data://records/rec-0")
+        build = time.perf_counter() - start
+
+        resource = RecordFile(str(path), "id", index, uri_pattern)
+        start = time.perf_counter()
+        await resource.read("data://records/rec-0")
+        load = time.perf_counter() - start
+        assert resource.stats["rebuilds"] == 0, "The sidecar was not reused"
+
+        rng = random.Random(records)
+        uris = [f"data://records/rec-{rng.randrange(records)}" for _ in range(lookups)]
+        latencies = []
+        for uri in uris:
+            started = time.perf_counter()
+            await resource.read(uri)
+            latencies.append((time.perf_counter() - started) * 1e6)
+        latencies.sort()
+
+        write_records(path, records, 1000)
+        start = time.perf_counter()
+        await resource.read(f"data://records/rec-{records + 999}")
+        append = time.perf_counter() - start
+
+        return {
+            "records": records,
+            "file_mb": round(path.stat().st_size / 1024 / 1024, 1),
+            "index_mb": round(os.path.getsize(index) / 1024 / 1024, 1),
+            "build_s": round(build, 3),
+            "load_s": round(load, 3),
+            "lookup_p50_us": round(statistics.median(latencies), 1),
+            "lookup_p95_us": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+            "append_1000_ms": round(append * 1000, 1),
+            "scan_last_ms": round(scan_for(path, f"rec-{records - 1}") * 1000, 1)
+        }
+
+
+async def run(sizes: list[int], lookups: int) -> list[dict]:
+    RecordFile = load_record_file()
+    return [await run_size(RecordFile, records, lookups) for records in sizes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offset-indexed JSONL record resources")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="Records per file")
+    parser.add_argument("--lookups", type=int, default=10000, help="Timed lookups per file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.sizes, args.lookups))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 100)
+    print(f"{'records':>10}{'file':>10}{'index':>10}{'build':>10}{'load':>10}"
+          f"{'p50':>10}{'p95':>10}{'+1000':>11}{'scan':>12}")
+    print("=" * 100)
+    for row in results:
+        print(f"{row['records']:>10,}{row['file_mb']:>7.1f} MB{row['index_mb']:>7.1f} MB{row['build_s']:>8.2f} s"
+              f"{row['load_s']:>8.2f} s{row['lookup_p50_us']:>7.1f} µs{row['lookup_p95_us']:>7.1f} µs"
+              f"{row['append_1000_ms']:>8.1f} ms{row['scan_last_ms']:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
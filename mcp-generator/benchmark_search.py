@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark - Builds the FTS5 index of a generated search tool over a
+synthetic JSONL corpus (1M documents by default) and measures query latency
+against a linear scan of the same corpus, plus the cost of incremental refreshes.
+
+Words follow a Zipf distribution, so the queries cover very common, medium and
+rare terms. Runs the generated runtime in-process; needs SQLite with FTS5.
+
+Usage:
+    python benchmark_search.py
+    python benchmark_search.py --documents 100000 --repeat 50 --json
+"""
+
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from search_templates import render_search_runtime
+from sqlite_templates import render_sqlite_runtime
+
+VOCABULARY_SIZE = 50000
+
+TITLE_WORDS = 4
+
+TEXT_WORDS = 30
+
+# Vocabulary ranks of the query terms: common, medium and rare words
+QUERY_RANKS = {"common": (3,), "medium": (300,), "rare": (30000,), "two terms": (40, 300)}
+
+
+class TextContent:
+    """Stand-in for mcp.types.TextContent, so the benchmark runs without mcp"""
+
+    def __init__(self, type: str, text: str):
+        self.type = type
+        self.text = text
+
+
+def load_search_index():
+    """Execute the generated SQLite and search runtimes exactly as a generated server would"""
+    namespace = {
+        "__file__": __file__, "asyncio": asyncio, "base64": base64, "concurrent": concurrent,
+        "hashlib": hashlib, "json": json, "os": os, "re": re, "sqlite3": sqlite3,
+        "threading": threading, "urllib": urllib, "Any": Any, "TextContent": TextContent
+    }
+    source = render_sqlite_runtime({"sqlite"}) + render_search_runtime({"search"})
+    exec(compile(source, "<search_runtime>", "exec"), namespace)
+    return namespace["SearchIndex"]
+
+
+def vocabulary() -> list[str]:
+    """Distinct pronounceable words, most frequent first"""
+    syllables = [consonant + vowel for consonant in "bdfgklmnprstvz" for vowel in "aeiou"]
+    words = ("".join(parts) for size in (2, 3, 4) for parts in itertools.product(syllables, repeat=size))
+    return list(itertools.islice(words, VOCABULARY_SIZE))
+
+
+def write_corpus(path: Path, documents: int, words: list[str], first_id: int = 0) -> None:
+    """Append synthetic JSONL documents with Zipf-distributed words"""
+    rng = random.Random(first_id)
+    weights = list(itertools.accumulate([1 / rank for rank in range(1, len(words) + 1)]))
+    with open(path, "a") as file:
+        for start in range(first_id, first_id + documents, 10000):
+            count = min(10000, first_id + documents - start)
+            sample = rng.choices(words, cum_weights=weights, k=count * (TITLE_WORDS + TEXT_WORDS))
+            lines = []
+            for offset in range(count):
+                doc = sample[offset * (TITLE_WORDS + TEXT_WORDS):(offset + 1) * (TITLE_WORDS + TEXT_WORDS)]
+                lines.append(json.dumps({
+                    "id": f"doc-{start + offset}",
+                    "title": " ".join(doc[:TITLE_WORDS]),
+                    "text": " ".join(doc[TITLE_WORDS:])
+                }))
+            file.write("\n".join(lines) + "\n")
+
+
+def linear_scan(path: Path, terms: list[str]) -> tuple[float, int]:
+    """(seconds, matches) of finding every document containing all terms by reading the whole file"""
+    start = time.perf_counter()
+    matches = 0
+    with open(path) as file:
+        for line in file:
+            record = json.loads(line)
+            words = set(record["text"].split()) | set(record["title"].split())
+            if all(term in words for term in terms):
+                matches += 1
+    return time.perf_counter() - start, matches
+
+
+async def run(documents: int, repeat: int) -> dict:
+    """Build, query and refresh an index over a fresh corpus"""
+    SearchIndex = load_search_index()
+    words = vocabulary()
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus.jsonl"
+        start = time.perf_counter()
+        write_corpus(corpus, documents, words)
+        corpus_seconds = time.perf_counter() - start
+
+        index = SearchIndex(str(Path(tmp) / "index.db"), str(corpus), (".jsonl",), "text", "title", "id", 10, 4)
+        start = time.perf_counter()
+        build = await index.pool.call(index.refresh)
+        build_seconds = time.perf_counter() - start
+        index.refreshing = asyncio.get_running_loop().create_future()
+        index.refreshing.set_result(build)
+
+        queries = {}
+        for label, ranks in QUERY_RANKS.items():
+            terms = [words[rank - 1] for rank in ranks]
+            query = " ".join(terms)
+            await index.search({"query": query})
+            latencies = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await index.search({"query": query})
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+            queries[label] = {
+                "query": query,
+                "p50_ms": round(statistics.median(latencies), 3),
+                "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3)
+            }
+        scan_terms = [words[rank - 1] for rank in QUERY_RANKS["medium"]]
+        scan_seconds, scan_matches = linear_scan(corpus, scan_terms)
+
+        start = time.perf_counter()
+        unchanged = await index.pool.call(index.refresh)
+        unchanged_seconds = time.perf_counter() - start
+        write_corpus(corpus, 1000, words, first_id=documents)
+        start = time.perf_counter()
+        appended = await index.pool.call(index.refresh)
+        appended_seconds = time.perf_counter() - start
+
+        index_bytes = sum([path.stat().st_size for path in Path(tmp).glob("index.db*")])
+        index.pool.executor.shutdown()
+        return {
+            "documents": documents,
+            "corpus_mb": round(corpus.stat().st_size / 1024 / 1024, 1),
+            "index_mb": round(index_bytes / 1024 / 1024, 1),
+            "corpus_seconds": round(corpus_seconds, 2),
+            "build_seconds": round(build_seconds, 2),
+            "build_docs_per_s": round(build["documents"] / build_seconds),
+            "queries": queries,
+            "linear_scan_ms": round(scan_seconds * 1000, 1),
+            "linear_scan_matches": scan_matches,
+            "refresh_unchanged_ms": round(unchanged_seconds * 1000, 2),
+            "refresh_appended_1000_ms": round(appended_seconds * 1000, 1),
+            "appended_documents": appended["documents"],
+            "unchanged_files": unchanged["unchanged"]
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 search tools on a synthetic corpus")
+    parser.add_argument("--documents", type=int, default=1_000_000, help="Documents in the corpus")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.documents, args.repeat))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{results['documents']:,} documents: {results['corpus_mb']} MB of JSONL, {results['index_mb']} MB index")
+    print(f"Index build: {results['build_seconds']:.1f} s ({results['build_docs_per_s']:,} documents/s)")
+    print("=" * 60)
+    print(f"{'query':<12}{'terms':<22}{'p50':>12}{'p95':>12}")
+    print("=" * 60)
+    for label, row in results["queries"].items():
+        print(f"{label:<12}{row['query']:<22}{row['p50_ms']:>9.2f} ms{row['p95_ms']:>9.2f} ms")
+    print(f"{'linear scan':<12}{'(medium term)':<22}{results['linear_scan_ms']:>9.1f} ms")
+    print("=" * 60)
+    print(f"Refresh, nothing changed:   {results['refresh_unchanged_ms']:.2f} ms")
+    print(f"Refresh, 1,000 appended:    {results['refresh_appended_1000_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite - Scaling benchmarks and regression gate for the MCP generator.
+Drives MCPTemplate, MCPGenerator and the streaming writer with synthetic configs
+and records wall time, peak memory (tracemalloc) and output size per scenario.
+The coldstart target times a fresh interpreter importing the generated server.py,
+which is what a client pays when it spawns the server on demand.
+
+Usage:
+    python benchmark_suite.py --save benchmark_baseline.json
+    python benchmark_suite.py --compare benchmark_baseline.json --threshold 10
+    python benchmark_suite.py --sizes 1 100 10000 --repeat 5
+    python benchmark_suite.py --targets coldstart --sizes 1 1000
+"""
+
+import argparse
+import gc
+import json
+import py_compile
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# The generator only needs the mcp package to run as a server; benchmarks
+# exercise template generation, so fall back to stand-ins when it is missing
+try:
+    import mcp.server  # noqa: F401
+    MCP_INSTALLED = True
+except ImportError:
+    MCP_INSTALLED = False
+
+    class MockServer:
+        def __init__(self, name): pass
+        def list_tools(self): return lambda f: f
+        def call_tool(self): return lambda f: f
+        def list_resources(self): return lambda f: f
+        def read_resource(self): return lambda f: f
+        def list_prompts(self): return lambda f: f
+        def get_prompt(self): return lambda f: f
+
+    sys.modules['mcp'] = type(sys)('mcp')
+    sys.modules['mcp.server'] = type(sys)('mcp.server')
+    sys.modules['mcp.server'].Server = MockServer
+    sys.modules['mcp.server.stdio'] = type(sys)('mcp.server.stdio')
+    sys.modules['mcp.server.stdio'].stdio_server = lambda: None
+    sys.modules['mcp.types'] = type(sys)('mcp.types')
+    sys.modules['mcp.types'].Tool = object
+    sys.modules['mcp.types'].TextContent = object
+    sys.modules['mcp.types'].ImageContent = object
+    sys.modules['mcp.types'].EmbeddedResource = object
+    sys.modules['mcp.types'].LoggingLevel = object
+
+from server import MCPTemplate, MCPGenerator, generation_cache
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10000, 100000]
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+# Metrics checked by the regression gate ("more than N% slower or larger")
+GATED_METRICS = ("wall_time_s", "peak_memory_bytes", "output_bytes")
+
+
+def synthetic_config(size: int) -> dict:
+    """Build a config with `size` tools, resources and prompts"""
+    return {
+        "tools": [
+            {
+                "name": f"tool_{i}",
+                "description": f"Synthetic tool number {i}",
+                "parameters": [
+                    {"name": "query", "type": "string", "description": "Search query", "required": True},
+                    {"name": "limit", "type": "number", "description": "Max results", "required": False}
+                ]
+            }
+            for i in range(size)
+        ],
+        "resources": [
+            {"uri": f"data://resource_{i}", "name": f"Resource {i}", "description": "Synthetic resource", "type": "json"}
+            for i in range(size)
+        ],
+        "prompts": [
+            {"name": f"prompt_{i}", "description": "Synthetic prompt"}
+            for i in range(size)
+        ]
+    }
+
+
+class CountingSink:
+    """Text sink that only counts what is written"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text.encode("utf-8"))
+        return len(text)
+
+
+def run_template(server_type: str, config: dict) -> int:
+    generation_cache.clear()
+    files = MCPTemplate.generate("bench-server", "Benchmark server", server_type, config)
+    return sum(len(content.encode("utf-8")) for content in files.values())
+
+
+def run_generator(server_type: str, config: dict) -> int:
+    generation_cache.clear()
+    code = MCPGenerator().generate_from_config({
+        "name": "bench-server",
+        "description": "Benchmark server",
+        "type": server_type,
+        **config
+    })
+    return len(code.encode("utf-8"))
+
+
+def run_stream(server_type: str, config: dict) -> int:
+    sink = CountingSink()
+    MCPTemplate.stream("bench-server", "Benchmark server", server_type, config, sink)
+    return sink.size
+
+
+TARGETS = {
+    "template": run_template,
+    "generator": run_generator,
+    "stream": run_stream
+}
+
+# Imports the generated server in a fresh interpreter; needs the real mcp package
+COLD_START = "coldstart"
+
+COLD_START_PEAK = (
+    "import tracemalloc; tracemalloc.start(); import server; "
+    "print(tracemalloc.get_traced_memory()[1])"
+)
+
+
+def measure(target: str, server_type: str, size: int, repeat: int) -> dict:
+    """Measure one scenario: best wall time of `repeat` runs, then peak memory of one traced run"""
+    runner = TARGETS[target]
+    config = synthetic_config(size)
+
+    timings = []
+    output_bytes = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        output_bytes = runner(server_type, config)
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    runner(server_type, config)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "scenario": f"{target}/{server_type}/{size}",
+        "wall_time_s": round(min(timings), 6),
+        "peak_memory_bytes": peak,
+        "output_bytes": output_bytes
+    }
+
+
+def measure_cold_start(server_type: str, size: int, repeat: int) -> dict:
+    """
+    Measure one cold start scenario: best wall time of `repeat` fresh interpreters importing server.py.
+
+    The module is compiled to bytecode up front (py_compile writes the .pyc even
+    under PYTHONDONTWRITEBYTECODE), as the first launch of a generated server
+    would; peak memory comes from one extra traced run.
+    """
+    generation_cache.clear()
+    code = MCPTemplate.generate("bench-server", "Benchmark server", server_type, synthetic_config(size))["server.py"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server_path = Path(tmp) / "server.py"
+        server_path.write_text(code)
+        py_compile.compile(str(server_path), doraise=True)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", "import server"], cwd=tmp, check=True)
+            timings.append(time.perf_counter() - start)
+
+        traced = subprocess.run(
+            [sys.executable, "-c", COLD_START_PEAK], cwd=tmp, check=True, capture_output=True, text=True
+        )
+
+    return {
+        "scenario": f"{COLD_START}/{server_type}/{size}",
+        "wall_time_s": round(min(timings), 6),
+        "peak_memory_bytes": int(traced.stdout.strip().splitlines()[-1]),
+        "output_bytes": len(code.encode("utf-8"))
+    }
+
+
+def run_suite(sizes: list[int], repeat: int, targets: list[str]) -> list[dict]:
+    """Run every target x server type x size scenario"""
+    if COLD_START in targets and not MCP_INSTALLED:
+        print("  (skipping coldstart: the mcp package is not installed)", file=sys.stderr)
+        targets = [target for target in targets if target != COLD_START]
+
+    results = []
+    for size in sizes:
+        for target in targets:
+            for server_type in ("tool", "resource", "full"):
+                if target == COLD_START:
+                    result = measure_cold_start(server_type, size, repeat)
+                else:
+                    result = measure(target, server_type, size, repeat)
+                results.append(result)
+                print(
+                    f"  {result['scenario']:<28}"
+                    f"{result['wall_time_s'] * 1000:>12.2f} ms"
+                    f"{result['peak_memory_bytes'] / 1024:>14.1f} KiB"
+                    f"{result['output_bytes'] / 1024:>14.1f} KiB",
+                    file=sys.stderr
+                )
+    return results
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float, min_time_delta: float) -> list[str]:
+    """
+    Return a description of every metric that regressed by more than threshold percent.
+
+    Wall time differences smaller than min_time_delta seconds are treated as noise.
+    """
+    baseline_by_scenario = {entry["scenario"]: entry for entry in baseline}
+    regressions = []
+
+    for result in results:
+        previous = baseline_by_scenario.get(result["scenario"])
+        if previous is None:
+            continue
+        for metric in GATED_METRICS:
+            old, new = previous[metric], result[metric]
+            if old <= 0 or new <= old * (1 + threshold / 100):
+                continue
+            if metric == "wall_time_s" and new - old < min_time_delta:
+                continue
+            regressions.append(
+                f"{result['scenario']}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.1f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmarks and regression gate for the MCP generator")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Number of tools, resources and prompts per scenario")
+    parser.add_argument("--targets", nargs="+", choices=sorted([*TARGETS, COLD_START]), default=[*TARGETS, COLD_START],
+                        help="Code paths to benchmark (coldstart needs the mcp package)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario (best is kept)")
+    parser.add_argument("--save", metavar="PATH", help="Store the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Fail if any scenario regressed against this baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed regression in percent (default: 10)")
+    parser.add_argument("--min-time-delta", type=float, default=0.002, help="Ignore wall time regressions below this many seconds")
+    args = parser.parse_args()
+
+    print(f"{'  scenario':<30}{'wall time':>15}{'peak memory':>18}{'output':>18}", file=sys.stderr)
+    results = run_suite(args.sizes, args.repeat, args.targets)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({"results": results}, indent=2) + "\n")
+        print(f"\n✅ Baseline saved to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_time_delta)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold}%:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\n✅ No regressions above {args.threshold}%", file=sys.stderr)
+
+    if not args.save and not args.compare:
+        print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Template Benchmark - Compares the compiled template engine with the original
+f-string templates and reports renders per second for growing tool counts. Both
+render the same server (options pinned, see PINNED_OPTIONS); a run fails if
+their output differs.
+
+Usage:
+    python benchmark_templates.py
+    python benchmark_templates.py --sizes 10 1000 10000 --seconds 2
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import server_templates
+from template_engine import FIELD_PATTERN, python_identifier
+
+# Both renderers emit the same server: no compiled validators, if-chain dispatch, stdio
+PINNED_OPTIONS = {"validate_arguments": False, "dispatch": "chain", "transport": "stdio"}
+
+# str.format version of each block source, converted once like the original f-strings were compiled once
+LEGACY_BLOCK_FORMATS: dict[str, str] = {}
+
+
+def legacy_format(source: str) -> str:
+    """Return a block source as a str.format string: braces escaped, {{field}} turned into {field}"""
+    fmt = LEGACY_BLOCK_FORMATS.get(source)
+    if fmt is None:
+        parts = FIELD_PATTERN.split(source)
+        fmt = LEGACY_BLOCK_FORMATS[source] = "".join([
+            part.replace("{", "{{").replace("}", "}}") if index % 2 == 0 else f"{{{part}}}"
+            for index, part in enumerate(parts)
+        ])
+    return fmt
+
+
+def make_config(tool_count: int) -> dict:
+    """Build a synthetic full-server config with the given number of tools"""
+    return {
+        "tools": [
+            {
+                "name": f"tool_{i}",
+                "description": f"Synthetic tool number {i}",
+                "parameters": [
+                    {"name": "query", "type": "string", "description": "Search query", "required": True},
+                    {"name": "limit", "type": "number", "description": "Max results", "required": False}
+                ]
+            }
+            for i in range(tool_count)
+        ],
+        "resources": [
+            {"uri": f"data://resource_{i}", "name": f"Resource {i}", "description": "Synthetic resource", "type": "json"}
+            for i in range(max(1, tool_count // 10))
+        ],
+        "prompts": [
+            {"name": f"prompt_{i}", "description": "Synthetic prompt"}
+            for i in range(max(1, tool_count // 10))
+        ]
+    }
+
+
+class LegacyTemplate:
+    """
+    The f-string templates the engine replaced, kept as the benchmark baseline.
+    They render the same server.py as the compiled engine with validation off
+    and chain dispatch, but the way the original code did: f-strings per item,
+    json.dumps(indent=16) per inputSchema and plain string interpolation of
+    every block.
+    Only plain tools, resources and prompts (all make_config emits) are covered.
+    """
+
+    @staticmethod
+    def input_schema(params: list[dict]) -> str:
+        return json.dumps({
+            "type": "object",
+            "properties": {
+                p["name"]: {"type": p.get("type", "string"), "description": p.get("description", "")} for p in params
+            },
+            "required": [p["name"] for p in params if p.get("required", False)]
+        }, indent=16)
+
+    @staticmethod
+    def tool_fragments(tool: dict, full: bool) -> tuple[str, ...]:
+        tool_name = tool.get("name", "example_tool")
+        tool_desc = tool.get("description", "Example tool")
+        tool_params = tool.get("parameters", [])
+        func_name = python_identifier("tool", tool_name)
+        tool_doc = json.dumps(tool_desc)
+
+        definition = f'''
+    Tool(
+        name="{tool_name}",
+        description="{tool_desc}",
+        inputSchema={LegacyTemplate.input_schema(tool_params)}
+    ),'''
+        if full:
+            function = f'''
+async def {func_name}(arguments: Any) -> list[TextContent]:
+    ""{tool_doc}""
+    # TODO: Implement {tool_name}
+    return [TextContent(type="text", text="Tool {tool_name} executed")]
+'''
+        else:
+            param_extraction = "\n".join([f"    {p['name']} = arguments.get('{p['name']}')" for p in tool_params])
+            function = f'''
+async def {func_name}(arguments: Any) -> list[TextContent]:
+    ""{tool_doc}""
+    # Extract parameters
+{param_extraction}
+
+    # TODO: Implement {tool_name} logic here
+    result = f"Executed {tool_name}"
+
+    return [TextContent(type="text", text=result)]
+'''
+        branch = f'''
+    if name == "{tool_name}":
+        return await {func_name}(arguments)
+'''
+        return definition, function, branch, ""
+
+    @staticmethod
+    def resource_fragments(resource: dict) -> tuple[str, ...]:
+        res_uri = resource.get("uri", "resource://example")
+        res_name = resource.get("name", "Example Resource")
+        res_desc = resource.get("description", "Example resource")
+        definition = f'''
+    Resource(
+        uri="{res_uri}",
+        name="{res_name}",
+        description="{res_desc}",
+        mimeType="text/plain"
+    ),'''
+        function = f'''
+@resource_route("{res_uri}", "text/plain")
+async def {python_identifier("resource", res_uri)}(uri: str) -> list[TextContent]:
+    ""{json.dumps(res_desc)}""
+    return [TextContent(type="text", text="Resource {res_name} data")]
+'''
+        return definition, function
+
+    @staticmethod
+    def prompt_fragments(prompt: dict) -> tuple[str, ...]:
+        prompt_name = prompt.get("name", "example_prompt")
+        prompt_desc = prompt.get("description", "Example prompt")
+        definition = f'''
+    {{
+        "name": "{prompt_name}",
+        "description": "{prompt_desc}"
+    }},'''
+        branch = f'''
+    if name == "{prompt_name}":
+        return {{
+            "messages": [
+                {{
+                    "role": "user",
+                    "content": {{
+                        "type": "text",
+                        "text": "Example prompt for {prompt_name}"
+                    }}
+                }}
+            ]
+        }}
+'''
+        return definition, branch
+
+    @staticmethod
+    def render(name: str, description: str, server_type: str, config: dict) -> dict:
+        """Render the files of a server, interpolating every block with str.format"""
+        options = server_templates.resolve_options(server_type, {**config, **PINNED_OPTIONS})
+        renderers = {
+            "tools": lambda tool: LegacyTemplate.tool_fragments(tool, server_type == "full"),
+            "resources": LegacyTemplate.resource_fragments,
+            "prompts": LegacyTemplate.prompt_fragments
+        }
+        slot_values = {}
+        for section, slots in server_templates.section_slots(server_type).items():
+            fragments = [renderers[section](item) for item in config.get(section, [])]
+            for index, (field, _) in enumerate(slots):
+                slot_values[field] = "".join([item_fragments[index] for item_fragments in fragments])
+
+        features = server_templates.config_features(server_type, config, options)
+        context = server_templates.server_context(name, description, server_type, options, features, slot_values)
+        code = "".join([
+            legacy_format(block.source).format_map(context)
+            for block in server_templates.server_blocks(server_type, options)
+        ])
+        return {"server.py": code, **server_templates.render_support_files(name, description, server_type, options, features)}
+
+    @staticmethod
+    def basic_tool_server(name: str, description: str, tools: list[dict]) -> dict:
+        """Generate a basic tool-based MCP server"""
+        return LegacyTemplate.render(name, description, "tool", {"tools": tools})
+
+    @staticmethod
+    def full_server(name: str, description: str, config: dict) -> dict:
+        """Generate a full-featured MCP server with tools, resources, and prompts"""
+        return LegacyTemplate.render(name, description, "full", config)
+
+
+def measure(render, seconds: float) -> float:
+    """Return renders per second for the given callable"""
+    render()  # warm up
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds or count < 3:
+        render()
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def run(sizes: list[int], seconds: float) -> list[dict]:
+    """Benchmark every size for the tool and full templates"""
+    results = []
+    for size in sizes:
+        config = make_config(size)
+        cases = [
+            (
+                "basic_tool_server",
+                lambda: LegacyTemplate.basic_tool_server("bench", "Benchmark server", config["tools"]),
+                lambda: server_templates.render_server("bench", "Benchmark server", "tool", {"tools": config["tools"], **PINNED_OPTIONS})
+            ),
+            (
+                "full_server",
+                lambda: LegacyTemplate.full_server("bench", "Benchmark server", config),
+                lambda: server_templates.render_server("bench", "Benchmark server", "full", {**config, **PINNED_OPTIONS})
+            )
+        ]
+
+        for template_name, legacy, compiled in cases:
+            if legacy() != compiled():
+                raise AssertionError(f"{template_name} output differs for {size} tools")
+
+            legacy_rate = measure(legacy, seconds)
+            compiled_rate = measure(compiled, seconds)
+            results.append({
+                "template": template_name,
+                "tools": size,
+                "legacy_renders_per_sec": round(legacy_rate, 2),
+                "compiled_renders_per_sec": round(compiled_rate, 2),
+                "speedup": round(compiled_rate / legacy_rate, 2)
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled MCP template engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000], help="Tool counts to benchmark")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Minimum time per measurement")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.seconds)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 78)
+    print(f"{'template':<20}{'tools':>8}{'legacy/s':>16}{'compiled/s':>16}{'speedup':>12}")
+    print("=" * 78)
+    for row in results:
+        print(
+            f"{row['template']:<20}{row['tools']:>8}"
+            f"{row['legacy_renders_per_sec']:>16.2f}{row['compiled_renders_per_sec']:>16.2f}"
+            f"{row['speedup']:>11.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Validation Benchmark - Compares the compiled per-tool argument validators with
+validating against the tool's JSON Schema on every call.
+
+The generic baseline interprets the schema per call (what a hand-written
+validator usually does); jsonschema is measured too when it is installed.
+
+Usage:
+    python benchmark_validation.py
+    python benchmark_validation.py --calls 200000 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from validator_templates import VALIDATION_RUNTIME, render_validator, validator_name
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+BENCHMARK_TOOL = {
+    "name": "search_orders",
+    "description": "Search orders",
+    "parameters": [
+        {"name": "query", "type": "string", "required": True},
+        {"name": "limit", "type": "integer"},
+        {"name": "min_total", "type": "number"},
+        {"name": "include_archived", "type": "boolean"},
+        {"name": "status", "type": "string", "enum": ["open", "shipped", "cancelled"]},
+        {"name": "tags", "type": "array"},
+        {"name": "filters", "type": "object"},
+        {"name": "customer_id", "type": "string", "required": True}
+    ]
+}
+
+# Already-typed arguments (the common case) and arguments that need coercion
+VALID_ARGUMENTS = {
+    "query": "laptop", "limit": 20, "min_total": 99.5, "include_archived": False,
+    "status": "open", "tags": ["a", "b"], "filters": {"region": "eu"}, "customer_id": "c-42"
+}
+COERCED_ARGUMENTS = {
+    "query": "laptop", "limit": "20", "min_total": "99.5", "include_archived": "false",
+    "status": "open", "customer_id": 42
+}
+
+JSON_TYPES = {
+    "string": str, "integer": int, "number": (int, float), "boolean": bool, "array": list, "object": dict
+}
+
+
+def input_schema(tool: dict) -> dict:
+    """The inputSchema the generated server advertises for a tool"""
+    properties = {}
+    for param in tool["parameters"]:
+        properties[param["name"]] = {"type": param.get("type", "string"), **({"enum": param["enum"]} if "enum" in param else {})}
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": [p["name"] for p in tool["parameters"] if p.get("required", False)]
+    }
+
+
+def generic_validate(schema: dict, arguments: Any) -> dict:
+    """Validate and coerce arguments by interpreting the JSON Schema on every call"""
+    if not isinstance(arguments, dict):
+        raise ValueError("arguments must be an object")
+    arguments = dict(arguments)
+    for field in schema.get("required", []):
+        if arguments.get(field) is None:
+            raise ValueError(f"missing required argument '{field}'")
+    for field, spec in schema.get("properties", {}).items():
+        value = arguments.get(field)
+        if value is None:
+            continue
+        expected = JSON_TYPES.get(spec.get("type"))
+        if expected is not None and (isinstance(value, bool) and spec["type"] != "boolean" or not isinstance(value, expected)):
+            if spec["type"] in ("integer", "number") and isinstance(value, str):
+                value = int(value) if spec["type"] == "integer" or value.lstrip("-").isdigit() else float(value)
+            elif spec["type"] == "boolean" and isinstance(value, str) and value.lower() in ("true", "false"):
+                value = value.lower() == "true"
+            elif spec["type"] == "string" and isinstance(value, (int, float)):
+                value = str(value)
+            else:
+                raise ValueError(f"argument '{field}' must be {spec['type']}")
+            arguments[field] = value
+        if "enum" in spec and value not in spec["enum"]:
+            raise ValueError(f"argument '{field}' must be one of {spec['enum']}")
+    return arguments
+
+
+def compile_validator(tool: dict):
+    """Execute the generated validator source exactly as a generated server would"""
+    namespace = {"Any": Any, "json": json}
+    source = VALIDATION_RUNTIME.render() + render_validator(tool)
+    exec(compile(source, "<validator>", "exec"), namespace)
+    return namespace[validator_name(tool["name"])]
+
+
+def time_per_call(func, arguments, calls: int) -> float:
+    """Nanoseconds per call"""
+    func(arguments)  # warm up
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(arguments)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def run(calls: int) -> list[dict]:
+    """Benchmark every validator on typed and coercible arguments"""
+    schema = input_schema(BENCHMARK_TOOL)
+    compiled = compile_validator(BENCHMARK_TOOL)
+
+    validators = {
+        "compiled": compiled,
+        "generic": lambda arguments: generic_validate(schema, arguments)
+    }
+    if jsonschema is not None:
+        checker = jsonschema.Draft7Validator(schema)
+        validators["jsonschema"] = checker.validate
+
+    results = []
+    for case, arguments in (("typed", VALID_ARGUMENTS), ("coerced", COERCED_ARGUMENTS)):
+        if compiled(arguments) != generic_validate(schema, arguments):
+            raise AssertionError(f"Compiled and generic validators disagree on {case} arguments")
+        row = {"case": case}
+        for label, validate in validators.items():
+            if label == "jsonschema" and case == "coerced":
+                continue  # jsonschema only checks, it cannot coerce
+            row[f"{label}_ns"] = round(time_per_call(validate, arguments, calls), 1)
+        row["speedup"] = round(row["generic_ns"] / row["compiled_ns"], 2)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled tool argument validators")
+    parser.add_argument("--calls", type=int, default=100_000, help="Validations per measurement")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.calls)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 70)
+    print(f"{'arguments':<12}{'compiled':>14}{'generic':>14}{'jsonschema':>16}{'speedup':>12}")
+    print("=" * 70)
+    for row in results:
+        jsonschema_ns = f"{row['jsonschema_ns']:.1f} ns" if "jsonschema_ns" in row else "-"
+        print(
+            f"{row['case']:<12}{row['compiled_ns']:>11.1f} ns{row['generic_ns']:>11.1f} ns"
+            f"{jsonschema_ns:>16}{row['speedup']:>11.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
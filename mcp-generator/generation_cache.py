@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Generation Cache - Content-addressed cache of generated MCP server files.
+Entries are keyed on a canonical hash of the generation request and kept in a
+byte-bounded in-memory LRU, with an optional on-disk tier shared across processes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import server_templates
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Modules whose code decides what is generated; their source is hashed into every key
+TEMPLATE_MODULES = (
+    "template_engine", "server_templates", "validator_templates", "runtime_templates", "resource_templates",
+    "record_templates", "sqlite_templates", "search_templates", "http_templates"
+)
+
+
+def template_version() -> str:
+    """Hash of the template sources, so an upgraded generator never serves files an older one rendered"""
+    digest = hashlib.sha256()
+    for module in TEMPLATE_MODULES:
+        digest.update((Path(__file__).parent / f"{module}.py").read_bytes())
+    return digest.hexdigest()
+
+
+TEMPLATE_VERSION = template_version()
+
+
+def cache_key(name: str, description: str, server_type: str, config: Optional[dict]) -> str:
+    """
+    Return the canonical SHA-256 key of a generation request.
+
+    The config is normalized first, so every entry point (MCP tool, web UI,
+    MCPGenerator) gets the same key for the same server.
+
+    Raises:
+        ValueError: If server_type is not 'tool', 'resource' or 'full'
+    """
+    config = server_templates.normalize_config(server_type, config or {})
+    payload = json.dumps(
+        [TEMPLATE_VERSION, name, description, server_type, config],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def files_size(files: dict) -> int:
+    """Approximate memory footprint of a files dict in bytes"""
+    return sum(len(filename) + len(content.encode("utf-8")) for filename, content in files.items())
+
+
+class GenerationCache:
+    """Byte-bounded LRU of generated files with an optional disk tier"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "GenerationCache":
+        """
+        Create a cache configured from environment variables:
+            MCP_GENERATOR_CACHE_BYTES: in-memory budget (default 64 MiB, 0 disables)
+            MCP_GENERATOR_CACHE_DIR: directory of the on-disk tier (disabled if unset)
+        """
+        max_bytes = int(os.environ.get("MCP_GENERATOR_CACHE_BYTES", DEFAULT_MAX_BYTES))
+        cache_dir = os.environ.get("MCP_GENERATOR_CACHE_DIR") or None
+        return cls(max_bytes=max_bytes, cache_dir=cache_dir)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached files for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[0])
+
+        files = self._read_disk(key)
+
+        with self._lock:
+            if files is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, files)
+        return dict(files)
+
+    def put(self, key: str, files: dict) -> None:
+        """Store generated files under key in memory and on disk"""
+        files = dict(files)
+        with self._lock:
+            self._store(key, files)
+        self._write_disk(key, files)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and memory usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_enabled": self.cache_dir is not None
+            }
+
+    def _store(self, key: str, files: dict) -> None:
+        """Insert an entry and evict least recently used ones (lock held)"""
+        size = files_size(files)
+        if size > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous[1]
+
+        self._entries[key] = (files, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        if not self.cache_dir:
+            return None
+        try:
+            return json.loads(self._disk_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, files: dict) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        if path.exists():
+            return
+        try:
+            # Write atomically so concurrent readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(files, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+HTTP Templates - Tools of kind "http", which forward their arguments to a REST
+endpoint. Every HTTP tool of a server shares one keep-alive httpx.AsyncClient,
+created on the first call, so calls reuse warm connections instead of paying a
+TCP (and TLS) handshake each time. Idempotent requests are retried a bounded
+number of times with jittered exponential backoff.
+"""
+
+from string import Formatter
+
+from template_engine import Template, encode_string, python_identifier
+from runtime_templates import is_positive_int
+
+HTTP_METHODS = ("GET", "HEAD", "OPTIONS", "DELETE", "POST", "PUT", "PATCH")
+
+# Methods whose arguments default to the query string; the rest send a JSON body
+QUERY_METHODS = ("GET", "HEAD", "OPTIONS", "DELETE")
+
+ARGUMENT_TARGETS = ("query", "json")
+
+DEFAULT_RETRIES = 2
+
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Connection pool of the shared client. Keeping as many idle connections alive as
+# may be open at once means a burst of calls never has to reconnect afterwards.
+DEFAULT_HTTP_POOL = {
+    "max_connections": 100,
+    "max_keepalive_connections": 100,
+    "keepalive_expiry": 30.0
+}
+
+HTTP_REQUIREMENT = "httpx>=0.27.0\n"
+
+HTTP_RUNTIME = Template('''
+# HTTP tools, served through one pooled keep-alive client
+HTTP_POOL = {{http_pool}}
+
+# Statuses worth retrying: rate limiting and gateway/availability errors
+HTTP_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+HTTP_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+HTTP_BACKOFF_BASE = 0.1
+
+HTTP_BACKOFF_MAX = 2.0
+
+HTTP_CLIENT = None
+
+
+class HttpToolError(RuntimeError):
+    """Raised when an HTTP tool's request fails after its retries"""
+
+
+def shared_http_client():
+    """The keep-alive AsyncClient of this process, created (and httpx imported) on first use"""
+    global HTTP_CLIENT
+    if HTTP_CLIENT is None:
+        import httpx
+        HTTP_CLIENT = httpx.AsyncClient(limits=httpx.Limits(**HTTP_POOL), http1=True, http2=False)
+    return HTTP_CLIENT
+
+
+class HttpRequest:
+    """How one HTTP tool maps its arguments onto a request"""
+
+    __slots__ = ("method", "url", "path", "query", "body", "headers", "retries", "timeout")
+
+    def __init__(self, method: str, url: str, path: tuple, query: tuple, body: tuple,
+                 headers: dict, retries: int, timeout: float):
+        self.method = method
+        self.url = url
+        self.path = path
+        self.query = query
+        self.body = body
+        self.headers = headers
+        self.retries = retries
+        self.timeout = timeout
+
+    def build(self, arguments: dict) -> tuple[str, dict, Any]:
+        """Return the (url, query parameters, JSON body) of one call"""
+        url = self.url
+        if self.path:
+            values = {}
+            for name in self.path:
+                if arguments.get(name) is None:
+                    raise ValueError(f"{self.method} {self.url}: missing path argument '{name}'")
+                values[name] = urllib.parse.quote(str(arguments[name]), safe="")
+            url = url.format_map(values)
+        params = {name: arguments[name] for name in self.query if arguments.get(name) is not None}
+        body = {name: arguments[name] for name in self.body if name in arguments} if self.body else None
+        return url, params, body
+
+
+def retry_delay(attempt: int, response) -> float:
+    """Seconds to wait before retry number attempt + 1, honouring a short Retry-After"""
+    retry_after = response.headers.get("retry-after", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(float(retry_after), HTTP_BACKOFF_MAX)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+async def http_call(request: HttpRequest, arguments: dict) -> list[TextContent]:
+    """Send one tool call as an HTTP request and return the response body as text"""
+    import httpx
+
+    client = shared_http_client()
+    url, params, body = request.build(arguments)
+    idempotent = request.method in HTTP_IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = await client.request(
+                request.method, url, params=params, json=body, headers=request.headers, timeout=request.timeout
+            )
+        except httpx.TransportError as e:
+            # A request that never reached the server is safe to send again whatever its method
+            unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+            if attempt >= request.retries or not (idempotent or unsent):
+                raise HttpToolError(f"{request.method} {url} failed: {e!r}") from e
+        else:
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt >= request.retries or not idempotent:
+                break
+        await asyncio.sleep(retry_delay(attempt, response))
+        attempt += 1
+
+    if response.status_code >= 400:
+        raise HttpToolError(f"{request.method} {url} returned {response.status_code}: {response.text[:500]}")
+    return [TextContent(type="text", text=response.text)]
+''')
+
+HTTP_REQUEST = Template('''
+{{request_name}} = HttpRequest(
+    {{method}},
+    {{url}},
+    path={{path}},
+    query={{query}},
+    body={{body}},
+    headers={{headers}},
+    retries={{retries}},
+    timeout={{timeout}}
+)
+''')
+
+HTTP_TOOL_FUNCTION = Template('''{{request}}
+{{validator}}{{decorators}}{{function_def}} {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}{{lazy_imports}}    return await http_call({{request_name}}, arguments)
+''')
+
+
+def http_pool_settings(pool) -> dict:
+    """
+    Read and check the "http_pool" server option, filling in defaults.
+
+    Raises:
+        ValueError: If it is not an object of positive limits
+    """
+    if pool is None:
+        return dict(DEFAULT_HTTP_POOL)
+    if not isinstance(pool, dict) or set(pool) - set(DEFAULT_HTTP_POOL):
+        raise ValueError(f"http_pool must be an object with {', '.join(DEFAULT_HTTP_POOL)}")
+
+    settings = {**DEFAULT_HTTP_POOL, **pool}
+    if not is_positive_int(settings["max_connections"]):
+        raise ValueError("http_pool max_connections must be a positive integer")
+    if not is_positive_int(settings["max_keepalive_connections"]):
+        raise ValueError("http_pool max_keepalive_connections must be a positive integer")
+    expiry = settings["keepalive_expiry"]
+    if isinstance(expiry, bool) or not isinstance(expiry, (int, float)) or expiry <= 0:
+        raise ValueError("http_pool keepalive_expiry must be a positive number of seconds")
+    settings["keepalive_expiry"] = float(expiry)
+    return settings
+
+
+def http_settings(tool: dict) -> dict:
+    """
+    Read and check the fields of an "http" tool.
+
+    Returns:
+        The HttpRequest fields: method, url, path, query, body, headers, retries, timeout
+
+    Raises:
+        ValueError: If a field is missing or has an unsupported value
+    """
+    tool_name = tool.get("name", "example_tool")
+    url = tool.get("url")
+    method = str(tool.get("method", "GET")).upper()
+    mapping = tool.get("arguments", {})
+    headers = tool.get("headers", {})
+    retries = tool.get("retries", DEFAULT_RETRIES)
+    timeout = tool.get("request_timeout", DEFAULT_REQUEST_TIMEOUT)
+
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        raise ValueError(f"Tool {tool_name}: http tools need an http:// or https:// 'url'")
+    if method not in HTTP_METHODS:
+        raise ValueError(f"Tool {tool_name}: method must be one of {', '.join(HTTP_METHODS)}")
+    if not isinstance(mapping, dict) or any(target not in ARGUMENT_TARGETS for target in mapping.values()):
+        raise ValueError(f"Tool {tool_name}: arguments must map parameter names to 'query' or 'json'")
+    if not isinstance(headers, dict) or not all(isinstance(value, str) for value in headers.values()):
+        raise ValueError(f"Tool {tool_name}: headers must map header names to strings")
+    if isinstance(retries, bool) or not isinstance(retries, int) or retries < 0:
+        raise ValueError(f"Tool {tool_name}: retries must be a non-negative integer")
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+        raise ValueError(f"Tool {tool_name}: request_timeout must be a positive number of seconds")
+    if tool.get("executor", "inline") != "inline":
+        raise ValueError(f"Tool {tool_name}: http tools run on the event loop and cannot use an executor")
+
+    names = [str(param["name"]) for param in tool.get("parameters", [])]
+    try:
+        path = tuple(dict.fromkeys([field for _, field, _, _ in Formatter().parse(url) if field is not None]))
+    except ValueError:
+        raise ValueError(f"Tool {tool_name}: malformed url template {url}") from None
+    for field in path:
+        if field not in names:
+            raise ValueError(f"Tool {tool_name}: url placeholder {{{field}}} is not a parameter")
+    for name in mapping:
+        if name not in names or name in path:
+            raise ValueError(f"Tool {tool_name}: argument '{name}' is not a query or body parameter")
+
+    default_target = "query" if method in QUERY_METHODS else "json"
+    targets = {name: mapping.get(name, default_target) for name in names if name not in path}
+    return {
+        "method": method,
+        "url": url,
+        "path": path,
+        "query": tuple([name for name, target in targets.items() if target == "query"]),
+        "body": tuple([name for name, target in targets.items() if target == "json"]),
+        "headers": {str(key): value for key, value in headers.items()},
+        "retries": retries,
+        "timeout": float(timeout)
+    }
+
+
+def render_names(names: tuple) -> str:
+    """Render a tuple of strings as a Python literal"""
+    return "(" + "".join([f"{encode_string(name)}, " for name in names]).rstrip(" ") + ")"
+
+
+def render_http_request(tool: dict) -> tuple[str, str]:
+    """Return the (constant name, HttpRequest(...) definition) of an http tool"""
+    settings = http_settings(tool)
+    request_name = python_identifier("request", str(tool.get("name", "example_tool")), upper=True)
+    headers = ", ".join([f"{encode_string(key)}: {encode_string(value)}" for key, value in settings["headers"].items()])
+    return request_name, HTTP_REQUEST.render(
+        request_name=request_name,
+        method=encode_string(settings["method"]),
+        url=encode_string(settings["url"]),
+        path=render_names(settings["path"]),
+        query=render_names(settings["query"]),
+        body=render_names(settings["body"]),
+        headers="{" + headers + "}",
+        retries=str(settings["retries"]),
+        timeout=repr(settings["timeout"])
+    )
+
+
+def render_http_runtime(features, options: dict) -> str:
+    """Render the shared HTTP client runtime, or nothing if the server has no http tools"""
+    if "http_client" not in features:
+        return ""
+    return HTTP_RUNTIME.render(http_pool=repr(http_pool_settings(options["http_pool"])))
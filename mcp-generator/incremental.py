@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Incremental Regeneration - Per-item config diffing and rendered fragment reuse.
+Editing one tool of a large server only re-renders that tool's fragments; every
+unchanged tool, resource and prompt is stitched back in from the fragment cache.
+"""
+
+import copy
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import server_templates
+
+# Field that identifies an item within each config section
+SECTION_KEYS = {
+    "tools": "name",
+    "resources": "uri",
+    "prompts": "name"
+}
+
+DEFAULT_MAX_FRAGMENTS = 100_000
+
+
+def item_identity(section: str, item: dict) -> Optional[Any]:
+    """Return the hashable identity of a config item, or None if it has none"""
+    identity = item.get(SECTION_KEYS[section])
+    if isinstance(identity, (str, int, float)):
+        return identity
+    return None
+
+
+def diff_configs(previous_config: dict, new_config: dict, server_type: str) -> dict:
+    """
+    Diff two configs per tool, resource and prompt.
+
+    An identity that occurs more than once in either config cannot be paired
+    up item by item, so it counts as changed.
+
+    Returns:
+        Dictionary mapping each section of the server type to its
+        'added', 'removed', 'changed' and 'unchanged' identities
+    """
+    diff = {}
+    for section in server_templates.section_slots(server_type):
+        repeated = set()
+        previous_items, new_items = {}, {}
+        for items, config in ((previous_items, previous_config), (new_items, new_config)):
+            for item in config.get(section, []):
+                identity = item_identity(section, item)
+                if identity in items:
+                    repeated.add(identity)
+                else:
+                    items[identity] = item
+
+        added, changed, unchanged = [], [], []
+        for identity, item in new_items.items():
+            if identity not in previous_items:
+                added.append(identity)
+            elif identity in repeated or previous_items[identity] != item:
+                changed.append(identity)
+            else:
+                unchanged.append(identity)
+
+        diff[section] = {
+            "added": added,
+            "removed": [identity for identity in previous_items if identity not in new_items],
+            "changed": changed,
+            "unchanged": unchanged
+        }
+    return diff
+
+
+class FragmentCache:
+    """
+    Rendered item fragments keyed on scope, item identity and generation options.
+    The scope (e.g. the server's name and description) keeps the fragments of
+    servers that share a cache apart.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_FRAGMENTS):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[dict, tuple[str, ...]]] = OrderedDict()
+        # (scope, server_type, section, identity) -> options keys it has entries for, so discard skips the scan
+        self._variants: dict[tuple, set[str]] = {}
+        self.reused = 0
+        self.rendered = 0
+
+    def render(self, server_type: str, section: str, item: dict, options: dict,
+               scope: Hashable = None, key_options: Optional[str] = None) -> tuple[str, ...]:
+        """Return the fragments of item, rendering them only if the item or the options changed"""
+        identity = item_identity(section, item)
+        if identity is None:
+            self.rendered += 1
+            return server_templates.render_item(server_type, section, item, options)
+
+        key = (scope, server_type, section, identity, key_options or server_templates.options_key(options))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == item:
+            self._entries.move_to_end(key)
+            self.reused += 1
+            return entry[1]
+
+        fragments = server_templates.render_item(server_type, section, item, options)
+        # Keep a private copy so in-place edits of the caller's config are detected
+        self._entries[key] = (copy.deepcopy(item), fragments)
+        self._entries.move_to_end(key)
+        self._variants.setdefault(key[:4], set()).add(key[4])
+        if len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._forget(evicted)
+        self.rendered += 1
+        return fragments
+
+    def render_sections(self, server_type: str, config: dict, options: dict, scope: Hashable = None) -> dict:
+        """Render every section of the config through the cache"""
+        key_options = server_templates.options_key(options)
+        return {
+            section: [
+                self.render(server_type, section, item, options, scope, key_options)
+                for item in config.get(section, [])
+            ]
+            for section in server_templates.section_slots(server_type)
+        }
+
+    def _forget(self, key: tuple) -> None:
+        """Drop an evicted entry's options key from the identity index"""
+        variants = self._variants.get(key[:4])
+        if variants is not None:
+            variants.discard(key[4])
+            if not variants:
+                del self._variants[key[:4]]
+
+    def discard(self, server_type: str, section: str, identity: Any, scope: Hashable = None) -> None:
+        """Forget the fragments of a removed item, for every set of options"""
+        for key_options in self._variants.pop((scope, server_type, section, identity), ()):
+            self._entries.pop((scope, server_type, section, identity, key_options), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Record Templates - Resources of type "jsonl", which serve one record of a large
+JSONL file per URI, such as data://records/{id}. A persistent sidecar index maps
+each record's key to its byte offset; it is built once, extended when the file
+only grows, and loaded into a dict, so a read is one lookup, one slice of a
+memory map and one line parse however large the file is.
+"""
+
+from template_engine import Template, encode_string, python_identifier
+from sqlite_templates import uri_route
+
+DEFAULT_KEY = "id"
+
+RECORD_RUNTIME = Template('''
+# JSONL record resources, found through a persistent key -> byte offset sidecar index
+RECORD_INDEX_VERSION = 1
+
+# The sidecar starts with a fixed-size JSON header, rewritten in place after each append
+RECORD_HEADER_BYTES = 256
+
+# Bytes before the indexed end of a file that must be unchanged for it to count as appended to
+RECORD_TAIL_BYTES = 4096
+
+
+class RecordFile:
+    """
+    A JSONL file served by key. The sidecar holds a header and one "offset key"
+    line per record. When the file has only grown, the new records are indexed
+    and appended to the sidecar; otherwise the sidecar is rebuilt. A later
+    record wins over an earlier one with the same key.
+    """
+
+    def __init__(self, path: str, key: str, index: str, uri_pattern: str):
+        base = os.path.dirname(os.path.abspath(__file__))
+        self.path = os.path.join(base, path)
+        self.index_path = os.path.join(base, index)
+        self.key = key
+        self.uri_pattern = re.compile(uri_pattern)
+        self.offsets: dict[str, int] | None = None
+        self.indexed = 0
+        self.indexed_tail = None
+        self.version = None
+        self.mapped = None
+        self.lock = threading.Lock()
+        self.stats = {"loaded": 0, "appended": 0, "rebuilds": 0}
+
+    def tail(self, end: int) -> str:
+        """Digest of the bytes just before end, to tell an appended file from a rewritten one"""
+        start = max(0, end - RECORD_TAIL_BYTES)
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            return hashlib.blake2b(file.read(end - start), digest_size=16).hexdigest()
+
+    def header(self) -> bytes:
+        """The sidecar header, padded to RECORD_HEADER_BYTES so it can be rewritten in place"""
+        header = {"version": RECORD_INDEX_VERSION, "key": self.key, "indexed": self.indexed, "tail": self.indexed_tail}
+        return json.dumps(header).encode().ljust(RECORD_HEADER_BYTES - 1) + b"\\n"
+
+    def load(self) -> None:
+        """Read the sidecar into memory; a missing or foreign sidecar leaves no index to extend"""
+        try:
+            with open(self.index_path, "rb") as file:
+                header = json.loads(file.read(RECORD_HEADER_BYTES))
+                body = file.read().decode("utf-8")
+        except (OSError, ValueError):
+            return
+        if header.get("version") != RECORD_INDEX_VERSION or header.get("key") != self.key:
+            return
+        offsets = {}
+        for line in body.split("\\n"):
+            offset, _, key = line.partition(" ")
+            if key:
+                offsets[key] = int(offset)
+        self.offsets, self.indexed, self.indexed_tail = offsets, header["indexed"], header["tail"]
+        self.stats["loaded"] = len(offsets)
+
+    def scan(self, start: int) -> tuple[dict, int]:
+        """
+        Find the records of the complete lines from start; returns (key -> offset, end of the
+        last complete line). A final line without a newline is complete once it parses.
+        """
+        found = {}
+        with open(self.path, "rb") as file:
+            file.seek(start)
+            offset = start
+            for line in file:
+                try:
+                    record = json.loads(line) if line.strip() else None
+                except ValueError:
+                    if not line.endswith(b"\\n"):
+                        break  # A final line still being written is indexed on the next refresh
+                    record = None  # Malformed lines are skipped, not fatal
+                key = record.get(self.key) if isinstance(record, dict) else None
+                if isinstance(key, (str, int)) and not isinstance(key, bool) and "\\n" not in str(key):
+                    found[str(key)] = offset
+                offset += len(line)
+        return found, offset
+
+    def write(self, found: dict, append: bool) -> None:
+        """Persist new sidecar entries, then the header that makes them count"""
+        entries = "".join([f"{offset} {key}\\n" for key, offset in found.items()]).encode("utf-8")
+        try:
+            if append:
+                with open(self.index_path, "r+b") as file:
+                    file.seek(0, os.SEEK_END)
+                    file.write(entries)
+                    file.flush()
+                    file.seek(0)
+                    file.write(self.header())
+            else:
+                with open(self.index_path + ".tmp", "wb") as file:
+                    file.write(self.header())
+                    file.write(entries)
+                os.replace(self.index_path + ".tmp", self.index_path)
+        except OSError:
+            pass  # Without a writable sidecar the in-memory index still serves this process
+
+    def refresh(self, rebuild: bool = False) -> None:
+        """Bring the index up to date with the file; runs on a worker thread"""
+        with self.lock:
+            stat = os.stat(self.path)
+            version = (stat.st_size, stat.st_mtime_ns)
+            if version == self.version and not rebuild:
+                return
+            if self.offsets is None and not rebuild:
+                self.load()
+            appended = (
+                not rebuild and self.offsets is not None and stat.st_size >= self.indexed
+                and self.tail(self.indexed) == self.indexed_tail
+            )
+            start = self.indexed if appended else 0
+            found, end = self.scan(start)
+            self.indexed, self.indexed_tail = end, self.tail(end)
+            if appended:
+                if end > start:
+                    self.write(found, append=True)
+                    self.stats["appended"] += len(found)
+            else:
+                self.write(found, append=False)
+                self.stats["rebuilds"] += 1
+
+            # Map the grown file before publishing offsets that point into it; readers of the
+            # old map keep it alive until they finish
+            mapped = None
+            if stat.st_size:
+                with open(self.path, "rb") as file:
+                    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapped = mapped
+            if appended:
+                self.offsets.update(found)
+            else:
+                self.offsets = found
+            self.version = version
+
+    def lookup(self, key: str) -> str | None:
+        """
+        The line of the record with key, or None if there is none.
+
+        Raises:
+            LookupError: If the line found has a different key, i.e. the file was rewritten in place
+        """
+        offset = self.offsets.get(key)
+        if offset is None:
+            return None
+        mapped = self.mapped
+        end = mapped.find(b"\\n", offset)
+        line = mapped[offset:end if end >= 0 else len(mapped)]
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict) or str(record.get(self.key)) != key:
+            raise LookupError(key)
+        return line.decode("utf-8")
+
+    async def read(self, uri: str) -> list[TextContent]:
+        """Serve the record whose key is the URI placeholder"""
+        match = self.uri_pattern.match(uri.partition("?")[0])
+        if match is None:
+            raise ValueError(f"Unknown resource: {uri}")
+        key = urllib.parse.unquote(match.group(1))
+
+        stat = os.stat(self.path)
+        if (stat.st_size, stat.st_mtime_ns) != self.version:
+            await asyncio.to_thread(self.refresh)
+        try:
+            line = self.lookup(key)
+        except LookupError:
+            await asyncio.to_thread(self.refresh, True)
+            line = self.lookup(key)
+        if line is None:
+            raise ValueError(f"Unknown record: {uri}")
+        return [TextContent(type="text", text=line)]
+
+
+RECORD_FILES: dict[str, RecordFile] = {}
+''')
+
+RECORD_RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="{{res_name}}",
+        description="{{res_desc}}",
+        mimeType="application/json"
+    ),''')
+
+RECORD_RESOURCE_FUNCTION = Template('''
+RECORD_FILES[{{uri_literal}}] = RecordFile({{path}}, key={{key}}, index={{index}}, uri_pattern={{uri_pattern}})
+
+
+@resource_route({{prefix_literal}}, "application/json")
+{{cache_decorator}}async def {{func_name}}(uri: str) -> list[TextContent]:
+    ""{{res_doc}}""
+    return await RECORD_FILES[{{uri_literal}}].read(uri)
+''')
+
+
+def record_settings(resource: dict) -> tuple[str, str, str, str, str]:
+    """
+    Read and check the fields of a "jsonl" resource.
+
+    Returns:
+        (path, key, index, route prefix, URI pattern)
+
+    Raises:
+        ValueError: If a field is missing or the URI does not end in one {placeholder}
+    """
+    uri = str(resource.get("uri", "resource://example"))
+    path = resource.get("path")
+    key = resource.get("key", DEFAULT_KEY)
+
+    if not isinstance(path, str) or not path:
+        raise ValueError(f"Resource {uri}: jsonl resources need a 'path'")
+    if not isinstance(key, str) or not key:
+        raise ValueError(f"Resource {uri}: key must be the name of a JSONL field")
+    index = resource.get("index", path + ".idx")
+    if not isinstance(index, str) or not index:
+        raise ValueError(f"Resource {uri}: index must be a file path")
+    prefix, uri_pattern = uri_route(uri)
+    if uri_pattern.count("(?P<") != 1 or not uri_pattern.endswith("[^/]+)$"):
+        raise ValueError(f"Resource {uri}: jsonl resource URIs end in one placeholder, e.g. data://records/{{id}}")
+    return path, key, index, prefix, uri_pattern
+
+
+def render_record_definition(resource: dict) -> str:
+    """Render the catalog entry of a jsonl resource"""
+    record_settings(resource)
+    return RECORD_RESOURCE_DEFINITION.render(
+        res_uri=str(resource.get("uri", "resource://example")),
+        res_name=str(resource.get("name", "Example Resource")),
+        res_desc=str(resource.get("description", "Example resource"))
+    )
+
+
+def render_record_function(resource: dict, cache_decorator: str) -> str:
+    """Render the registration and routed function of a jsonl resource"""
+    path, key, index, prefix, uri_pattern = record_settings(resource)
+    res_uri = str(resource.get("uri", "resource://example"))
+    return RECORD_RESOURCE_FUNCTION.render(
+        uri_literal=encode_string(res_uri),
+        path=encode_string(path),
+        key=encode_string(key),
+        index=encode_string(index),
+        uri_pattern=encode_string(uri_pattern),
+        prefix_literal=encode_string(prefix),
+        cache_decorator=cache_decorator,
+        func_name=python_identifier("resource", res_uri),
+        res_doc=encode_string(str(resource.get("description", "Example resource")))
+    )
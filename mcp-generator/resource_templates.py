@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Resource Templates - Resource kinds beyond the placeholder resource, and
+resource caching. A resource's "type" selects how its catalog entry and
+routed function are rendered, and its "cache" field adds a decorator; the
+runtime a kind or the cache needs is emitted once per server, only when at
+least one resource uses it.
+"""
+
+from template_engine import Template, encode_string, python_identifier
+from runtime_templates import DEFAULT_CACHE_MAX_ENTRIES, is_positive_int
+from record_templates import RECORD_RUNTIME, render_record_definition, render_record_function
+from sqlite_templates import render_sqlite_definition, render_sqlite_function
+
+# Standard library imports each resource feature needs in the generated server
+RESOURCE_IMPORTS = {
+    "files": ("import base64", "import json", "import mmap", "import os", "from urllib.parse import parse_qs, urlsplit"),
+    "records": (
+        "import hashlib", "import json", "import mmap", "import os", "import re", "import threading", "import urllib.parse"
+    ),
+    "resource_cache": (
+        "import functools", "import hashlib", "import json", "import time", "import weakref",
+        "from collections import OrderedDict"
+    )
+}
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+FILE_ENCODINGS = ("text", "base64")
+
+FILE_RUNTIME = Template('''
+# File resources, served one byte range at a time from a memory map
+MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+def utf8_boundary(mapped, position: int, size: int) -> int:
+    """The first offset from position that is not inside a UTF-8 character (at most 3 bytes on)"""
+    stop = min(position + 3, size)
+    while position < stop and 0x80 <= mapped[position] < 0xC0:
+        position += 1
+    return position
+
+
+class FileResource:
+    """A local file read through mmap; a request copies only the bytes it asks for"""
+
+    def __init__(self, path: str, chunk_size: int, encoding: str):
+        self.path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.mapped = None
+        self.version = None
+
+    def mapping(self):
+        """The memory map of the file, remapped whenever its size or mtime changes"""
+        stat = os.stat(self.path)
+        version = (stat.st_size, stat.st_mtime_ns)
+        if version != self.version:
+            if self.mapped is not None:
+                self.mapped.close()
+            self.mapped = None
+            if stat.st_size:
+                with open(self.path, "rb") as file:
+                    self.mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.version = version
+        return self.mapped
+
+    def read(self, uri: str) -> str:
+        """
+        Serve the range a URI asks for: ?chunk=N, ?offset=B&length=L (at most one
+        chunk), or ?stat for the file size and chunk count. No query means chunk 0.
+        """
+        mapped = self.mapping()
+        size = self.version[0]
+        query = parse_qs(urlsplit(uri).query, keep_blank_values=True)
+
+        if "stat" in query:
+            return json.dumps({"size": size, "chunk_size": self.chunk_size, "chunks": -(-size // self.chunk_size)})
+        try:
+            if "chunk" in query:
+                offset, length = int(query["chunk"][0]) * self.chunk_size, self.chunk_size
+            else:
+                offset = int(query.get("offset", ["0"])[0])
+                length = min(int(query.get("length", [str(self.chunk_size)])[0]), self.chunk_size)
+        except ValueError:
+            raise ValueError(f"Invalid byte range in {uri}") from None
+        if offset < 0 or length < 0:
+            raise ValueError(f"Invalid byte range in {uri}")
+        if offset >= size and (offset or size):
+            raise ValueError(f"Invalid byte range in {uri}: the file has {size} bytes")
+
+        end = min(offset + length, size)
+        if self.encoding == "text" and mapped is not None:
+            # Move both ends forward to a character start, so consecutive ranges split no character
+            offset, end = utf8_boundary(mapped, offset, size), utf8_boundary(mapped, end, size)
+        data = mapped[offset:end] if mapped is not None else b""
+        if data and MADV_DONTNEED is not None:
+            # Unmap the pages just copied so RSS stays flat; they remain in the OS page cache
+            start = offset - offset % mmap.PAGESIZE
+            mapped.madvise(MADV_DONTNEED, start, offset + len(data) - start)
+        if self.encoding == "base64":
+            return base64.b64encode(data).decode("ascii")
+        return data.decode("utf-8", errors="replace")
+
+
+FILE_RESOURCES: dict[str, FileResource] = {}
+''')
+
+RESOURCE_CACHE_RUNTIME = Template('''
+# Resource content caching with version tags and change notifications
+def content_etag(contents: list) -> str:
+    """Version tag of resource contents: a short hash of their text (or data)"""
+    digest = hashlib.blake2b(digest_size=8)
+    for content in contents:
+        digest.update(str(getattr(content, "text", None) or getattr(content, "data", "")).encode())
+        digest.update(b"\\0")
+    return digest.hexdigest()
+
+
+class ResourceCache:
+    """
+    LRU content cache of one routed resource, keyed on the full URI. Entries are fresh
+    for `ttl` seconds, then served stale for up to `stale_while_revalidate` more seconds
+    while a single background load refreshes them.
+    """
+
+    def __init__(self, load, ttl: float, stale_while_revalidate: float, max_entries: int):
+        self.load = load
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float, str, list]] = OrderedDict()
+        self.in_flight: dict[str, asyncio.Task] = {}
+        self.watchers: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.changes = 0
+
+    async def read(self, uri: str) -> tuple[str, list]:
+        """Return the (version tag, contents) of uri, loading it only when it is missing or expired"""
+        entry = self.entries.get(uri)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl + self.stale_while_revalidate:
+                self.entries.move_to_end(uri)
+                if age < self.ttl:
+                    self.hits += 1
+                else:
+                    self.stale_hits += 1
+                    # Nobody awaits a background refresh; read its exception so it is not logged
+                    self.refresh(uri).add_done_callback(lambda task: task.cancelled() or task.exception())
+                return entry[1], entry[2]
+        self.misses += 1
+        # Shielded so one reader giving up does not cancel the shared load
+        return await asyncio.shield(self.refresh(uri))
+
+    def refresh(self, uri: str) -> asyncio.Task:
+        """Start loading uri unless a load is already running, and return the load"""
+        task = self.in_flight.get(uri)
+        if task is None:
+            task = self.in_flight[uri] = asyncio.ensure_future(self._fill(uri))
+        return task
+
+    async def _fill(self, uri: str) -> tuple[str, list]:
+        try:
+            contents = await self.load(uri)
+            etag = content_etag(contents)
+            self.loads += 1
+            previous = self.entries.pop(uri, None)
+            self.entries[uri] = (time.monotonic(), etag, contents)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if previous is not None and previous[1] != etag:
+                self.changes += 1
+                asyncio.ensure_future(notify_updated(uri))
+            return etag, contents
+        finally:
+            del self.in_flight[uri]
+
+    def watch(self, uri: str) -> None:
+        """Reload a subscribed uri every ttl seconds for as long as it has subscribers"""
+        if uri not in self.watchers:
+            self.watchers[uri] = asyncio.ensure_future(self._watch(uri))
+
+    async def _watch(self, uri: str) -> None:
+        try:
+            while SUBSCRIBERS.get(uri):
+                try:
+                    await asyncio.shield(self.refresh(uri))
+                except Exception:
+                    pass  # Keep the last good content and try again next period
+                await asyncio.sleep(self.ttl)
+        finally:
+            del self.watchers[uri]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "changes": self.changes,
+            "entries": len(self.entries),
+            "ttl": self.ttl,
+            "stale_while_revalidate": self.stale_while_revalidate
+        }
+
+
+RESOURCE_CACHES: dict[str, ResourceCache] = {}
+
+
+def cached_resource(prefix: str, ttl: float, stale_while_revalidate: float, max_entries: int):
+    """Serve a resource from a ResourceCache; `<uri>?version` (or `&version`) returns only its version tag"""
+    def decorate(func):
+        cache = RESOURCE_CACHES[prefix] = ResourceCache(func, ttl, stale_while_revalidate, max_entries)
+
+        @functools.wraps(func)
+        async def wrapper(uri: str) -> list[TextContent]:
+            if uri.endswith(("?version", "&version")):
+                etag, _ = await cache.read(uri[:-8])
+                return [TextContent(type="text", text=json.dumps({"uri": uri[:-8], "etag": etag}))]
+            return (await cache.read(uri))[1]
+
+        wrapper.resource_cache = cache
+        return wrapper
+    return decorate
+
+
+# Sessions subscribed to each URI; closed sessions drop out on their own
+SUBSCRIBERS: dict[str, weakref.WeakSet] = {}
+
+
+async def notify_updated(uri: str) -> None:
+    """Send resources/updated for uri to every session subscribed to it"""
+    sessions = SUBSCRIBERS.get(uri, ())
+    for session in list(sessions):
+        try:
+            await session.send_resource_updated(uri)
+        except Exception:
+            sessions.discard(session)
+
+
+@app.subscribe_resource()
+async def subscribe_resource(uri) -> None:
+    """Notify the calling session whenever the content of uri changes"""
+    uri = request_uri(uri)
+    SUBSCRIBERS.setdefault(uri, weakref.WeakSet()).add(app.request_context.session)
+    cache = getattr(RESOURCE_ROUTER.match(uri), "resource_cache", None)
+    if cache is not None:
+        cache.watch(uri)
+
+
+@app.unsubscribe_resource()
+async def unsubscribe_resource(uri) -> None:
+    """Stop notifying the calling session about uri"""
+    sessions = SUBSCRIBERS.get(request_uri(uri))
+    if sessions is not None:
+        sessions.discard(app.request_context.session)
+
+
+server_capabilities = app.get_capabilities
+
+
+def get_capabilities(*args, **kwargs):
+    """The low-level Server never advertises resource subscriptions; this server supports them"""
+    capabilities = server_capabilities(*args, **kwargs)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+
+app.get_capabilities = get_capabilities
+''')
+
+RESOURCE_CACHE_DECORATOR = Template(
+    '@cached_resource({{uri_literal}}, ttl={{ttl}}, stale_while_revalidate={{stale}}, max_entries={{max_entries}})\n'
+)
+
+FILE_RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="{{res_name}}",
+        description="{{res_desc}}",
+        mimeType="{{mime_type}}"
+    ),''')
+
+FILE_RESOURCE_FUNCTION = Template('''
+FILE_RESOURCES[{{uri_literal}}] = FileResource({{path}}, chunk_size={{chunk_size}}, encoding="{{encoding}}")
+
+
+@resource_route({{uri_literal}}, {{mime_literal}})
+{{cache_decorator}}async def {{func_name}}(uri: str) -> list[TextContent]:
+    ""{{res_doc}}""
+    return [TextContent(type="text", text=FILE_RESOURCES[{{uri_literal}}].read(uri))]
+''')
+
+# Runtime blocks in the order they are emitted
+RESOURCE_RUNTIMES = {
+    "files": FILE_RUNTIME,
+    "records": RECORD_RUNTIME,
+    "resource_cache": RESOURCE_CACHE_RUNTIME
+}
+
+# Resource "type" -> the feature whose runtime it needs
+RESOURCE_KINDS = {
+    "file": "files",
+    "sqlite": "sqlite",
+    "jsonl": "records"
+}
+
+
+def file_settings(resource: dict) -> tuple[str, int, str, str]:
+    """
+    Read and check the fields of a "file" resource.
+
+    Returns:
+        (path, chunk_size, encoding, mime_type)
+
+    Raises:
+        ValueError: If a field is missing or has an unsupported value
+    """
+    uri = resource.get("uri", "resource://example")
+    path = resource.get("path")
+    chunk_size = resource.get("chunk_size", DEFAULT_CHUNK_SIZE)
+    encoding = resource.get("encoding", "text")
+
+    if not isinstance(path, str) or not path:
+        raise ValueError(f"Resource {uri}: file resources need a 'path'")
+    if not is_positive_int(chunk_size):
+        raise ValueError(f"Resource {uri}: chunk_size must be a positive integer")
+    if encoding not in FILE_ENCODINGS:
+        raise ValueError(f"Resource {uri}: encoding must be 'text' or 'base64'")
+    default_mime_type = "text/plain" if encoding == "text" else "application/octet-stream"
+    return path, chunk_size, encoding, str(resource.get("mime_type", default_mime_type))
+
+
+def resource_cache_settings(resource: dict) -> tuple[float, float, int]:
+    """
+    Read and check the "cache" field of a resource.
+
+    Returns:
+        (ttl, stale_while_revalidate, max_entries)
+
+    Raises:
+        ValueError: If a field is not a positive number (stale_while_revalidate may be 0)
+    """
+    uri = resource.get("uri", "resource://example")
+    cache = resource["cache"]
+    if not isinstance(cache, dict):
+        raise ValueError(f"Resource {uri}: cache must be an object with 'ttl' and 'stale_while_revalidate'")
+
+    ttl = cache.get("ttl")
+    stale = cache.get("stale_while_revalidate", 0)
+    max_entries = cache.get("max_entries", DEFAULT_CACHE_MAX_ENTRIES)
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+        raise ValueError(f"Resource {uri}: cache ttl must be a positive number of seconds")
+    if isinstance(stale, bool) or not isinstance(stale, (int, float)) or stale < 0:
+        raise ValueError(f"Resource {uri}: cache stale_while_revalidate must be a number of seconds >= 0")
+    if not is_positive_int(max_entries):
+        raise ValueError(f"Resource {uri}: cache max_entries must be a positive integer")
+    return float(ttl), float(stale), max_entries
+
+
+def render_resource_cache_decorator(resource: dict) -> str:
+    """Render the @cached_resource(...) line of a resource, or nothing if it is not cached"""
+    if not resource.get("cache"):
+        return ""
+    ttl, stale, max_entries = resource_cache_settings(resource)
+    return RESOURCE_CACHE_DECORATOR.render(
+        uri_literal=encode_string(str(resource.get("uri", "resource://example"))),
+        ttl=repr(ttl),
+        stale=repr(stale),
+        max_entries=str(max_entries)
+    )
+
+
+def resource_kind(resource: dict) -> str:
+    """The resource kind rendered for a resource; unknown types are placeholder resources"""
+    kind = resource.get("type")
+    return kind if isinstance(kind, str) and kind in RESOURCE_KINDS else ""
+
+
+def resource_features(resources: list[dict]) -> set:
+    """Return the runtime features the resources of a config need"""
+    features = {RESOURCE_KINDS[resource_kind(resource)] for resource in resources if resource_kind(resource)}
+    if any(resource.get("cache") for resource in resources):
+        features.add("resource_cache")
+    return features
+
+
+def resource_imports(features) -> tuple:
+    """Return the standard library import lines of the resource kinds in a set of features"""
+    return tuple([line for feature in features for line in RESOURCE_IMPORTS.get(feature, ())])
+
+
+def render_file_definition(resource: dict) -> str:
+    """Render the catalog entry of a file resource"""
+    _, _, _, mime_type = file_settings(resource)
+    return FILE_RESOURCE_DEFINITION.render(
+        res_uri=str(resource.get("uri", "resource://example")),
+        res_name=str(resource.get("name", "Example Resource")),
+        res_desc=str(resource.get("description", "Example resource")),
+        mime_type=mime_type
+    )
+
+
+def render_file_function(resource: dict) -> str:
+    """Render the registration and routed function of a file resource"""
+    path, chunk_size, encoding, mime_type = file_settings(resource)
+    res_uri = str(resource.get("uri", "resource://example"))
+    return FILE_RESOURCE_FUNCTION.render(
+        uri_literal=encode_string(res_uri),
+        mime_literal=encode_string(mime_type),
+        path=encode_string(path),
+        chunk_size=str(chunk_size),
+        encoding=encoding,
+        cache_decorator=render_resource_cache_decorator(resource),
+        func_name=python_identifier("resource", res_uri),
+        res_doc=encode_string(str(resource.get("description", "Example resource")))
+    )
+
+
+def render_sqlite_resource_function(resource: dict) -> str:
+    """Render the query constant and routed function of a sqlite resource"""
+    return render_sqlite_function(resource, render_resource_cache_decorator(resource))
+
+
+def render_record_resource_function(resource: dict) -> str:
+    """Render the registration and routed function of a jsonl resource"""
+    return render_record_function(resource, render_resource_cache_decorator(resource))
+
+
+# Resource kind -> (definition renderer, function renderer)
+KIND_RENDERERS = {
+    "file": (render_file_definition, render_file_function),
+    "sqlite": (render_sqlite_definition, render_sqlite_resource_function),
+    "jsonl": (render_record_definition, render_record_resource_function)
+}
+
+
+def render_resource_runtimes(features) -> str:
+    """Render the runtime blocks of the resource kinds in a set of features"""
+    return "".join([runtime.render() for feature, runtime in RESOURCE_RUNTIMES.items() if feature in features])
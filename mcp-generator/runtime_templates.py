@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+Runtime Templates - Support code emitted into generated servers on demand.
+Per-tool config fields (e.g. "cache") turn into decorators on the generated
+tool functions; the runtime those decorators need is emitted once per server,
+only when at least one tool uses it. Server-level options (e.g. "metrics")
+emit their runtime once into the header instead.
+"""
+
+import ast
+from typing import Optional
+
+from template_engine import Template, encode_string
+from validator_templates import VALIDATION_RUNTIME
+
+# Standard library imports each runtime feature needs in the generated server
+FEATURE_IMPORTS = {
+    "validation": ("import json",),
+    "cache": ("import functools", "import json", "import time", "from collections import OrderedDict"),
+    "limits": ("import functools",),
+    "deadline": ("import functools", "import json", "import time"),
+    "executor": (
+        "import contextvars",
+        "import threading",
+        "from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor"
+    ),
+    "metrics": ("import functools", "import json", "import time", "from bisect import bisect_left"),
+    "http_client": ("import random", "import urllib.parse"),
+    "sqlite": (
+        "import base64", "import concurrent.futures", "import json", "import os", "import re",
+        "import sqlite3", "import threading", "import urllib.parse"
+    ),
+    "search": ("import hashlib", "import json", "import os", "import re", "import sqlite3")
+}
+
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+
+EXECUTORS = ("inline", "thread", "process")
+
+CACHE_RUNTIME = Template('''
+# Tool result caching
+class ToolResultCache:
+    """LRU cache with a TTL for one tool; identical in-flight calls share one execution"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.in_flight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.merged = 0
+        self.evictions = 0
+
+    async def call(self, key: str, compute) -> Any:
+        # No await happens between the lookups and the bookkeeping below, so
+        # the cache stays consistent without locks on a single event loop
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self.entries[key]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            task = self.in_flight[key] = asyncio.ensure_future(self._fill(key, compute))
+        else:
+            self.merged += 1
+        # Shielded so one caller giving up does not cancel the shared execution
+        return await asyncio.shield(task)
+
+    async def _fill(self, key: str, compute) -> Any:
+        try:
+            result = await compute()
+            self.entries[key] = (time.monotonic() + self.ttl, result)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return result
+        finally:
+            del self.in_flight[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.merged
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "merged": self.merged,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "hit_rate": round((self.hits + self.merged) / lookups, 4) if lookups else 0.0,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries
+        }
+
+
+TOOL_CACHES: dict[str, ToolResultCache] = {}
+
+
+def cached(name: str, ttl: float, max_entries: int, normalize=None):
+    """Serve a tool from a ToolResultCache keyed on its canonicalized arguments"""
+    cache = TOOL_CACHES[name] = ToolResultCache(ttl, max_entries)
+
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(arguments: Any) -> list[TextContent]:
+            if normalize is not None:
+                arguments = normalize(arguments)
+            key = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=repr)
+            return await cache.call(key, lambda: func(arguments))
+        return wrapper
+    return decorate
+''')
+
+LIMITS_RUNTIME = Template('''
+# Per-tool concurrency limits
+class ToolBusyError(RuntimeError):
+    """Raised when a tool is at its concurrency limit and its wait queue is full"""
+
+
+class ToolLimiter:
+    """Runs at most `concurrency` calls of one tool at a time, with a bounded wait queue"""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int | None):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def run(self, func, arguments: Any) -> Any:
+        if self.semaphore.locked() and self.max_queue is not None and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ToolBusyError(f"{self.name}: {self.concurrency} calls running and {self.waiting} queued, try again later")
+
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            return await func(arguments)
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue
+        }
+
+
+TOOL_LIMITERS: dict[str, ToolLimiter] = {}
+
+
+def limited(name: str, concurrency: int, max_queue: int | None = None):
+    """Bound how many calls of a tool run at once and how many may wait"""
+    limiter = TOOL_LIMITERS[name] = ToolLimiter(name, concurrency, max_queue)
+
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(arguments: Any) -> list[TextContent]:
+            return await limiter.run(func, arguments)
+        return wrapper
+    return decorate
+''')
+
+EXECUTOR_RUNTIME = Template('''
+# Shared executors for tools that must not block the event loop
+_executors: dict[str, Executor] = {}
+
+
+def get_executor(kind: str) -> Executor:
+    """Return the shared thread or process pool, starting it on first use"""
+    executor = _executors.get(kind)
+    if executor is None:
+        executor = _executors[kind] = ThreadPoolExecutor() if kind == "thread" else ProcessPoolExecutor()
+    return executor
+
+
+_cancel_event: contextvars.ContextVar[threading.Event | None] = contextvars.ContextVar("tool_cancel_event", default=None)
+
+
+def tool_cancelled() -> bool:
+    """True once the call running in this worker thread was cancelled or timed out"""
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+async def run_in_executor(kind: str, func, arguments: Any) -> Any:
+    """
+    Run a synchronous tool implementation on the shared pool of the given kind.
+
+    Cancelling the caller (e.g. on timeout) drops work that is still queued.
+    Work already running in a thread can poll tool_cancelled() to stop early;
+    work already running in a process runs to completion.
+    """
+    loop = asyncio.get_running_loop()
+    if kind == "process":
+        return await loop.run_in_executor(get_executor(kind), func, arguments)
+
+    event = threading.Event()
+    context = contextvars.copy_context()
+    context.run(_cancel_event.set, event)
+    try:
+        return await loop.run_in_executor(get_executor(kind), context.run, func, arguments)
+    except asyncio.CancelledError:
+        event.set()
+        raise
+''')
+
+DEADLINE_RUNTIME = Template('''
+# Per-tool deadlines
+class ToolTimeoutError(TimeoutError):
+    """Raised when a tool exceeds its timeout_ms; the message is a JSON error object"""
+
+
+class ToolDeadline:
+    """Deadline of one tool, with the counters needed to tune its budget"""
+
+    def __init__(self, name: str, timeout_ms: int):
+        self.name = name
+        self.timeout_ms = timeout_ms
+        self.calls = 0
+        self.timeouts = 0
+        self.slowest_ms = 0.0
+
+    async def run(self, func, arguments: Any) -> Any:
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout_ms / 1000) as scope:
+                result = await func(arguments)
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            self.timeouts += 1
+            raise ToolTimeoutError(json.dumps({
+                "error": "timeout",
+                "tool": self.name,
+                "timeout_ms": self.timeout_ms
+            })) from None
+        self.slowest_ms = max(self.slowest_ms, (time.perf_counter() - start) * 1000)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "timeout_ms": self.timeout_ms,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "slowest_ms": round(self.slowest_ms, 3)
+        }
+
+
+TOOL_DEADLINES: dict[str, ToolDeadline] = {}
+
+
+def deadline(name: str, timeout_ms: int):
+    """Cancel a tool call that runs longer than timeout_ms"""
+    tool_deadline = TOOL_DEADLINES[name] = ToolDeadline(name, timeout_ms)
+
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(arguments: Any) -> list[TextContent]:
+            return await tool_deadline.run(func, arguments)
+        return wrapper
+    return decorate
+''')
+
+PAGINATION_RUNTIME = Template('''
+
+def serve_paged(request_type, result_type, field: str, catalog: list, page_size: int) -> None:
+    """Answer a listing request page by page; the cursor is the index of the next page"""
+    listed = app.request_handlers[request_type]
+    pages: list = []
+
+    def build_pages() -> None:
+        for start in range(0, max(len(catalog), 1), page_size):
+            end = start + page_size
+            next_cursor = str(start // page_size + 1) if end < len(catalog) else None
+            pages.append(ServerResult(result_type(**{field: catalog[start:end]}, nextCursor=next_cursor)))
+
+    async def paged_handler(request):
+        # Pages are built on first use and then returned as is
+        if not pages:
+            build_pages()
+            # The SDK's own handler fills the tool cache call_tool validates against; run it once
+            await listed(request)
+        cursor = getattr(getattr(request, "params", None), "cursor", None)
+        if cursor is None:
+            return pages[0]
+        if not (str(cursor).isdigit() and 0 < int(cursor) < len(pages)):
+            raise McpError(ErrorData(code=INVALID_PARAMS, message=f"Invalid cursor: {cursor!r}"))
+        return pages[int(cursor)]
+
+    app.request_handlers[request_type] = paged_handler
+''')
+
+METRICS_RUNTIME = Template('''
+
+# Call metrics: per-name counts, errors and fixed-bucket latency histograms
+METRIC_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+METRIC_MAX_SERIES = 1000  # per kind; further names are counted under "__other__"
+
+
+class CallMetrics:
+    """Counters of one tool, resource or prompt; the last bucket counts calls slower than every bound"""
+
+    __slots__ = ("calls", "errors", "total_ms", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * (len(METRIC_BUCKETS_MS) + 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "buckets_ms": dict(zip([*map(str, METRIC_BUCKETS_MS), "+Inf"], self.buckets))
+        }
+
+
+METRICS: dict[str, dict[str, CallMetrics]] = {"tool": {}, "resource": {}, "prompt": {}}
+
+
+def instrumented(kind: str):
+    """Record the latency and outcome of every call of a call_tool/read_resource/get_prompt handler"""
+    series = METRICS[kind]
+
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(name, *args):
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = await handler(name, *args)
+                failed = False
+                return result
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                key = str(name)
+                metrics = series.get(key)
+                if metrics is None:
+                    if len(series) >= METRIC_MAX_SERIES:
+                        key = "__other__"
+                    metrics = series.setdefault(key, CallMetrics())
+                metrics.calls += 1
+                metrics.errors += failed
+                metrics.total_ms += elapsed_ms
+                metrics.buckets[bisect_left(METRIC_BUCKETS_MS, elapsed_ms)] += 1
+        return wrapper
+    return decorate
+
+
+def metrics_snapshot() -> dict:
+    """All metrics as JSON-ready data"""
+    return {kind: {name: m.snapshot() for name, m in series.items()} for kind, series in METRICS.items()}
+
+
+def _label(value: str) -> str:
+    return value.replace("\\\\", "\\\\\\\\").replace('"', '\\\\"').replace("\\n", "\\\\n")
+
+
+def metrics_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format, one contiguous group per family"""
+    calls = ["# HELP mcp_calls_total Calls handled, by kind and name", "# TYPE mcp_calls_total counter"]
+    errors = ["# HELP mcp_errors_total Calls that raised, by kind and name", "# TYPE mcp_errors_total counter"]
+    durations = [
+        "# HELP mcp_call_duration_seconds Call latency, by kind and name",
+        "# TYPE mcp_call_duration_seconds histogram"
+    ]
+    bounds = [str(bound / 1000) for bound in METRIC_BUCKETS_MS] + ["+Inf"]
+    for kind, series in METRICS.items():
+        for name, m in series.items():
+            labels = f'kind="{kind}",name="{_label(name)}"'
+            calls.append("mcp_calls_total{%s} %d" % (labels, m.calls))
+            errors.append("mcp_errors_total{%s} %d" % (labels, m.errors))
+            cumulative = 0
+            for bound, count in zip(bounds, m.buckets):
+                cumulative += count
+                durations.append('mcp_call_duration_seconds_bucket{%s,le="%s"} %d' % (labels, bound, cumulative))
+            durations.append("mcp_call_duration_seconds_sum{%s} %r" % (labels, m.total_ms / 1000))
+            durations.append("mcp_call_duration_seconds_count{%s} %d" % (labels, m.calls))
+    return "\\n".join(calls + errors + durations) + "\\n"
+''')
+
+INSTRUMENT_DECORATOR = Template('@instrumented("{{kind}}")\n')
+
+DEADLINE_DECORATOR = Template('@deadline("{{tool_name}}", timeout_ms={{timeout_ms}})\n')
+
+LIMIT_DECORATOR = Template('@limited("{{tool_name}}", concurrency={{concurrency}}, max_queue={{max_queue}})\n')
+
+OFFLOADED_TOOL_FUNCTION = Template('''
+{{decorators}}async def {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}    return await run_in_executor("{{executor}}", {{work_name}}, arguments)
+''')
+
+CACHE_DECORATOR = Template('@cached("{{tool_name}}", ttl={{ttl}}, max_entries={{max_entries}}{{normalize}})\n')
+
+CACHE_STATS_TOOL = "__cache_stats__"
+
+TIMEOUT_STATS_TOOL = "__timeout_stats__"
+
+TIMEOUT_STATS_BODY = '''    stats = {name: tool_deadline.stats() for name, tool_deadline in TOOL_DEADLINES.items()}
+    return [TextContent(type="text", text=json.dumps(stats, indent=2))]'''
+
+METRICS_TOOL = "__metrics__"
+
+METRICS_BODY = '''    return [TextContent(type="text", text=json.dumps(metrics_snapshot(), indent=2))]'''
+
+# Built-in resource of servers with metrics, served through the resource router
+METRICS_RESOURCE_URI = "metrics://server"
+
+METRICS_RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="Server metrics",
+        description="Call counts, errors and latency histograms of this server",
+        mimeType="application/json"
+    ),''')
+
+METRICS_RESOURCE_FUNCTION = Template('''
+@resource_route("{{res_uri}}", "application/json")
+async def resource_metrics(uri: str) -> list[TextContent]:
+    """Call counts, errors and latency histograms of this server"""
+    return [TextContent(type="text", text=json.dumps(metrics_snapshot(), indent=2))]
+''')
+
+CACHE_STATS_BODY = '''    stats = {name: cache.stats() for name, cache in TOOL_CACHES.items()}
+    return [TextContent(type="text", text=json.dumps(stats, indent=2))]'''
+
+BUILTIN_TOOL_FUNCTION = Template('''
+{{decorators}}async def {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{body}}
+''')
+
+
+def cache_settings(tool: dict) -> tuple[float, int]:
+    """
+    Read and check the "cache" field of a tool.
+
+    Raises:
+        ValueError: If ttl or max_entries is not a positive number
+    """
+    tool_name = tool.get("name", "example_tool")
+    cache = tool["cache"]
+    if not isinstance(cache, dict):
+        raise ValueError(f"Tool {tool_name}: cache must be an object with 'ttl' and 'max_entries'")
+
+    ttl = cache.get("ttl")
+    max_entries = cache.get("max_entries", DEFAULT_CACHE_MAX_ENTRIES)
+    if isinstance(ttl, bool) or not isinstance(ttl, (int, float)) or ttl <= 0:
+        raise ValueError(f"Tool {tool_name}: cache ttl must be a positive number of seconds")
+    if isinstance(max_entries, bool) or not isinstance(max_entries, int) or max_entries <= 0:
+        raise ValueError(f"Tool {tool_name}: cache max_entries must be a positive integer")
+    return float(ttl), max_entries
+
+
+def render_cache_decorator(tool_name: str, tool: dict, normalize: str) -> str:
+    """Render the @cached(...) line of a tool, or nothing if the tool is not cached"""
+    if not tool.get("cache"):
+        return ""
+    ttl, max_entries = cache_settings(tool)
+    return CACHE_DECORATOR.render(
+        tool_name=tool_name,
+        ttl=repr(ttl),
+        max_entries=str(max_entries),
+        normalize=f", normalize={normalize}" if normalize else ""
+    )
+
+
+def is_positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def execution_settings(tool: dict) -> tuple[str, Optional[int], Optional[int]]:
+    """
+    Read and check the "executor", "concurrency" and "max_queue" fields of a tool.
+
+    Raises:
+        ValueError: If a field has an unsupported value
+    """
+    tool_name = tool.get("name", "example_tool")
+    executor = tool.get("executor", "inline")
+    concurrency = tool.get("concurrency")
+    max_queue = tool.get("max_queue")
+
+    if executor not in EXECUTORS:
+        raise ValueError(f"Tool {tool_name}: executor must be 'inline', 'thread' or 'process'")
+    if concurrency is not None and not is_positive_int(concurrency):
+        raise ValueError(f"Tool {tool_name}: concurrency must be a positive integer")
+    if max_queue is not None:
+        if concurrency is None:
+            raise ValueError(f"Tool {tool_name}: max_queue requires concurrency")
+        if isinstance(max_queue, bool) or not isinstance(max_queue, int) or max_queue < 0:
+            raise ValueError(f"Tool {tool_name}: max_queue must be a non-negative integer")
+    return executor, concurrency, max_queue
+
+
+def import_settings(tool: dict) -> list[tuple[str, str]]:
+    """
+    Read and check the "imports" field of a tool.
+
+    Each entry is a module ("numpy"), an aliased module ("numpy as np") or a
+    full import statement ("from PIL import Image").
+
+    Returns:
+        One (import statement, imported module) pair per entry
+
+    Raises:
+        ValueError: If an entry is not a single import statement
+    """
+    tool_name = tool.get("name", "example_tool")
+    imports = tool.get("imports", [])
+    if not isinstance(imports, list):
+        raise ValueError(f"Tool {tool_name}: imports must be a list of modules or import statements")
+
+    settings = []
+    for entry in imports:
+        statement = entry.strip() if isinstance(entry, str) else ""
+        if not statement.startswith(("import ", "from ")):
+            statement = f"import {statement}"
+        try:
+            nodes = ast.parse(statement).body
+        except SyntaxError:
+            nodes = []
+        if len(nodes) != 1 or not isinstance(nodes[0], (ast.Import, ast.ImportFrom)) or "\n" in statement:
+            raise ValueError(f"Tool {tool_name}: {entry!r} is not a module or import statement")
+        node = nodes[0]
+        if isinstance(node, ast.ImportFrom) and (node.level or node.module is None):
+            raise ValueError(f"Tool {tool_name}: relative import {entry!r} cannot be deferred")
+        if isinstance(node, ast.Import) and len(node.names) != 1:
+            raise ValueError(f"Tool {tool_name}: list one module per imports entry, not {entry!r}")
+        module = node.module if isinstance(node, ast.ImportFrom) else node.names[0].name
+        settings.append((statement, module))
+    return settings
+
+
+def render_deadline_decorator(tool_name: str, tool: dict) -> str:
+    """
+    Render the @deadline(...) line of a tool, or nothing if it has no timeout_ms.
+
+    Raises:
+        ValueError: If timeout_ms is not a positive integer
+    """
+    timeout_ms = tool.get("timeout_ms")
+    if timeout_ms is None:
+        return ""
+    if not is_positive_int(timeout_ms):
+        raise ValueError(f"Tool {tool.get('name', 'example_tool')}: timeout_ms must be a positive integer")
+    return DEADLINE_DECORATOR.render(tool_name=tool_name, timeout_ms=str(timeout_ms))
+
+
+def render_limit_decorator(tool_name: str, tool: dict) -> str:
+    """Render the @limited(...) line of a tool, or nothing if it has no concurrency limit"""
+    _, concurrency, max_queue = execution_settings(tool)
+    if concurrency is None:
+        return ""
+    return LIMIT_DECORATOR.render(tool_name=tool_name, concurrency=str(concurrency), max_queue=repr(max_queue))
+
+
+# Built-in tools added to servers that use a feature: name -> (feature, description, body)
+BUILTIN_TOOLS = {
+    CACHE_STATS_TOOL: ("cache", "Report hit/miss statistics of every cached tool", CACHE_STATS_BODY),
+    TIMEOUT_STATS_TOOL: ("deadline", "Report calls, timeouts and the slowest call of every tool with a deadline", TIMEOUT_STATS_BODY),
+    METRICS_TOOL: ("metrics", "Report call counts, errors and latency histograms of every tool, resource and prompt", METRICS_BODY)
+}
+
+# Runtime blocks in the order they are emitted
+FEATURE_RUNTIMES = {
+    "validation": VALIDATION_RUNTIME,
+    "cache": CACHE_RUNTIME,
+    "deadline": DEADLINE_RUNTIME,
+    "limits": LIMITS_RUNTIME,
+    "executor": EXECUTOR_RUNTIME
+}
+
+# Server-level runtime blocks, emitted into the header
+SERVER_RUNTIMES = {
+    "pagination": PAGINATION_RUNTIME,
+    "metrics": METRICS_RUNTIME
+}
+
+
+def feature_imports(features, base: tuple = ()) -> str:
+    """Render the sorted standard library import lines of a set of features plus base lines"""
+    lines = {*base, *[line for feature in features for line in FEATURE_IMPORTS.get(feature, ())]}
+    ordered = sorted(lines, key=lambda line: (line.startswith("from "), line))
+    return "\n".join(ordered)
+
+
+def render_feature_runtimes(features) -> str:
+    """Render the runtime blocks of a set of features"""
+    return "".join([runtime.render() for feature, runtime in FEATURE_RUNTIMES.items() if feature in features])
+
+
+def render_server_runtimes(features) -> str:
+    """Render the server-level runtime blocks of a set of features"""
+    return "".join([runtime.render() for feature, runtime in SERVER_RUNTIMES.items() if feature in features])
+
+
+def render_instrumentation(features, kind: str) -> str:
+    """Render the @instrumented(...) line of a request handler, or nothing without metrics"""
+    return INSTRUMENT_DECORATOR.render(kind=kind) if "metrics" in features else ""
+
+
+def render_builtin_resources(features) -> dict:
+    """Render the catalog entries and routed functions of the built-in resources"""
+    if "metrics" not in features:
+        return {"builtin_resource_definitions": "", "builtin_resource_functions": ""}
+    return {
+        "builtin_resource_definitions": METRICS_RESOURCE_DEFINITION.render(res_uri=METRICS_RESOURCE_URI),
+        "builtin_resource_functions": METRICS_RESOURCE_FUNCTION.render(res_uri=METRICS_RESOURCE_URI)
+    }
+
+
+def builtin_tools(features) -> list[tuple[str, str, str]]:
+    """Return the (name, description, body) of every built-in tool the features need"""
+    return [
+        (name, description, body)
+        for name, (feature, description, body) in BUILTIN_TOOLS.items()
+        if feature in features
+    ]
+
+
+def render_builtin_function(tool_name: str, func_name: str, description: str, body: str, decorators: str) -> str:
+    """Render the implementation function of a built-in tool"""
+    return BUILTIN_TOOL_FUNCTION.render(
+        decorators=decorators,
+        func_name=func_name,
+        tool_doc=encode_string(description),
+        body=body
+    )
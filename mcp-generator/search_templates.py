@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Search Templates - Tools of kind "search", which answer full-text queries over
+a directory of text files or a JSONL corpus from a SQLite FTS5 index. The index
+is refreshed incrementally (only new or changed files are read, and growing
+JSONL files only from where indexing stopped) before the first query, or ahead
+of time with the generated build_search_index.py. Queries run on the SQLite
+read pool and return bm25-ranked snippets.
+"""
+
+from template_engine import Template, encode_string, python_identifier
+from runtime_templates import is_positive_int
+
+DEFAULT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst", ".jsonl")
+
+DEFAULT_LIMIT = 10
+
+MAX_LIMIT = 100
+
+# Input schema of a search tool that declares no parameters of its own
+SEARCH_PARAMETERS = [
+    {"name": "query", "type": "string", "description": "Words to search for", "required": True},
+    {
+        "name": "limit", "type": "integer", "description": "Maximum number of results", "required": False,
+        "minimum": 1, "maximum": MAX_LIMIT
+    }
+]
+
+SEARCH_RUNTIME = Template('''
+# Full-text search tools, backed by incrementally refreshed SQLite FTS5 indexes
+SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, size INTEGER, mtime_ns INTEGER,
+    indexed_bytes INTEGER, tail BLOB
+);
+CREATE TABLE IF NOT EXISTS documents (id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL, ref TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS documents_file ON documents (file_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5 (title, body, tokenize = 'porter unicode61');
+"""
+
+# bm25 with title matches weighing 4x. It is set only when the index is created: rewriting
+# the option invalidates the prepared statements of every open reader.
+SEARCH_RANK = "bm25(4.0, 1.0)"
+
+# Rank inside FTS5 first (ORDER BY rank is its fast path), then join only the winning rows
+SEARCH_SQL = """
+SELECT documents.ref, hits.title, hits.snippet, hits.rank FROM (
+    SELECT rowid, title, snippet(docs, 1, '[', ']', ' ... ', 16) AS snippet, rank
+    FROM docs WHERE docs MATCH :match ORDER BY rank LIMIT :limit
+) AS hits JOIN documents ON documents.id = hits.rowid
+ORDER BY hits.rank
+"""
+
+SEARCH_BATCH_DOCUMENTS = 5000
+
+# Bytes before the indexed end of a JSONL file that must be unchanged for it to count as appended to
+SEARCH_TAIL_BYTES = 4096
+
+
+def search_match(query: str) -> str:
+    """FTS5 expression matching documents that contain every word of query; other syntax is ignored"""
+    terms = re.findall(r"\\w+", query)
+    if not terms:
+        raise ValueError("Search query has no words")
+    return " ".join(['"%s"' % term for term in terms])
+
+
+class SearchIndex:
+    """The FTS5 index of one corpus, queried through the SQLite read pool of its index file"""
+
+    def __init__(self, index: str, source: str, extensions: tuple, text_field: str, title_field: str,
+                 id_field: str, default_limit: int, pool_size: int):
+        self.pool = sqlite_pool(index, pool_size)
+        self.source = os.path.join(os.path.dirname(os.path.abspath(__file__)), source)
+        self.extensions = extensions
+        self.text_field = text_field
+        self.title_field = title_field
+        self.id_field = id_field
+        self.default_limit = default_limit
+        self.refreshing = None
+
+    def source_files(self) -> list[str]:
+        """Every file of the corpus: the source itself, or the matching files under it"""
+        if not os.path.isdir(self.source):
+            if not os.path.exists(self.source):
+                raise ValueError(f"Search corpus not found: {self.source}")
+            return [self.source]
+        return sorted([
+            os.path.join(root, name)
+            for root, _, names in os.walk(self.source)
+            for name in names if name.endswith(self.extensions)
+        ])
+
+    def relative(self, path: str) -> str:
+        """Name of a corpus file in the index, so the index survives moving the server"""
+        return os.path.relpath(path, self.source) if path != self.source else os.path.basename(path)
+
+    def tail(self, file, end: int) -> bytes:
+        """Digest of the bytes just before end, to tell an appended file from a rewritten one"""
+        start = max(0, end - SEARCH_TAIL_BYTES)
+        file.seek(start)
+        return hashlib.blake2b(file.read(end - start), digest_size=16).digest()
+
+    def documents(self, path: str, file, start: int):
+        """
+        Yield (ref, title, body) from start, then return the offset after the last complete
+        document. A final JSONL line without a newline is complete once it parses.
+        """
+        ref = self.relative(path)
+        if not path.endswith(".jsonl"):
+            text = file.read().decode("utf-8", errors="replace")
+            first_line = next((line for line in text.splitlines() if line.strip()), "")
+            yield ref, first_line.strip().lstrip("#").strip(), text
+            return file.tell()
+
+        file.seek(start)
+        offset = start
+        for line in file:
+            try:
+                record = json.loads(line) if line.strip() else None
+            except ValueError:
+                if not line.endswith(b"\\n"):
+                    break  # A final line still being written is indexed on the next refresh
+                record = None  # Malformed lines are skipped, not fatal
+            if isinstance(record, dict):
+                body = record.get(self.text_field)
+                if isinstance(body, str):
+                    title = record.get(self.title_field)
+                    doc_id = record.get(self.id_field)
+                    yield (f"{ref}@{offset}" if doc_id is None else str(doc_id)), str(title or ""), body
+            offset += len(line)
+        return offset
+
+    def refresh(self) -> dict:
+        """Bring the index up to date with the corpus, reading only new or changed files"""
+        stats = {"added": 0, "updated": 0, "appended": 0, "removed": 0, "unchanged": 0, "documents": 0}
+        writer = sqlite3.connect(self.pool.path)
+        try:
+            writer.execute("PRAGMA journal_mode = WAL")
+            writer.executescript(SEARCH_SCHEMA)
+            if writer.execute("SELECT 1 FROM docs_config WHERE k = 'rank'").fetchone() is None:
+                writer.execute("INSERT INTO docs (docs, rank) VALUES ('rank', ?)", (SEARCH_RANK,))
+            known = {row[1]: row for row in writer.execute(
+                "SELECT id, path, size, mtime_ns, indexed_bytes, tail FROM files"
+            )}
+            next_id = writer.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM documents").fetchone()[0]
+
+            for path in self.source_files():
+                stat = os.stat(path)
+                entry = known.pop(self.relative(path), None)
+                if entry is not None and entry[2] == stat.st_size and entry[3] == stat.st_mtime_ns:
+                    stats["unchanged"] += 1
+                    continue
+                with open(path, "rb") as file:
+                    start = 0
+                    if entry is not None:
+                        file_id = entry[0]
+                        appended = (
+                            path.endswith(".jsonl") and stat.st_size > entry[4] and self.tail(file, entry[4]) == entry[5]
+                        )
+                        if appended:
+                            start = entry[4]
+                            stats["appended"] += 1
+                        else:
+                            self.drop(writer, file_id)
+                            stats["updated"] += 1
+                    else:
+                        file_id = writer.execute("INSERT INTO files (path) VALUES (?)", (self.relative(path),)).lastrowid
+                        stats["added"] += 1
+                    next_id, end = self.insert(writer, file_id, path, file, start, next_id, stats)
+                    tail = self.tail(file, end)
+                writer.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ?, indexed_bytes = ?, tail = ? WHERE id = ?",
+                    (stat.st_size, stat.st_mtime_ns, end, tail, file_id)
+                )
+                writer.commit()
+
+            for entry in known.values():
+                self.drop(writer, entry[0])
+                writer.execute("DELETE FROM files WHERE id = ?", (entry[0],))
+                stats["removed"] += 1
+            writer.commit()
+        finally:
+            writer.close()
+        return stats
+
+    def insert(self, writer, file_id: int, path: str, file, start: int, next_id: int, stats: dict) -> tuple[int, int]:
+        """Index the documents of one file in batches; returns (next document id, indexed end offset)"""
+        documents = self.documents(path, file, start)
+        batch = []
+        while True:
+            try:
+                ref, title, body = next(documents)
+            except StopIteration as done:
+                end = done.value
+                break
+            batch.append((next_id, file_id, ref, title, body))
+            next_id += 1
+            if len(batch) >= SEARCH_BATCH_DOCUMENTS:
+                self.write(writer, batch, stats)
+        self.write(writer, batch, stats)
+        return next_id, end
+
+    def write(self, writer, batch: list, stats: dict) -> None:
+        """Insert a batch of documents into the document table and the FTS index"""
+        writer.executemany("INSERT INTO documents (id, file_id, ref) VALUES (?, ?, ?)", [row[:3] for row in batch])
+        writer.executemany("INSERT INTO docs (rowid, title, body) VALUES (?, ?, ?)", [(row[0], row[3], row[4]) for row in batch])
+        stats["documents"] += len(batch)
+        batch.clear()
+
+    def drop(self, writer, file_id: int) -> None:
+        """Remove every document of one file from the index"""
+        writer.execute("DELETE FROM docs WHERE rowid IN (SELECT id FROM documents WHERE file_id = ?)", (file_id,))
+        writer.execute("DELETE FROM documents WHERE file_id = ?", (file_id,))
+
+    async def ready(self) -> None:
+        """Refresh the index once, before the first query; concurrent first queries share the refresh"""
+        if self.refreshing is None:
+            self.refreshing = asyncio.ensure_future(self.pool.call(self.refresh))
+        try:
+            await asyncio.shield(self.refreshing)
+        except Exception:
+            self.refreshing = None
+            raise
+
+    def run(self, match: str, limit: int) -> list[dict]:
+        """Run the ranked query on the calling worker's read connection"""
+        rows = self.pool.connection().execute(SEARCH_SQL, {"match": match, "limit": limit}).fetchall()
+        return [
+            {"ref": ref, "title": title, "snippet": snippet, "score": round(-rank, 4)}
+            for ref, title, snippet, rank in rows
+        ]
+
+    async def search(self, arguments: dict) -> list[TextContent]:
+        """Return the best matches of arguments["query"] as ranked snippets"""
+        query = str(arguments.get("query") or "")
+        limit = max(1, min(int(arguments.get("limit") or self.default_limit), {{max_limit}}))
+        match = search_match(query)
+        await self.ready()
+        results = await self.pool.call(self.run, match, limit)
+        return [TextContent(type="text", text=json.dumps({"query": query, "results": results}))]
+
+
+SEARCH_INDEXES: dict[str, SearchIndex] = {}
+''')
+
+SEARCH_INDEX = Template('''
+{{request_name}} = SEARCH_INDEXES[{{tool_literal}}] = SearchIndex(
+    {{index}},
+    {{source}},
+    extensions={{extensions}},
+    text_field={{text_field}},
+    title_field={{title_field}},
+    id_field={{id_field}},
+    default_limit={{limit}},
+    pool_size={{pool_size}}
+)
+''')
+
+SEARCH_TOOL_FUNCTION = Template('''{{request}}
+{{validator}}{{decorators}}{{function_def}} {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}{{lazy_imports}}    return await {{request_name}}.search(arguments or {})
+''')
+
+BUILD_INDEX_SCRIPT = Template('''#!/usr/bin/env python3
+"""
+Build or refresh the search indexes of {{name}} ahead of the first query.
+Only new or changed files are read, so running it again is cheap.
+"""
+
+import asyncio
+import json
+import time
+
+from server import SEARCH_INDEXES
+
+
+async def main():
+    for name, index in SEARCH_INDEXES.items():
+        start = time.perf_counter()
+        stats = await index.pool.call(index.refresh)
+        print(f"{name}: {json.dumps(stats)} in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+''')
+
+BUILD_INDEX_README = (
+    "\n\n## Search Indexes\n\nSearch tools refresh their index before the first query. "
+    "Build it ahead of time (for example during deployment) with:\n\n```bash\npython build_search_index.py\n```"
+)
+
+
+def search_settings(tool: dict) -> dict:
+    """
+    Read and check the fields of a "search" tool.
+
+    Returns:
+        The SearchIndex fields: index, source, extensions, text_field, title_field, id_field, limit, pool_size
+
+    Raises:
+        ValueError: If a field is missing or has an unsupported value
+    """
+    tool_name = str(tool.get("name", "example_tool"))
+    source = tool.get("source")
+    index = tool.get("index", python_identifier("search", tool_name) + ".db")
+    extensions = tool.get("extensions", list(DEFAULT_EXTENSIONS))
+    limit = tool.get("limit", DEFAULT_LIMIT)
+    pool_size = tool.get("pool_size", 4)
+
+    if not isinstance(source, str) or not source:
+        raise ValueError(f"Tool {tool_name}: search tools need a 'source' directory or JSONL file")
+    if not isinstance(index, str) or not index:
+        raise ValueError(f"Tool {tool_name}: index must be a file path")
+    if not isinstance(extensions, list) or not all(isinstance(suffix, str) and suffix for suffix in extensions):
+        raise ValueError(f"Tool {tool_name}: extensions must be a list of file suffixes such as '.md'")
+    if not is_positive_int(limit) or limit > MAX_LIMIT:
+        raise ValueError(f"Tool {tool_name}: limit must be an integer from 1 to {MAX_LIMIT}")
+    if not is_positive_int(pool_size):
+        raise ValueError(f"Tool {tool_name}: pool_size must be a positive integer")
+    if tool.get("executor", "inline") != "inline":
+        raise ValueError(f"Tool {tool_name}: search tools run on their own connection pool and cannot use an executor")
+    fields = {name: tool.get(name, default) for name, default in (("text_field", "text"), ("title_field", "title"), ("id_field", "id"))}
+    for name, value in fields.items():
+        if not isinstance(value, str) or not value:
+            raise ValueError(f"Tool {tool_name}: {name} must be a JSONL field name")
+
+    return {
+        "index": index, "source": source, "extensions": tuple(extensions),
+        "limit": limit, "pool_size": pool_size, **fields
+    }
+
+
+def render_search_request(tool: dict) -> tuple[str, str]:
+    """Return the (constant name, SearchIndex(...) definition) of a search tool"""
+    settings = search_settings(tool)
+    tool_name = str(tool.get("name", "example_tool"))
+    request_name = python_identifier("index", tool_name, upper=True)
+    return request_name, SEARCH_INDEX.render(
+        request_name=request_name,
+        tool_literal=encode_string(tool_name),
+        index=encode_string(settings["index"]),
+        source=encode_string(settings["source"]),
+        extensions="(" + "".join([f"{encode_string(suffix)}, " for suffix in settings["extensions"]]).rstrip(" ") + ")",
+        text_field=encode_string(settings["text_field"]),
+        title_field=encode_string(settings["title_field"]),
+        id_field=encode_string(settings["id_field"]),
+        limit=str(settings["limit"]),
+        pool_size=str(settings["pool_size"])
+    )
+
+
+def render_search_runtime(features) -> str:
+    """Render the search index runtime, or nothing if the server has no search tools"""
+    return SEARCH_RUNTIME.render(max_limit=str(MAX_LIMIT)) if "search" in features else ""
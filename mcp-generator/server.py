@@ -20,12 +20,22 @@ from mcp.types import (
     LoggingLevel
 )
 
+import server_templates
+from generation_cache import GenerationCache, cache_key
+from incremental import FragmentCache, diff_configs
+from batch import generate_batch, batch_archive_files, render_server_sharded
+from archive import build_zip
+from validator_templates import TYPE_CHECKS
+
 # Initialize the MCP server
 app = Server("mcp-generator")
 
 # Template directory
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Rendered files cache shared by the MCP tools, MCPGenerator and the web UI
+generation_cache = GenerationCache.from_env()
+
 
 class MCPTemplate:
     """Represents a MCP server template"""
@@ -33,332 +43,52 @@ class MCPTemplate:
     @staticmethod
     def basic_tool_server(name: str, description: str, tools: list[dict]) -> dict:
         """Generate a basic tool-based MCP server"""
-
-        tool_handlers = []
-        tool_definitions = []
-        newline = "\n"
-
-        for tool in tools:
-            tool_name = tool.get("name", "example_tool")
-            tool_desc = tool.get("description", "Example tool")
-            tool_params = tool.get("parameters", [])
-
-            # Generate tool implementation
-            param_extraction = newline.join([f"        {p['name']} = arguments.get('{p['name']}')" for p in tool_params])
-            tool_handlers.append(f'''
-    if name == "{tool_name}":
-        # Extract parameters
-{param_extraction}
-
-        # TODO: Implement {tool_name} logic here
-        result = f"Executed {tool_name}"
-
-        return [TextContent(type="text", text=result)]
-''')
-
-            # Generate tool definition
-            input_schema = {
-                "type": "object",
-                "properties": {
-                    p["name"]: {
-                        "type": p.get("type", "string"),
-                        "description": p.get("description", "")
-                    } for p in tool_params
-                },
-                "required": [p["name"] for p in tool_params if p.get("required", False)]
-            }
-
-            tool_definitions.append(f'''
-        Tool(
-            name="{tool_name}",
-            description="{tool_desc}",
-            inputSchema={json.dumps(input_schema, indent=16)}
-        ),''')
-
-        code = f'''#!/usr/bin/env python3
-"""
-{name} - {description}
-Auto-generated by MCP Generator
-"""
-
-import asyncio
-from typing import Any
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
-
-# Initialize the MCP server
-app = Server("{name}")
-
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools"""
-    return [{"".join(tool_definitions)}
-    ]
-
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool execution requests"""
-{"".join(tool_handlers)}
-
-    raise ValueError(f"Unknown tool: {{name}}")
-
-async def main():
-    """Run the MCP server"""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
-
-if __name__ == "__main__":
-    asyncio.run(main())
-'''
-        return {
-            "server.py": code,
-            "README.md": f"# {name}\n\n{description}\n\n## Installation\n\n```bash\npip install -r requirements.txt\n```\n\n## Usage\n\n```bash\npython server.py\n```",
-            "requirements.txt": "mcp>=0.9.0\n"
-        }
+        return server_templates.basic_tool_server(name, description, tools)
 
     @staticmethod
     def resource_server(name: str, description: str, resources: list[dict]) -> dict:
         """Generate a resource-based MCP server"""
-
-        resource_handlers = []
-        resource_definitions = []
-
-        for resource in resources:
-            res_uri = resource.get("uri", "resource://example")
-            res_name = resource.get("name", "Example Resource")
-            res_desc = resource.get("description", "Example resource")
-            res_type = resource.get("type", "text")
-
-            resource_handlers.append(f'''
-    if uri.startswith("{res_uri}"):
-        # TODO: Implement {res_name} data fetching
-        content = "Sample data for {res_name}"
-        return [TextContent(type="text", text=content)]
-''')
-
-            resource_definitions.append(f'''
-        EmbeddedResource(
-            uri="{res_uri}",
-            name="{res_name}",
-            description="{res_desc}",
-            mimeType="text/plain" if "{res_type}" == "text" else "application/json"
-        ),''')
-
-        code = f'''#!/usr/bin/env python3
-"""
-{name} - {description}
-Auto-generated by MCP Generator
-"""
-
-import asyncio
-from typing import Any
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import Resource, TextContent, EmbeddedResource
-
-# Initialize the MCP server
-app = Server("{name}")
-
-@app.list_resources()
-async def list_resources() -> list[Resource]:
-    """List available resources"""
-    return [{"".join(resource_definitions)}
-    ]
-
-@app.read_resource()
-async def read_resource(uri: str) -> str:
-    """Read a specific resource"""
-    {"".join(resource_handlers)}
-
-    raise ValueError(f"Unknown resource: {{uri}}")
-
-async def main():
-    """Run the MCP server"""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
-
-if __name__ == "__main__":
-    asyncio.run(main())
-'''
-        return {
-            "server.py": code,
-            "README.md": f"# {name}\n\n{description}\n\n## Installation\n\n```bash\npip install -r requirements.txt\n```\n\n## Usage\n\n```bash\npython server.py\n```",
-            "requirements.txt": "mcp>=0.9.0\n"
-        }
+        return server_templates.resource_server(name, description, resources)
 
     @staticmethod
     def full_server(name: str, description: str, config: dict) -> dict:
         """Generate a full-featured MCP server with tools, resources, and prompts"""
+        return server_templates.full_server(name, description, config)
 
-        tools = config.get("tools", [])
-        resources = config.get("resources", [])
-        prompts = config.get("prompts", [])
-        newline = "\n"
-
-        # Generate tools section
-        tool_list = []
-        tool_handlers = []
-
-        for tool in tools:
-            tool_name = tool.get("name", "example_tool")
-            tool_desc = tool.get("description", "Example tool")
-            tool_params = tool.get("parameters", [])
-
-            input_schema = {
-                "type": "object",
-                "properties": {
-                    p["name"]: {
-                        "type": p.get("type", "string"),
-                        "description": p.get("description", "")
-                    } for p in tool_params
-                },
-                "required": [p["name"] for p in tool_params if p.get("required", False)]
-            }
-
-            tool_list.append(f'''
-        Tool(
-            name="{tool_name}",
-            description="{tool_desc}",
-            inputSchema={json.dumps(input_schema, indent=16)}
-        ),''')
-
-            tool_handlers.append(f'''
-    if name == "{tool_name}":
-        # TODO: Implement {tool_name}
-        return [TextContent(type="text", text="Tool {tool_name} executed")]
-''')
-
-        # Generate resources section
-        resource_list = []
-        resource_handlers = []
-
-        for resource in resources:
-            res_uri = resource.get("uri", "resource://example")
-            res_name = resource.get("name", "Example Resource")
-            res_desc = resource.get("description", "Example resource")
-
-            resource_list.append(f'''
-        EmbeddedResource(
-            uri="{res_uri}",
-            name="{res_name}",
-            description="{res_desc}",
-            mimeType="text/plain"
-        ),''')
-
-            resource_handlers.append(f'''
-    if uri.startswith("{res_uri}"):
-        return [TextContent(type="text", text="Resource {res_name} data")]
-''')
-
-        # Generate prompts section
-        prompt_list = []
-        prompt_handlers = []
-
-        for prompt in prompts:
-            prompt_name = prompt.get("name", "example_prompt")
-            prompt_desc = prompt.get("description", "Example prompt")
-
-            prompt_list.append(f'''
-        {{
-            "name": "{prompt_name}",
-            "description": "{prompt_desc}"
-        }}''')
-
-            prompt_handlers.append(f'''
-    if name == "{prompt_name}":
-        return {{
-            "messages": [
-                {{
-                    "role": "user",
-                    "content": {{
-                        "type": "text",
-                        "text": "Example prompt for {prompt_name}"
-                    }}
-                }}
-            ]
-        }}
-''')
-
-        code = f'''#!/usr/bin/env python3
-"""
-{name} - {description}
-Auto-generated by MCP Generator
-"""
-
-import asyncio
-from typing import Any
-from mcp.server import Server
-from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent, EmbeddedResource
-
-# Initialize the MCP server
-app = Server("{name}")
-
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools"""
-    return [{"".join(tool_list) if tool_list else newline + "        # No tools defined"}
-    ]
-
-@app.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool execution"""
-    {"".join(tool_handlers) if tool_handlers else "pass"}
-
-    raise ValueError(f"Unknown tool: {{name}}")
-
-@app.list_resources()
-async def list_resources() -> list[EmbeddedResource]:
-    """List available resources"""
-    return [{"".join(resource_list) if resource_list else newline + "        # No resources defined"}
-    ]
-
-@app.read_resource()
-async def read_resource(uri: str) -> list[TextContent]:
-    """Read a specific resource"""
-    {"".join(resource_handlers) if resource_handlers else "pass"}
-
-    raise ValueError(f"Unknown resource: {{uri}}")
+    @staticmethod
+    def generate(name: str, description: str, server_type: str, config: Optional[dict] = None,
+                 parallel: bool = False) -> dict:
+        """
+        Generate the files of any server type through the shared generation cache.
 
-@app.list_prompts()
-async def list_prompts() -> list[dict]:
-    """List available prompts"""
-    return [{"".join(prompt_list) if prompt_list else newline + "        # No prompts defined"}
-    ]
+        Args:
+            parallel: Opt in to sharded rendering across worker processes for very
+                large configs; the output is byte-identical to serial rendering
 
-@app.get_prompt()
-async def get_prompt(name: str, arguments: dict) -> dict:
-    """Get a specific prompt"""
-    {"".join(prompt_handlers) if prompt_handlers else "pass"}
+        Raises:
+            ValueError: If server_type is not 'tool', 'resource' or 'full'
+        """
+        config = config or {}
+        key = cache_key(name, description, server_type, config)
 
-    raise ValueError(f"Unknown prompt: {{name}}")
+        files = generation_cache.get(key)
+        if files is None:
+            if parallel:
+                files = render_server_sharded(name, description, server_type, config)
+            else:
+                files = server_templates.render_server(name, description, server_type, config)
+            generation_cache.put(key, files)
+        return files
 
-async def main():
-    """Run the MCP server"""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    @staticmethod
+    def stream(name: str, description: str, server_type: str, config: Optional[dict], sink) -> None:
+        """
+        Stream the generated server.py into a text sink (file, zip entry, socket writer, ...).
 
-if __name__ == "__main__":
-    asyncio.run(main())
-'''
-        return {
-            "server.py": code,
-            "README.md": f"# {name}\n\n{description}\n\n## Installation\n\n```bash\npip install -r requirements.txt\n```\n\n## Usage\n\n```bash\npython server.py\n```",
-            "requirements.txt": "mcp>=0.9.0\n"
-        }
+        Unlike generate(), the code is written fragment by fragment and never held
+        in memory as a whole; use it for very large configs.
+        """
+        server_templates.stream_server(name, description, server_type, config or {}, sink)
 
 
 @app.list_tools()
@@ -388,6 +118,11 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Output directory path where the server will be created"
                     },
+                    "transport": {
+                        "type": "string",
+                        "enum": ["stdio", "http", "both"],
+                        "description": "How the generated server is served: 'stdio' (default), 'http' (Streamable HTTP/SSE with uvicorn workers) or 'both' (stdio by default, HTTP via --transport http)"
+                    },
                     "config": {
                         "type": "object",
                         "description": "Configuration object containing tools, resources, and prompts definitions",
@@ -408,10 +143,63 @@ async def list_tools() -> list[Tool]:
                                                     "name": {"type": "string"},
                                                     "type": {"type": "string"},
                                                     "description": {"type": "string"},
-                                                    "required": {"type": "boolean"}
+                                                    "required": {"type": "boolean"},
+                                                    "enum": {"type": "array"},
+                                                    "minimum": {"type": "number"},
+                                                    "maximum": {"type": "number"}
                                                 }
                                             }
-                                        }
+                                        },
+                                        "cache": {
+                                            "type": "object",
+                                            "description": "Cache results per canonicalized arguments",
+                                            "properties": {
+                                                "ttl": {"type": "number", "description": "Seconds a result stays valid"},
+                                                "max_entries": {"type": "integer", "description": "LRU capacity (default: 1024)"}
+                                            }
+                                        },
+                                        "executor": {
+                                            "type": "string",
+                                            "enum": ["inline", "thread", "process"],
+                                            "description": "Where the tool body runs: on the event loop (default) or on a shared thread/process pool"
+                                        },
+                                        "concurrency": {"type": "integer", "description": "Maximum calls of this tool running at once"},
+                                        "max_queue": {"type": "integer", "description": "Maximum calls waiting for a slot before new ones are rejected"},
+                                        "timeout_ms": {"type": "integer", "description": "Deadline per call in milliseconds"},
+                                        "imports": {
+                                            "type": "array",
+                                            "items": {"type": "string"},
+                                            "description": "Modules the tool imports on its first call instead of at server startup, e.g. 'numpy as np' or 'from PIL import Image'"
+                                        },
+                                        "kind": {
+                                            "type": "string",
+                                            "enum": ["http", "sqlite", "search"],
+                                            "description": "'http' forwards the tool's arguments to a REST endpoint through a shared keep-alive client; 'sqlite' binds them to a query against a local database; 'search' answers full-text queries from an FTS5 index of a directory or JSONL file"
+                                        },
+                                        "url": {"type": "string", "description": "Endpoint of an http tool; {param} placeholders are filled from the arguments"},
+                                        "method": {"type": "string", "description": "HTTP method of an http tool (default: GET)"},
+                                        "arguments": {
+                                            "type": "object",
+                                            "description": "Where an http tool sends each non-path parameter: 'query' or 'json' (default: query for GET/HEAD/OPTIONS/DELETE, json otherwise)"
+                                        },
+                                        "headers": {"type": "object", "description": "Static headers of an http tool"},
+                                        "retries": {"type": "integer", "description": "Retries of an http tool on connection errors and 429/502/503/504 (default: 2)"},
+                                        "request_timeout": {"type": "number", "description": "Seconds an http tool waits for a response (default: 10)"},
+                                        "database": {"type": "string", "description": "Database file of a sqlite tool, relative to server.py"},
+                                        "query": {"type": "string", "description": "SELECT of a sqlite tool with :name parameters bound from the arguments"},
+                                        "pool_size": {"type": "integer", "description": "Read connections to the database (default: 4)"},
+                                        "max_rows": {"type": "integer", "description": "Rows returned at most (default: 10000)"},
+                                        "source": {"type": "string", "description": "Directory or JSONL file a search tool indexes, relative to server.py"},
+                                        "index": {"type": "string", "description": "Index database of a search tool (default: search_<name>.db)"},
+                                        "extensions": {
+                                            "type": "array",
+                                            "items": {"type": "string"},
+                                            "description": "File suffixes a search tool indexes under a source directory (default: .md .markdown .txt .rst .jsonl)"
+                                        },
+                                        "text_field": {"type": "string", "description": "JSONL field a search tool indexes (default: text)"},
+                                        "title_field": {"type": "string", "description": "JSONL field shown as a search result's title (default: title)"},
+                                        "id_field": {"type": "string", "description": "JSONL field returned as a search result's ref (default: id)"},
+                                        "limit": {"type": "integer", "description": "Results a search tool returns by default, at most 100 (default: 10)"}
                                     }
                                 }
                             },
@@ -424,7 +212,26 @@ async def list_tools() -> list[Tool]:
                                         "uri": {"type": "string"},
                                         "name": {"type": "string"},
                                         "description": {"type": "string"},
-                                        "type": {"type": "string"}
+                                        "type": {"type": "string"},
+                                        "path": {"type": "string", "description": "File served by a \"file\" or \"jsonl\" resource, relative to server.py"},
+                                        "chunk_size": {"type": "integer", "description": "Bytes per chunk of a \"file\" resource"},
+                                        "encoding": {"type": "string", "enum": ["text", "base64"]},
+                                        "mime_type": {"type": "string"},
+                                        "database": {"type": "string", "description": "Database file of a \"sqlite\" resource, relative to server.py"},
+                                        "query": {"type": "string", "description": "SELECT of a \"sqlite\" resource with :name parameters bound from {name} URI placeholders and ?name= query parameters"},
+                                        "pool_size": {"type": "integer", "description": "Read connections to the database (default: 4)"},
+                                        "max_rows": {"type": "integer", "description": "Rows returned at most (default: 10000)"},
+                                        "key": {"type": "string", "description": "Field whose value a \"jsonl\" resource's URI placeholder looks up (default: id)"},
+                                        "index": {"type": "string", "description": "Sidecar offset index of a \"jsonl\" resource (default: <path>.idx)"},
+                                        "cache": {
+                                            "type": "object",
+                                            "description": "Cache contents for ttl seconds, then serve them stale while reloading",
+                                            "properties": {
+                                                "ttl": {"type": "number"},
+                                                "stale_while_revalidate": {"type": "number"},
+                                                "max_entries": {"type": "integer"}
+                                            }
+                                        }
                                     }
                                 }
                             },
@@ -438,6 +245,37 @@ async def list_tools() -> list[Tool]:
                                         "description": {"type": "string"}
                                     }
                                 }
+                            },
+                            "dispatch": {
+                                "type": "string",
+                                "enum": ["chain", "dict"],
+                                "description": "How call_tool finds a tool: 'chain' (if/elif, default) or 'dict' (constant-time dispatch table)"
+                            },
+                            "validate_arguments": {
+                                "type": "boolean",
+                                "description": "Emit a compiled validator per tool that checks required fields, types and enums (default: true)"
+                            },
+                            "transport": {
+                                "type": "string",
+                                "enum": ["stdio", "http", "both"],
+                                "description": "Same as the top-level transport argument, which takes precedence"
+                            },
+                            "metrics": {
+                                "type": "boolean",
+                                "description": "Record call counts, errors and latency histograms per tool, resource and prompt, exposed as the __metrics__ tool, the metrics://server resource and /metrics over HTTP (default: false)"
+                            },
+                            "page_size": {
+                                "type": "integer",
+                                "description": "Serve tools/list, resources/list and prompts/list in pages of this size with MCP cursors (default: everything in one response)"
+                            },
+                            "http_pool": {
+                                "type": "object",
+                                "description": "Connection pool of the client shared by http tools",
+                                "properties": {
+                                    "max_connections": {"type": "integer", "description": "Default: 100"},
+                                    "max_keepalive_connections": {"type": "integer", "description": "Default: 100"},
+                                    "keepalive_expiry": {"type": "number", "description": "Seconds an idle connection is kept (default: 30)"}
+                                }
                             }
                         }
                     }
@@ -445,6 +283,41 @@ async def list_tools() -> list[Tool]:
                 "required": ["name", "description", "server_type", "output_dir"]
             }
         ),
+        Tool(
+            name="generate_mcp_servers_batch",
+            description="Generate many MCP servers at once. Servers are rendered in parallel and packed into one combined zip archive, with a status line per server.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "servers": {
+                        "type": "array",
+                        "description": "Servers to generate, each with the same fields as generate_mcp_server (without output_dir)",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "description": {"type": "string"},
+                                "server_type": {
+                                    "type": "string",
+                                    "enum": ["tool", "resource", "full"]
+                                },
+                                "config": {"type": "object"}
+                            },
+                            "required": ["name", "description", "server_type"]
+                        }
+                    },
+                    "output_dir": {
+                        "type": "string",
+                        "description": "Directory where the combined archive will be written"
+                    },
+                    "archive_name": {
+                        "type": "string",
+                        "description": "File name of the combined archive (default: mcp-servers.zip)"
+                    }
+                },
+                "required": ["servers", "output_dir"]
+            }
+        ),
         Tool(
             name="list_templates",
             description="List all available MCP server templates with their descriptions and features",
@@ -495,27 +368,23 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         server_type = arguments.get("server_type")
         output_dir = arguments.get("output_dir")
         config = arguments.get("config", {})
+        if arguments.get("transport") is not None:
+            config = {**config, "transport": arguments["transport"]}
 
         try:
-            # Create output directory
-            output_path = Path(output_dir) / server_name
-            output_path.mkdir(parents=True, exist_ok=True)
-
-            # Generate files based on server type
-            if server_type == "tool":
-                tools = config.get("tools", [])
-                files = MCPTemplate.basic_tool_server(server_name, description, tools)
-            elif server_type == "resource":
-                resources = config.get("resources", [])
-                files = MCPTemplate.resource_server(server_name, description, resources)
-            elif server_type == "full":
-                files = MCPTemplate.full_server(server_name, description, config)
-            else:
+            if server_type not in server_templates.SERVER_TYPES:
                 return [TextContent(
                     type="text",
                     text=f"Error: Unknown server type '{server_type}'. Use 'tool', 'resource', or 'full'."
                 )]
 
+            # Create output directory
+            output_path = Path(output_dir) / server_name
+            output_path.mkdir(parents=True, exist_ok=True)
+
+            # Generate files (served from the cache for repeated configs)
+            files = MCPTemplate.generate(server_name, description, server_type, config)
+
             # Write files
             for filename, content in files.items():
                 file_path = output_path / filename
@@ -550,6 +419,37 @@ Add this to your MCP configuration:
         except Exception as e:
             return [TextContent(type="text", text=f"Error generating server: {str(e)}")]
 
+    elif name == "generate_mcp_servers_batch":
+        servers = arguments.get("servers", [])
+        output_dir = arguments.get("output_dir")
+        archive_name = arguments.get("archive_name", "mcp-servers.zip")
+
+        try:
+            results = await generate_batch(servers, cache=generation_cache)
+            archive_files = batch_archive_files(results)
+
+            archive_path = Path(output_dir) / archive_name
+            if archive_files:
+                archive_path.parent.mkdir(parents=True, exist_ok=True)
+                archive_path.write_bytes(build_zip(archive_files))
+
+            newline = "\n"
+            status_lines = newline.join([
+                f"  {'✅' if result['success'] else '❌'} {result['name']}: {result['message']}"
+                for result in results
+            ])
+            succeeded = sum(1 for result in results if result["success"])
+            result = f"""📦 Generated {succeeded}/{len(results)} MCP servers
+
+{status_lines}
+"""
+            if archive_files:
+                result += f"\n📁 Archive: {archive_path}\n"
+            return [TextContent(type="text", text=result)]
+
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error generating servers: {str(e)}")]
+
     elif name == "list_templates":
         templates = """📋 Available MCP Server Templates:
 
@@ -590,6 +490,9 @@ Add this to your MCP configuration:
                     for j, param in enumerate(tool["parameters"]):
                         if "name" not in param:
                             errors.append(f"Tool {i}, Parameter {j}: Missing 'name' field")
+                        param_type = param.get("type", "string")
+                        if not (isinstance(param_type, str) and param_type in TYPE_CHECKS):
+                            warnings.append(f"Tool {i}, Parameter {j}: Type {param.get('type')!r} is passed through without validation")
 
         # Validate resources
         if "resources" in config:
@@ -758,6 +661,7 @@ class MCPGenerator:
 
     def __init__(self):
         self.template = MCPTemplate()
+        self.fragments = FragmentCache()
 
     def generate_from_config(self, config: dict) -> str:
         """
@@ -779,31 +683,66 @@ class MCPGenerator:
         description = config.get('description', 'Generated MCP server')
         server_type = config.get('type', 'tool')
 
-        # Generate based on server type
-        if server_type == 'tool':
-            tools = config.get('tools', [])
-            files = self.template.basic_tool_server(name, description, tools)
-            return files['server.py']
-
-        elif server_type == 'resource':
-            resources = config.get('resources', [])
-            files = self.template.resource_server(name, description, resources)
-            return files['server.py']
-
-        elif server_type == 'full':
-            full_config = {
-                'tools': config.get('tools', []),
-                'resources': config.get('resources', []),
-                'prompts': config.get('prompts', [])
-            }
-            files = self.template.full_server(name, description, full_config)
-            return files['server.py']
+        # The same sections and options every other entry point renders (and keys the cache) from
+        server_config = server_templates.normalize_config(server_type, config)
 
-        else:
+        # Cache misses render through the fragment cache, so a later regenerate() reuses every item
+        key = cache_key(name, description, server_type, server_config)
+        files = generation_cache.get(key)
+        if files is None:
+            files = self._assemble(name, description, server_type, server_config)
+            generation_cache.put(key, files)
+        return files['server.py']
+
+    def _assemble(self, name: str, description: str, server_type: str, config: dict) -> dict:
+        """Render the files of a server from fragments of the fragment cache, scoped to the server"""
+        if server_type not in server_templates.SERVER_TYPES:
+            raise ValueError(f"Unknown server type: {server_type}")
+        options = server_templates.resolve_options(server_type, config)
+        sections = self.fragments.render_sections(server_type, config, options, (name, description))
+        features = server_templates.config_features(server_type, config, options)
+        return server_templates.assemble_server(name, description, server_type, sections, options, features)
+
+    def regenerate(self, previous_config: dict, new_config: dict) -> str:
+        """
+        Regenerate an MCP server after an edit, re-rendering only what changed.
+
+        Every item is compared with the copy its cached fragments were rendered
+        from; changed and added items are rendered, all others are reused.
+        Fragments are cached per server (name and description), so servers
+        that share a tool name never swap implementations. Unchanged items with
+        no cached fragments (e.g. when previous_config was served from the
+        generation cache) are rendered once and cached. Fragments of items the
+        diff finds removed are dropped.
+
+        Args:
+            previous_config: The configuration this generator last generated the
+                server from, through generate_from_config() or regenerate()
+            new_config: The edited configuration (same shape as generate_from_config)
+
+        Returns:
+            Generated server.py code as a string
+        """
+        name = new_config.get('name', 'my-server')
+        description = new_config.get('description', 'Generated MCP server')
+        server_type = new_config.get('type', 'tool')
+
+        if server_type not in server_templates.SERVER_TYPES:
             raise ValueError(f"Unknown server type: {server_type}")
 
+        if previous_config.get('type', 'tool') == server_type:
+            scope = (previous_config.get('name', 'my-server'), previous_config.get('description', 'Generated MCP server'))
+            # Drop fragments of items that no longer exist
+            for section, changes in diff_configs(previous_config, new_config, server_type).items():
+                for identity in changes['removed']:
+                    self.fragments.discard(server_type, section, identity, scope)
+
+        files = self._assemble(name, description, server_type, new_config)
+        return files['server.py']
+
     def generate_server(self, name: str, description: str, server_type: str,
-                       output_dir: str = "./output", config: Optional[dict] = None) -> dict:
+                       output_dir: str = "./output", config: Optional[dict] = None,
+                       parallel: bool = False, transport: Optional[str] = None) -> dict:
         """
         Generate a complete MCP server with all files.
 
@@ -813,32 +752,27 @@ class MCPGenerator:
             server_type: Type of server ('tool', 'resource', 'full')
             output_dir: Output directory path
             config: Configuration dictionary with tools/resources/prompts
+            parallel: Render huge configs in shards across worker processes
+            transport: 'stdio', 'http' or 'both'; overrides the config's transport option
 
         Returns:
             Dictionary with 'success', 'message', and 'files' keys
         """
+        if transport is not None:
+            config = {**(config or {}), "transport": transport}
+
         try:
             # Create output directory
             output_path = Path(output_dir) / name
             output_path.mkdir(parents=True, exist_ok=True)
 
-            # Generate files based on server type
-            if server_type == 'tool':
-                tools = config.get('tools', []) if config else []
-                files = self.template.basic_tool_server(name, description, tools)
-
-            elif server_type == 'resource':
-                resources = config.get('resources', []) if config else []
-                files = self.template.resource_server(name, description, resources)
-
-            elif server_type == 'full':
-                full_config = config if config else {'tools': [], 'resources': [], 'prompts': []}
-                files = self.template.full_server(name, description, full_config)
-
-            else:
+            # Generate files (served from the cache for repeated configs)
+            try:
+                files = self.template.generate(name, description, server_type, config, parallel=parallel)
+            except ValueError as e:
                 return {
                     'success': False,
-                    'message': f"Unknown server type: {server_type}",
+                    'message': str(e),
                     'files': []
                 }
 
@@ -0,0 +1,1308 @@
+#!/usr/bin/env python3
+"""
+Server Templates - Compiled code templates for generated MCP servers.
+Every template below is parsed and compiled once at import time; the render
+functions only fill in fields and join the cached fragments.
+
+A generated server.py is a sequence of block templates (header, tools,
+resources, prompts, main) rendered from one shared context. Every config item
+renders one fragment per slot of its section, e.g. a tool renders its Tool(...)
+definition, its implementation function and its call_tool dispatch branch,
+and a resource its Resource(...) definition and its routed function.
+"""
+
+import json
+from typing import Any, Callable
+
+from template_engine import Template, encode_string, python_identifier, render_input_schema
+from validator_templates import render_validator, validator_name
+from http_templates import (
+    HTTP_REQUIREMENT,
+    HTTP_TOOL_FUNCTION,
+    http_pool_settings,
+    render_http_request,
+    render_http_runtime
+)
+from search_templates import (
+    BUILD_INDEX_README,
+    BUILD_INDEX_SCRIPT,
+    SEARCH_PARAMETERS,
+    SEARCH_TOOL_FUNCTION,
+    render_search_request,
+    render_search_runtime
+)
+from sqlite_templates import SQLITE_TOOL_FUNCTION, render_sqlite_request, render_sqlite_runtime
+from resource_templates import (
+    KIND_RENDERERS,
+    render_resource_cache_decorator,
+    render_resource_runtimes,
+    resource_features,
+    resource_imports,
+    resource_kind
+)
+from runtime_templates import (
+    OFFLOADED_TOOL_FUNCTION,
+    builtin_tools,
+    execution_settings,
+    feature_imports,
+    import_settings,
+    is_positive_int,
+    render_builtin_function,
+    render_cache_decorator,
+    render_deadline_decorator,
+    render_builtin_resources,
+    render_feature_runtimes,
+    render_instrumentation,
+    render_limit_decorator,
+    render_server_runtimes
+)
+
+
+SERVER_TYPES = ("tool", "resource", "full")
+
+# Server-level generation options read from the config, with their defaults
+DEFAULT_OPTIONS = {
+    "dispatch": "chain",
+    "validate_arguments": True,
+    "transport": "stdio",
+    "metrics": False,
+    "page_size": None,
+    "http_pool": None
+}
+
+DISPATCH_MODES = ("chain", "dict")
+
+TRANSPORTS = ("stdio", "http", "both")
+
+
+def resolve_options(server_type: str, config: dict) -> dict:
+    """
+    Read and validate the server-level generation options of a config.
+
+    Raises:
+        ValueError: If the server type or an option value is not supported
+    """
+    if server_type not in SERVER_TYPES:
+        raise ValueError(f"Unknown server type: {server_type}")
+
+    options = {key: config.get(key, default) for key, default in DEFAULT_OPTIONS.items()}
+
+    if options["dispatch"] not in DISPATCH_MODES:
+        raise ValueError(f"Unknown dispatch mode: {options['dispatch']}. Use 'chain' or 'dict'.")
+    if not isinstance(options["validate_arguments"], bool):
+        raise ValueError("validate_arguments must be true or false")
+    if not isinstance(options["metrics"], bool):
+        raise ValueError("metrics must be true or false")
+    if options["page_size"] is not None and not is_positive_int(options["page_size"]):
+        raise ValueError("page_size must be a positive integer")
+    if options["transport"] not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {options['transport']}. Use 'stdio', 'http' or 'both'.")
+    http_pool_settings(options["http_pool"])
+
+    return options
+
+
+def config_options(config: dict) -> dict:
+    """Return the generation options explicitly set in a config"""
+    return {key: config[key] for key in DEFAULT_OPTIONS if key in config}
+
+
+def normalize_config(server_type: str, config: dict) -> dict:
+    """
+    Return the parts of a config that shape a server of server_type: the
+    type's sections and the explicitly set options. Other keys (name,
+    description, type, ...) are left out.
+
+    Raises:
+        ValueError: If server_type is not 'tool', 'resource' or 'full'
+    """
+    return {
+        **{section: config.get(section, []) for section in section_slots(server_type)},
+        **config_options(config)
+    }
+
+
+def config_features(server_type: str, config: dict, options: dict) -> frozenset:
+    """Return the runtime features (validation, cache, ...) a config needs"""
+    features = set()
+    if options["metrics"]:
+        features.add("metrics")
+    if options["page_size"] is not None:
+        features.add("pagination")
+    if server_type in ("resource", "full"):
+        features |= resource_features(config.get("resources", []))
+    if server_type not in ("tool", "full"):
+        return frozenset(features)
+
+    if options["validate_arguments"]:
+        features.add("validation")
+    for tool in config.get("tools", []):
+        if tool.get("cache"):
+            features.add("cache")
+        if tool.get("timeout_ms") is not None:
+            features.add("deadline")
+        if tool.get("concurrency") is not None:
+            features.add("limits")
+        if tool.get("executor", "inline") != "inline":
+            features.add("executor")
+        if tool_kind(tool):
+            features.update(TOOL_KINDS[tool_kind(tool)][0])
+    return frozenset(features)
+
+
+def options_key(options: dict) -> str:
+    """Canonical string form of resolved options, used in fragment cache keys"""
+    return json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+
+
+# ---------------------------------------------------------------------------
+# Header, main and support files
+# ---------------------------------------------------------------------------
+
+HEADER = Template('''#!/usr/bin/env python3
+"""
+{{name}} - {{description}}
+Auto-generated by MCP Generator
+"""
+
+{{stdlib_imports}}
+from typing import Any{{typing_extra}}
+from mcp.server import Server
+from mcp.server.stdio import stdio_server{{mcp_imports}}
+from mcp.types import {{mcp_types}}
+
+# Initialize the MCP server
+app = Server("{{name}}")
+
+
+def serve_cached(request_type) -> None:
+    """Answer a listing request with one ServerResult, built on first use and then reused"""
+    handler = app.request_handlers[request_type]
+    result = None
+
+    async def cached_handler(request):
+        nonlocal result
+        if result is None:
+            result = await handler(request)
+        return result
+
+    app.request_handlers[request_type] = cached_handler
+{{server_runtime}}''')
+
+# Shared by every entry point: `python server.py --startup-report`
+STARTUP_REPORT = Template('''
+
+def startup_report(limit: int = 15) -> None:
+    """Print an importtime breakdown of this server's startup and of its deferred tool imports"""
+    import subprocess
+    from pathlib import Path
+
+    server = Path(__file__).resolve()
+    deferred = sorted({module for modules in globals().get("LAZY_IMPORTS", {}).values() for module in modules})
+    script = "; ".join([
+        "import sys", "print('@startup', file=sys.stderr)", f"import {server.stem}",
+        "print('@deferred', file=sys.stderr)", *[f"import {module}" for module in deferred]
+    ])
+    probe = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=server.parent, capture_output=True, text=True
+    )
+    if probe.returncode != 0:
+        print(probe.stderr[-2000:], file=sys.stderr)
+        raise SystemExit(probe.returncode)
+
+    # Lines read "import time: <self us> | <cumulative us> | <name indented by depth>". Each
+    # section lists the imports it triggered directly; for the server those are one level down
+    sections = {"@interpreter": ([], []), "@startup": ([], []), "@deferred": ([], [])}
+    depth_listed = {"@interpreter": 0, "@startup": 1, "@deferred": 0}
+    key = "@interpreter"
+    for line in probe.stderr.splitlines():
+        if line in sections:
+            key = line
+        elif line.startswith("import time:") and "[us]" not in line:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            totals, entries = sections[key]
+            if depth == 0:
+                totals.append(int(cumulative_us) / 1000)
+            if depth == depth_listed[key]:
+                entries.append((int(cumulative_us) / 1000, name.strip()))
+            if key == "@startup" and depth == 0:
+                entries.append((int(self_us) / 1000, f"{name.strip()} (module body)"))
+
+    for title, key in (("Interpreter startup", "@interpreter"), ("Server import", "@startup"),
+                       ("Deferred to first tool call", "@deferred")):
+        totals, entries = sections[key]
+        print(f"{title}: {sum(totals):.1f} ms")
+        for ms, name in sorted(entries, reverse=True)[:limit]:
+            print(f"  {ms:>9.1f} ms  {name}")
+''')
+
+MAIN = Template('''
+async def main():
+    """Run the MCP server"""
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(
+            read_stream,
+            write_stream,
+            app.create_initialization_options()
+        )
+
+if __name__ == "__main__":
+    if "--startup-report" in sys.argv[1:]:
+        startup_report()
+    else:
+        asyncio.run(main())
+''')
+
+# Entry point of servers generated with transport 'http' or 'both'. The HTTP
+# side is Streamable HTTP (responses stream as SSE) in stateless mode, so every
+# uvicorn worker can answer every request and workers scale horizontally.
+HTTP_MAIN = Template('''
+async def run_stdio():
+    """Serve one client over stdin/stdout"""
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(
+            read_stream,
+            write_stream,
+            app.create_initialization_options()
+        )
+
+
+def create_http_app():
+    """Build the ASGI app serving MCP over Streamable HTTP at /mcp (one per worker)"""
+    from contextlib import asynccontextmanager
+
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+
+    session_manager = StreamableHTTPSessionManager(app=app, stateless=True)
+
+    class MCPEndpoint:
+        async def __call__(self, scope, receive, send):
+            await session_manager.handle_request(scope, receive, send)
+
+    @asynccontextmanager
+    async def lifespan(_):
+        async with session_manager.run():
+            yield
+
+    routes = [Route("/mcp", endpoint=MCPEndpoint(), methods=["GET", "POST", "DELETE"])]
+{{http_metrics_route}}
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+def run_http(host: str, port: int, workers: int, keep_alive: int) -> None:
+    """Serve over HTTP with uvicorn; workers > 1 forks one server process per worker"""
+    from pathlib import Path
+
+    import uvicorn
+
+    uvicorn.run(
+        f"{Path(__file__).stem}:create_http_app",
+        factory=True,
+        app_dir=str(Path(__file__).resolve().parent),
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_keep_alive=keep_alive
+    )
+
+
+def build_parser() -> "argparse.ArgumentParser":
+    """Command line of the server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="{{name}} MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="{{default_transport}}",
+                        help="Serve one client over stdio or many over HTTP (default: {{default_transport}})")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP port")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--keep-alive", type=int, default=15,
+                        help="Seconds an idle HTTP connection is kept open for reuse")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print where import time goes at startup, then exit")
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    if args.startup_report:
+        startup_report()
+    elif args.transport == "http":
+        run_http(args.host, args.port, args.workers, args.keep_alive)
+    else:
+        asyncio.run(run_stdio())
+''')
+
+# Prometheus scrape endpoint added to create_http_app when metrics are enabled
+HTTP_METRICS_ROUTE = '''
+    from starlette.responses import PlainTextResponse
+
+    async def prometheus_metrics(request):
+        """Metrics of this worker process in the Prometheus text format"""
+        return PlainTextResponse(metrics_prometheus(), media_type="text/plain; version=0.0.4")
+
+    routes.append(Route("/metrics", endpoint=prometheus_metrics))
+'''
+
+# Client-side throughput test shipped with HTTP-capable servers
+LOAD_TEST = Template('''#!/usr/bin/env python3
+"""
+Load test for {{name}}
+Measures list_tools round trips per second over stdio (one client, one server
+process) and over HTTP (many clients against all uvicorn workers).
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER = Path(__file__).resolve().parent / "server.py"
+
+
+async def hammer(session: ClientSession, requests: int, concurrency: int) -> None:
+    """Send requests round trips through one session, at most concurrency at once"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await session.list_tools()
+
+    await asyncio.gather(*[one() for _ in range(requests)])
+
+
+async def stdio_throughput(requests: int, concurrency: int) -> float:
+    """Round trips per second against a server process spawned over stdio"""
+    params = StdioServerParameters(command=sys.executable, args=[str(SERVER), "--transport", "stdio"])
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            start = time.perf_counter()
+            await hammer(session, requests, concurrency)
+            return requests / (time.perf_counter() - start)
+
+
+async def http_throughput(url: str, requests: int, concurrency: int, clients: int) -> float:
+    """Round trips per second of several HTTP clients against a running server"""
+    per_client = max(1, requests // clients)
+
+    async def client():
+        async with streamablehttp_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                await hammer(session, per_client, concurrency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(clients)])
+    return per_client * clients / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare stdio and HTTP throughput of {{name}}")
+    parser.add_argument("--transport", choices=["stdio", "http"], required=True)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp", help="HTTP endpoint of a running server")
+    parser.add_argument("--requests", type=int, default=2000, help="Total round trips")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight requests per client")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent HTTP clients")
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        rate = asyncio.run(stdio_throughput(args.requests, args.concurrency))
+    else:
+        rate = asyncio.run(http_throughput(args.url, args.requests, args.concurrency, args.clients))
+    print(f"{args.transport}: {rate:,.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
+''')
+
+HTTP_README = Template('''
+
+## HTTP Transport
+
+The server speaks MCP over Streamable HTTP at `/mcp` (responses stream as SSE). Sessions are stateless, so any worker can answer any request:
+
+```bash
+python server.py --transport http --host 0.0.0.0 --port 8000 --workers 4 --keep-alive 15
+```
+
+{{transport_note}}
+
+## Load Test
+
+Compare the throughput of one stdio client with several HTTP clients spread over the workers:
+
+```bash
+# stdio: spawns its own server process
+python load_test.py --transport stdio --requests 2000
+
+# HTTP: start the server in another terminal first
+python server.py --transport http --workers 4
+python load_test.py --transport http --requests 2000 --clients 8
+```
+
+Run the HTTP test with `--workers 1` and `--workers 4` to see how throughput scales with worker processes.''')
+
+HTTP_TRANSPORT_NOTES = {
+    "http": "HTTP is the default transport; `python server.py --transport stdio` still serves a single local client.",
+    "both": "stdio stays the default transport, so `python server.py` works with local MCP clients unchanged."
+}
+
+METRICS_README = (
+    "\n\n## Metrics\n\nEvery tool call, resource read and prompt request is counted and timed. "
+    "Read the counters through the `__metrics__` tool (tool servers) or the `metrics://server` resource. "
+    "Over HTTP, Prometheus can scrape `/metrics`; each worker process keeps its own counters."
+)
+
+HTTP_REQUIREMENTS = "uvicorn>=0.30.0\nstarlette>=0.37.0\n"
+
+README = Template("# {{name}}\n\n{{description}}\n\n## Installation\n\n```bash\npip install -r requirements.txt\n```\n\n## Usage\n\n```bash\npython server.py\n```{{readme_extra}}")
+
+# Oldest mcp release with what each part of a generated server uses; requirements.txt pins the newest that applies
+MCP_VERSIONS = {
+    "base": (0, 9, 0),
+    "pagination": (1, 0, 0),  # paginated list requests of the 1.x protocol types
+    "resources": (1, 3, 0),  # read_resource returns ReadResourceContents
+    "http": (1, 8, 0),  # streamable HTTP transport
+    "validation": (1, 10, 0)  # call_tool(validate_input=False) leaves validation to the compiled validators
+}
+
+RESOURCE_MCP_IMPORT = "\nfrom mcp.server.lowlevel.helper_types import ReadResourceContents"
+
+# Extra mcp.types names of paginated servers
+PAGINATION_TYPES = {
+    "tool": ", ServerResult, ErrorData, INVALID_PARAMS, ListToolsResult",
+    "resource": ", ServerResult, ErrorData, INVALID_PARAMS, ListResourcesResult",
+    "full": ", ServerResult, ErrorData, INVALID_PARAMS, ListToolsResult, ListResourcesResult, ListPromptsResult"
+}
+
+MCP_TYPES = {
+    "tool": "Tool, TextContent, ListToolsRequest",
+    "resource": "Resource, TextContent, ListResourcesRequest",
+    "full": "Tool, TextContent, Resource, ListToolsRequest, ListResourcesRequest, ListPromptsRequest"
+}
+
+
+# ---------------------------------------------------------------------------
+# Tools
+# ---------------------------------------------------------------------------
+
+TOOL_DEFINITION = Template('''
+    Tool(
+        name="{{tool_name}}",
+        description="{{tool_desc}}",
+        inputSchema={{input_schema}}
+    ),''')
+
+BASIC_TOOL_FUNCTION = Template('''
+{{validator}}{{decorators}}{{function_def}} {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}{{lazy_imports}}    # Extract parameters
+{{param_extraction}}
+
+    # TODO: Implement {{tool_name}} logic here
+    result = f"Executed {{tool_name}}"
+
+    return [TextContent(type="text", text=result)]
+''')
+
+PARAM_EXTRACTION = Template("    {{param_name}} = arguments.get('{{param_name}}')")
+
+FULL_TOOL_FUNCTION = Template('''
+{{validator}}{{decorators}}{{function_def}} {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}{{lazy_imports}}    # TODO: Implement {{tool_name}}
+    return [TextContent(type="text", text="Tool {{tool_name}} executed")]
+''')
+
+TOOL_HANDLER_DECORATOR = Template('@tool_handler("{{tool_name}}")\n')
+
+TOOL_BRANCH = Template('''
+    if name == "{{tool_name}}":
+        return await {{func_name}}(arguments)
+''')
+
+CHAIN_TOOLS_BLOCK = Template('''
+# Tool catalog, built once at import
+TOOLS: list[Tool] = [{{tool_definitions}}{{builtin_tool_definitions}}
+]
+
+# Modules each tool imports on its first call instead of at startup
+LAZY_IMPORTS: dict[str, tuple[str, ...]] = {{{tool_lazy_imports}}
+}
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools"""
+    return TOOLS
+
+{{serve_tools}}
+{{tool_runtime}}
+# Tool implementations
+{{tool_functions}}{{builtin_tool_functions}}
+@app.call_tool({{call_tool_options}})
+{{instrument_tool}}async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool execution requests"""
+{{tool_branches}}{{builtin_tool_branches}}
+    raise ValueError(f"Unknown tool: {name}")
+''')
+
+DICT_TOOLS_BLOCK = Template('''
+# Tool catalog, built once at import
+TOOLS: list[Tool] = [{{tool_definitions}}{{builtin_tool_definitions}}
+]
+
+# Modules each tool imports on its first call instead of at startup
+LAZY_IMPORTS: dict[str, tuple[str, ...]] = {{{tool_lazy_imports}}
+}
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools"""
+    return TOOLS
+
+{{serve_tools}}
+{{tool_runtime}}
+# Tool implementations, registered by name in the dispatch table
+TOOL_HANDLERS: dict[str, Callable[[Any], Awaitable[list[TextContent]]]] = {}
+
+
+def tool_handler(name: str):
+    """Register a tool implementation in TOOL_HANDLERS"""
+    def register(func):
+        TOOL_HANDLERS[name] = func
+        return func
+    return register
+{{tool_functions}}{{builtin_tool_functions}}{{tool_branches}}{{builtin_tool_branches}}
+@app.call_tool({{call_tool_options}})
+{{instrument_tool}}async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool execution requests with one dispatch table lookup"""
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
+''')
+
+DISPATCH_BENCHMARK = Template('''#!/usr/bin/env python3
+"""
+Dispatch micro-benchmark for {{name}}
+Shows that call_tool's dispatch table lookup costs the same for every tool and
+does not grow with the number of tools, unlike an if/elif chain.
+"""
+
+import timeit
+
+from server import TOOL_HANDLERS
+
+LOOKUPS = 200_000
+
+
+def time_lookup(table: dict, name: str) -> float:
+    """Nanoseconds per dispatch table lookup"""
+    return timeit.timeit(lambda: table.get(name), number=LOOKUPS) / LOOKUPS * 1e9
+
+
+def time_chain(names: list, name: str) -> float:
+    """Nanoseconds per linear scan, the cost of an if/elif chain"""
+    def scan():
+        for candidate in names:
+            if candidate == name:
+                return candidate
+    number = max(10, LOOKUPS // len(names))
+    return timeit.timeit(scan, number=number) / number * 1e9
+
+
+def main():
+    names = list(TOOL_HANDLERS)
+    print(f"{len(names)} registered tools")
+    if names:
+        for label, name in (("first", names[0]), ("middle", names[len(names) // 2]), ("last", names[-1])):
+            print(f"  {label:<8}{time_lookup(TOOL_HANDLERS, name):>10.1f} ns/lookup")
+    print(f"  {'unknown':<8}{time_lookup(TOOL_HANDLERS, '__unknown__'):>10.1f} ns/lookup")
+
+    print()
+    print(f"{'tools':>8}{'dict (last)':>16}{'chain (last)':>16}")
+    for size in (10, 100, 1000, 10000):
+        synthetic = [f"tool_{i}" for i in range(size)]
+        table = dict.fromkeys(synthetic)
+        print(f"{size:>8}{time_lookup(table, synthetic[-1]):>13.1f} ns{time_chain(synthetic, synthetic[-1]):>13.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
+''')
+
+
+def tool_names(tool: dict) -> tuple[str, str]:
+    """Return the (tool name, implementation function name) of a tool"""
+    tool_name = str(tool.get("name", "example_tool"))
+    return tool_name, python_identifier("tool", tool_name)
+
+
+# Tool "kind" -> (runtime features, body template, renderer of its (constant name, constant definition))
+TOOL_KINDS = {
+    "http": (("http_client",), HTTP_TOOL_FUNCTION, render_http_request),
+    "sqlite": (("sqlite",), SQLITE_TOOL_FUNCTION, render_sqlite_request),
+    "search": (("sqlite", "search"), SEARCH_TOOL_FUNCTION, render_search_request)
+}
+
+# Parameters of a tool of these kinds that declares none of its own
+KIND_PARAMETERS = {
+    "search": SEARCH_PARAMETERS
+}
+
+
+def tool_kind(tool: dict) -> str:
+    """The tool kind rendered for a tool; tools without a known kind are placeholder tools"""
+    kind = tool.get("kind")
+    return kind if isinstance(kind, str) and kind in TOOL_KINDS else ""
+
+
+def tool_parameters(tool: dict) -> list[dict]:
+    """The declared parameters of a tool, or the standard parameters of its kind"""
+    return tool.get("parameters") or KIND_PARAMETERS.get(tool_kind(tool), [])
+
+
+def tool_decorators(tool_name: str, tool: dict, options: dict) -> str:
+    """Decorator lines placed above a tool implementation, outermost first"""
+    decorators = []
+    if options["dispatch"] == "dict":
+        decorators.append(TOOL_HANDLER_DECORATOR.render(tool_name=tool_name))
+    normalize = validator_name(tool_name) if options["validate_arguments"] else ""
+    decorators.append(render_cache_decorator(tool_name, tool, normalize))
+    decorators.append(render_deadline_decorator(tool_name, tool))
+    decorators.append(render_limit_decorator(tool_name, tool))
+    return "".join(decorators)
+
+
+def tool_validation(tool_name: str, tool: dict, options: dict) -> tuple[str, str]:
+    """Return the (validator function, call statement) of a tool, empty when validation is off"""
+    if not options["validate_arguments"]:
+        return "", ""
+    return render_validator(tool), f"    arguments = {validator_name(tool_name)}(arguments)\n"
+
+
+def render_tool_definition(tool: dict, options: dict) -> str:
+    """Render the Tool(...) entry of the tool catalog"""
+    return TOOL_DEFINITION.render(
+        tool_name=str(tool.get("name", "example_tool")),
+        tool_desc=str(tool.get("description", "Example tool")),
+        input_schema=render_input_schema(tool_parameters(tool))
+    )
+
+
+def render_tool_function(body: Template, tool: dict, options: dict, **fields: str) -> str:
+    """
+    Render the implementation function of a tool from its body template.
+
+    Inline tools become one async function. Tools offloaded to a thread or
+    process pool become a plain work function holding the body, plus an async
+    wrapper that validates the arguments on the event loop and runs it on the pool.
+    The tool's deferred imports run where the body runs, after validation.
+    """
+    tool_name, func_name = tool_names(tool)
+    validator, validation = tool_validation(tool_name, tool, options)
+    lazy_imports = "".join([f"    {statement}\n" for statement, _ in import_settings(tool)])
+    tool_doc = encode_string(str(tool.get("description", "Example tool")))
+    decorators = tool_decorators(tool_name, tool, options)
+    executor = execution_settings(tool)[0]
+
+    if executor == "inline":
+        return body.render(
+            validator=validator, validation=validation, lazy_imports=lazy_imports, decorators=decorators,
+            function_def="async def", func_name=func_name, tool_doc=tool_doc, tool_name=tool_name, **fields
+        )
+
+    work_name = python_identifier("work", tool_name)
+    work = body.render(
+        validator=validator, validation="", lazy_imports=lazy_imports, decorators="", function_def="def",
+        func_name=work_name, tool_doc=tool_doc, tool_name=tool_name, **fields
+    )
+    return work + OFFLOADED_TOOL_FUNCTION.render(
+        decorators=decorators, func_name=func_name, tool_doc=tool_doc,
+        validation=validation, executor=executor, work_name=work_name
+    )
+
+
+def render_kind_tool_function(tool: dict, options: dict) -> str:
+    """Render the request constant and implementation function of an http, sqlite or search tool"""
+    _, body, render_request = TOOL_KINDS[tool_kind(tool)]
+    request_name, request = render_request(tool)
+    tool = {**tool, "parameters": tool_parameters(tool)}
+    return render_tool_function(body, tool, options, request=request, request_name=request_name)
+
+
+def render_basic_tool_function(tool: dict, options: dict) -> str:
+    """Render the implementation function of a tool server tool"""
+    if tool_kind(tool):
+        return render_kind_tool_function(tool, options)
+    param_extraction = "\n".join([
+        PARAM_EXTRACTION.render(param_name=str(p["name"]))
+        for p in tool.get("parameters", [])
+    ])
+    return render_tool_function(BASIC_TOOL_FUNCTION, tool, options, param_extraction=param_extraction)
+
+
+def render_full_tool_function(tool: dict, options: dict) -> str:
+    """Render the implementation function of a full server tool"""
+    if tool_kind(tool):
+        return render_kind_tool_function(tool, options)
+    return render_tool_function(FULL_TOOL_FUNCTION, tool, options)
+
+
+def render_tool_lazy_imports(tool: dict, options: dict) -> str:
+    """Render the LAZY_IMPORTS entry of a tool, or nothing if it imports everything at startup"""
+    modules = [module for _, module in import_settings(tool)]
+    if not modules:
+        return ""
+    tool_name, _ = tool_names(tool)
+    members = ", ".join([encode_string(module) for module in modules])
+    return f"\n    {encode_string(tool_name)}: ({members},),"
+
+
+def render_tool_branch(tool: dict, options: dict) -> str:
+    """Render the call_tool if-branch of a tool (chain dispatch only)"""
+    if options["dispatch"] != "chain":
+        return ""
+    tool_name, func_name = tool_names(tool)
+    return TOOL_BRANCH.render(tool_name=tool_name, func_name=func_name)
+
+
+# ---------------------------------------------------------------------------
+# Resources
+# ---------------------------------------------------------------------------
+
+RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="{{res_name}}",
+        description="{{res_desc}}",
+        mimeType="text/plain" if "{{res_type}}" == "text" else "application/json"
+    ),''')
+
+RESOURCE_FUNCTION = Template('''
+@resource_route("{{res_uri}}", "{{mime_type}}")
+{{cache_decorator}}async def {{func_name}}(uri: str) -> list[TextContent]:
+    ""{{res_doc}}""
+    # TODO: Implement {{res_name}} data fetching
+    content = "Sample data for {{res_name}}"
+    return [TextContent(type="text", text=content)]
+''')
+
+FULL_RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="{{res_name}}",
+        description="{{res_desc}}",
+        mimeType="text/plain"
+    ),''')
+
+FULL_RESOURCE_FUNCTION = Template('''
+@resource_route("{{res_uri}}", "text/plain")
+{{cache_decorator}}async def {{func_name}}(uri: str) -> list[TextContent]:
+    ""{{res_doc}}""
+    return [TextContent(type="text", text="Resource {{res_name}} data")]
+''')
+
+RESOURCES_BLOCK = Template('''
+# Resource catalog, built once at import
+RESOURCES: list[Resource] = [{{resource_definitions}}{{builtin_resource_definitions}}
+]
+
+@app.list_resources()
+async def list_resources() -> list[Resource]:
+    """List available resources"""
+    return RESOURCES
+
+{{serve_resources}}
+
+
+class ResourceRouter:
+    """Longest-prefix URI router backed by a character trie built once at import"""
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def add(self, prefix: str, handler) -> None:
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # "" never collides with a one-character edge; the first declaration of a prefix wins
+        node.setdefault("", handler)
+
+    def match(self, uri: str):
+        """Return the handler of the longest declared prefix of uri, or None"""
+        node = self.root
+        handler = node.get("")
+        for char in uri:
+            node = node.get(char)
+            if node is None:
+                break
+            handler = node.get("", handler)
+        return handler
+
+
+RESOURCE_ROUTER = ResourceRouter()
+
+
+# Schemes whose bare host pydantic gives a "/" path: file://notes?chunk=2 arrives as file://notes/?chunk=2
+SLASHED_SCHEMES = frozenset({"file", "http", "https", "ws", "wss", "ftp"})
+
+
+def request_uri(uri) -> str:
+    """Return a requested URI (an AnyUrl from the SDK) as a str in its declared form"""
+    uri = str(uri)
+    scheme, _, rest = uri.partition("://")
+    host, slash, tail = rest.partition("/")
+    if scheme in SLASHED_SCHEMES and host and slash and tail[:1] in ("", "?", "#") and not any(char in host for char in "?#"):
+        return f"{scheme}://{host}{tail}"
+    return uri
+
+
+def resource_route(prefix: str, mime_type: str):
+    """Register a resource implementation, and the MIME type of its contents, for every URI starting with prefix"""
+    def register(func):
+        func.mime_type = mime_type
+        RESOURCE_ROUTER.add(request_uri(prefix), func)
+        return func
+    return register
+
+{{resource_runtime}}
+# Resource implementations
+{{resource_functions}}{{builtin_resource_functions}}
+@app.read_resource()
+{{instrument_resource}}async def read_resource(uri) -> list[ReadResourceContents]:
+    """Read a specific resource"""
+    uri = request_uri(uri)
+    handler = RESOURCE_ROUTER.match(uri)
+    if handler is None:
+        raise ValueError(f"Unknown resource: {uri}")
+    return [ReadResourceContents(content=content.text, mime_type=handler.mime_type) for content in await handler(uri)]
+''')
+
+
+def resource_names(resource: dict) -> tuple[str, str, str]:
+    """Return the (URI, name, implementation function name) of a resource"""
+    res_uri = str(resource.get("uri", "resource://example"))
+    return res_uri, str(resource.get("name", "Example Resource")), python_identifier("resource", res_uri)
+
+
+def render_resource_definition(resource: dict, options: dict) -> str:
+    """Render the Resource(...) entry of a resource server"""
+    kind = resource_kind(resource)
+    if kind:
+        return KIND_RENDERERS[kind][0](resource)
+    return RESOURCE_DEFINITION.render(
+        res_uri=str(resource.get("uri", "resource://example")),
+        res_name=str(resource.get("name", "Example Resource")),
+        res_desc=str(resource.get("description", "Example resource")),
+        res_type=str(resource.get("type", "text"))
+    )
+
+
+def render_resource_function(resource: dict, options: dict) -> str:
+    """Render the routed implementation function of a resource server resource"""
+    kind = resource_kind(resource)
+    if kind:
+        return KIND_RENDERERS[kind][1](resource)
+    res_uri, res_name, func_name = resource_names(resource)
+    return RESOURCE_FUNCTION.render(
+        res_uri=res_uri,
+        mime_type="text/plain" if str(resource.get("type", "text")) == "text" else "application/json",
+        func_name=func_name,
+        res_doc=encode_string(str(resource.get("description", "Example resource"))),
+        res_name=res_name,
+        cache_decorator=render_resource_cache_decorator(resource)
+    )
+
+
+def render_full_resource_definition(resource: dict, options: dict) -> str:
+    """Render the Resource(...) entry of a full server"""
+    kind = resource_kind(resource)
+    if kind:
+        return KIND_RENDERERS[kind][0](resource)
+    return FULL_RESOURCE_DEFINITION.render(
+        res_uri=str(resource.get("uri", "resource://example")),
+        res_name=str(resource.get("name", "Example Resource")),
+        res_desc=str(resource.get("description", "Example resource"))
+    )
+
+
+def render_full_resource_function(resource: dict, options: dict) -> str:
+    """Render the routed implementation function of a full server resource"""
+    kind = resource_kind(resource)
+    if kind:
+        return KIND_RENDERERS[kind][1](resource)
+    res_uri, res_name, func_name = resource_names(resource)
+    return FULL_RESOURCE_FUNCTION.render(
+        res_uri=res_uri,
+        func_name=func_name,
+        res_doc=encode_string(str(resource.get("description", "Example resource"))),
+        res_name=res_name,
+        cache_decorator=render_resource_cache_decorator(resource)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Prompts
+# ---------------------------------------------------------------------------
+
+PROMPT_DEFINITION = Template('''
+    {
+        "name": "{{prompt_name}}",
+        "description": "{{prompt_desc}}"
+    },''')
+
+PROMPT_BRANCH = Template('''
+    if name == "{{prompt_name}}":
+        return {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": {
+                        "type": "text",
+                        "text": "Example prompt for {{prompt_name}}"
+                    }
+                }
+            ]
+        }
+''')
+
+PROMPTS_BLOCK = Template('''
+# Prompt catalog, built once at import
+PROMPTS: list[dict] = [{{prompt_definitions}}
+]
+
+@app.list_prompts()
+async def list_prompts() -> list[dict]:
+    """List available prompts"""
+    return PROMPTS
+
+{{serve_prompts}}
+
+@app.get_prompt()
+{{instrument_prompt}}async def get_prompt(name: str, arguments: dict) -> dict:
+    """Get a specific prompt"""
+{{prompt_branches}}
+    raise ValueError(f"Unknown prompt: {name}")
+''')
+
+
+def render_prompt_definition(prompt: dict, options: dict) -> str:
+    """Render the prompt catalog entry of a full server"""
+    return PROMPT_DEFINITION.render(
+        prompt_name=str(prompt.get("name", "example_prompt")),
+        prompt_desc=str(prompt.get("description", "Example prompt"))
+    )
+
+
+def render_prompt_branch(prompt: dict, options: dict) -> str:
+    """Render the get_prompt branch of a full server"""
+    return PROMPT_BRANCH.render(prompt_name=str(prompt.get("name", "example_prompt")))
+
+
+# ---------------------------------------------------------------------------
+# Sections
+# ---------------------------------------------------------------------------
+
+# Per server type and config section: the (context field, item renderer) slots
+# every item fills. Renderers take (item, options) and return one fragment.
+SECTION_SLOTS = {
+    "tool": {
+        "tools": (
+            ("tool_definitions", render_tool_definition),
+            ("tool_functions", render_basic_tool_function),
+            ("tool_branches", render_tool_branch),
+            ("tool_lazy_imports", render_tool_lazy_imports)
+        )
+    },
+    "resource": {
+        "resources": (
+            ("resource_definitions", render_resource_definition),
+            ("resource_functions", render_resource_function)
+        )
+    },
+    "full": {
+        "tools": (
+            ("tool_definitions", render_tool_definition),
+            ("tool_functions", render_full_tool_function),
+            ("tool_branches", render_tool_branch),
+            ("tool_lazy_imports", render_tool_lazy_imports)
+        ),
+        "resources": (
+            ("resource_definitions", render_full_resource_definition),
+            ("resource_functions", render_full_resource_function)
+        ),
+        "prompts": (
+            ("prompt_definitions", render_prompt_definition),
+            ("prompt_branches", render_prompt_branch)
+        )
+    }
+}
+
+# What an empty definition list renders as in a full server
+EMPTY_DEFINITIONS = {
+    "tool_definitions": "\n    # No tools defined",
+    "resource_definitions": "\n    # No resources defined",
+    "prompt_definitions": "\n    # No prompts defined"
+}
+
+
+def section_slots(server_type: str) -> dict:
+    """Return the section slots of a server type"""
+    if server_type not in SECTION_SLOTS:
+        raise ValueError(f"Unknown server type: {server_type}")
+    return SECTION_SLOTS[server_type]
+
+
+def render_item(server_type: str, section: str, item: dict, options: dict) -> tuple[str, ...]:
+    """Render every slot fragment of one tool, resource or prompt"""
+    return tuple([render(item, options) for _, render in section_slots(server_type)[section]])
+
+
+def render_sections(server_type: str, config: dict, options: dict) -> dict:
+    """Render the fragments of every item in the config, grouped by section"""
+    return {
+        section: [tuple([render(item, options) for _, render in slots]) for item in config.get(section, [])]
+        for section, slots in section_slots(server_type).items()
+    }
+
+
+# Listing request, result type and catalog of each section
+LISTINGS = {
+    "tools": ("ListToolsRequest", "ListToolsResult", "TOOLS"),
+    "resources": ("ListResourcesRequest", "ListResourcesResult", "RESOURCES"),
+    "prompts": ("ListPromptsRequest", "ListPromptsResult", "PROMPTS")
+}
+
+
+def render_listings(options: dict) -> dict:
+    """Render the statements installing the list_tools/list_resources/list_prompts handlers"""
+    listings = {}
+    for section, (request_type, result_type, catalog) in LISTINGS.items():
+        if options["page_size"] is None:
+            listings[f"serve_{section}"] = f"serve_cached({request_type})"
+        else:
+            listings[f"serve_{section}"] = (
+                f'serve_paged({request_type}, {result_type}, "{section}", {catalog}, page_size={options["page_size"]})'
+            )
+    return listings
+
+
+def server_blocks(server_type: str, options: dict) -> tuple[Template, ...]:
+    """Return the ordered block templates that make up server.py"""
+    blocks = [HEADER]
+    if server_type in ("tool", "full"):
+        blocks.append(DICT_TOOLS_BLOCK if options["dispatch"] == "dict" else CHAIN_TOOLS_BLOCK)
+    if server_type in ("resource", "full"):
+        blocks.append(RESOURCES_BLOCK)
+    if server_type == "full":
+        blocks.append(PROMPTS_BLOCK)
+    blocks.append(STARTUP_REPORT)
+    blocks.append(MAIN if options["transport"] == "stdio" else HTTP_MAIN)
+    return tuple(blocks)
+
+
+def render_builtin_tools(features, options: dict) -> dict:
+    """Render the definitions, functions and branches of the built-in tools"""
+    definitions, functions, branches = [], [], []
+    for tool_name, description, body in builtin_tools(features):
+        func_name = python_identifier("tool", tool_name)
+        definitions.append(TOOL_DEFINITION.render(
+            tool_name=tool_name, tool_desc=description, input_schema=render_input_schema([])
+        ))
+        decorators = TOOL_HANDLER_DECORATOR.render(tool_name=tool_name) if options["dispatch"] == "dict" else ""
+        functions.append(render_builtin_function(tool_name, func_name, description, body, decorators))
+        if options["dispatch"] == "chain":
+            branches.append(TOOL_BRANCH.render(tool_name=tool_name, func_name=func_name))
+    return {
+        "builtin_tool_definitions": "".join(definitions),
+        "builtin_tool_functions": "".join(functions),
+        "builtin_tool_branches": "".join(branches)
+    }
+
+
+def server_context(name: str, description: str, server_type: str, options: dict, features,
+                   slot_values: dict) -> dict:
+    """Build the render context shared by all blocks from the joined slot values"""
+    has_tools = server_type in ("tool", "full")
+    context = {
+        "name": str(name),
+        "description": str(description),
+        "stdlib_imports": feature_imports(features, base=("import asyncio", "import sys", *resource_imports(features))),
+        "resource_runtime": render_resource_runtimes(features),
+        "mcp_types": MCP_TYPES[server_type] + (PAGINATION_TYPES[server_type] if "pagination" in features else ""),
+        "mcp_imports": (RESOURCE_MCP_IMPORT if server_type != "tool" else "")
+        + ("\nfrom mcp.shared.exceptions import McpError" if "pagination" in features else ""),
+        **render_listings(options),
+        "typing_extra": ", Awaitable, Callable" if has_tools and options["dispatch"] == "dict" else "",
+        "tool_runtime": render_feature_runtimes(features) + render_http_runtime(features, options),
+        "default_transport": "stdio" if options["transport"] == "both" else options["transport"],
+        "server_runtime": render_server_runtimes(features) + render_sqlite_runtime(features) + render_search_runtime(features),
+        "http_metrics_route": HTTP_METRICS_ROUTE if "metrics" in features else "",
+        "instrument_tool": render_instrumentation(features, "tool"),
+        # The compiled validators check (and coerce) arguments, so the SDK's jsonschema pass is skipped
+        "call_tool_options": "validate_input=False" if "validation" in features else "",
+        "instrument_resource": render_instrumentation(features, "resource"),
+        "instrument_prompt": render_instrumentation(features, "prompt"),
+        **render_builtin_resources(features),
+        **render_builtin_tools(features, options)
+    }
+    for field, value in slot_values.items():
+        if server_type == "full" and field in EMPTY_DEFINITIONS and not value:
+            value = EMPTY_DEFINITIONS[field]
+        context[field] = value
+    return context
+
+
+def render_support_files(name: str, description: str, server_type: str, options: dict,
+                         features=frozenset()) -> dict:
+    """Render README.md, requirements.txt and any option-specific extra files"""
+    files = {}
+    readme_extra = ""
+
+    if server_type in ("tool", "full") and options["dispatch"] == "dict":
+        files["benchmark_dispatch.py"] = DISPATCH_BENCHMARK.render(name=str(name))
+        readme_extra += "\n\n## Dispatch Benchmark\n\nTools are dispatched through a dictionary lookup. Measure its cost with:\n\n```bash\npython benchmark_dispatch.py\n```"
+
+    if options["metrics"]:
+        readme_extra += METRICS_README
+
+    if "search" in features:
+        files["build_search_index.py"] = BUILD_INDEX_SCRIPT.render(name=str(name))
+        readme_extra += BUILD_INDEX_README
+
+    needs = ["base"]
+    extra_requirements = ""
+    if options["page_size"] is not None:
+        needs.append("pagination")
+    if server_type in ("resource", "full"):
+        needs.append("resources")
+    if "validation" in features:
+        needs.append("validation")
+    if options["transport"] != "stdio":
+        files["load_test.py"] = LOAD_TEST.render(name=str(name))
+        readme_extra += HTTP_README.render(transport_note=HTTP_TRANSPORT_NOTES[options["transport"]])
+        needs.append("http")
+        extra_requirements += HTTP_REQUIREMENTS
+    if "http_client" in features:
+        extra_requirements += HTTP_REQUIREMENT
+    mcp_version = ".".join(map(str, max(MCP_VERSIONS[need] for need in needs)))
+
+    return {
+        "README.md": README.render(name=str(name), description=str(description), readme_extra=readme_extra),
+        "requirements.txt": f"mcp>={mcp_version}\n{extra_requirements}",
+        **files
+    }
+
+
+# ---------------------------------------------------------------------------
+# Server renderers
+# ---------------------------------------------------------------------------
+
+def assemble_server(name: str, description: str, server_type: str, sections: dict, options: dict,
+                    features: frozenset) -> dict:
+    """Stitch rendered section fragments into the files of a server"""
+    slot_values = {}
+    for section, slots in section_slots(server_type).items():
+        fragments = sections[section]
+        for index, (field, _) in enumerate(slots):
+            slot_values[field] = "".join([item_fragments[index] for item_fragments in fragments])
+
+    context = server_context(name, description, server_type, options, features, slot_values)
+    code = "".join([block.render_map(context) for block in server_blocks(server_type, options)])
+    return {"server.py": code, **render_support_files(name, description, server_type, options, features)}
+
+
+def render_server(name: str, description: str, server_type: str, config: dict) -> dict:
+    """Render all files for any supported server type"""
+    options = resolve_options(server_type, config)
+    sections = render_sections(server_type, config, options)
+    features = config_features(server_type, config, options)
+    return assemble_server(name, description, server_type, sections, options, features)
+
+
+def basic_tool_server(name: str, description: str, tools: list[dict]) -> dict:
+    """Render all files of a basic tool-based MCP server"""
+    return render_server(name, description, "tool", {"tools": tools})
+
+
+def resource_server(name: str, description: str, resources: list[dict]) -> dict:
+    """Render all files of a resource-based MCP server"""
+    return render_server(name, description, "resource", {"resources": resources})
+
+
+def full_server(name: str, description: str, config: dict) -> dict:
+    """Render all files of a full-featured MCP server"""
+    return render_server(name, description, "full", config)
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+def iter_fragments(render, items: list[dict], options: dict):
+    """Lazily render one fragment per item"""
+    for item in items:
+        yield render(item, options)
+
+
+def sink_writer(sink) -> Callable[[str], Any]:
+    """Return the write function of a text sink (file-like object or callable)"""
+    return sink.write if hasattr(sink, "write") else sink
+
+
+def stream_server(name: str, description: str, server_type: str, config: dict, sink) -> None:
+    """
+    Write the server.py of any server type into a text sink chunk by chunk.
+
+    The output is identical to render_server(...)["server.py"], but fragments are
+    rendered and written one item at a time, so peak memory stays flat no matter
+    how many tools, resources or prompts the config has.
+    """
+    options = resolve_options(server_type, config)
+
+    slot_values = {}
+    for section, slots in section_slots(server_type).items():
+        items = config.get(section, [])
+        for field, render in slots:
+            slot_values[field] = iter_fragments(render, items, options) if items else ""
+
+    features = config_features(server_type, config, options)
+    context = server_context(name, description, server_type, options, features, slot_values)
+    write = sink_writer(sink)
+    for block in server_blocks(server_type, options):
+        block.stream(write, context)
+
+
+def stream_files(name: str, description: str, server_type: str, config: dict, open_sink) -> list[str]:
+    """
+    Stream every generated file into sinks opened by open_sink(filename).
+
+    open_sink must return a context manager yielding a text sink, e.g.
+    ``lambda filename: open(output_dir / filename, "w")``.
+
+    Returns:
+        The list of filenames written
+    """
+    with open_sink("server.py") as sink:
+        stream_server(name, description, server_type, config, sink)
+
+    options = resolve_options(server_type, config)
+    features = config_features(server_type, config, options)
+    support_files = render_support_files(name, description, server_type, options, features)
+    for filename, content in support_files.items():
+        with open_sink(filename) as sink:
+            sink_writer(sink)(content)
+
+    return ["server.py", *support_files]
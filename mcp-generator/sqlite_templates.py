@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+SQLite Templates - Resources of type "sqlite" and tools of kind "sqlite", which
+map a URI or tool arguments onto one parameterized query against a local
+database file. Queries run on a small pool of read-only connections (one per
+worker thread) with the database in WAL mode, reuse the connections' prepared
+statements, and stream rows into the response in batches.
+"""
+
+import re
+from string import Formatter
+from typing import Optional
+
+from template_engine import Template, encode_string, python_identifier
+from runtime_templates import is_positive_int
+
+DEFAULT_POOL_SIZE = 4
+
+DEFAULT_MAX_ROWS = 10000
+
+SQLITE_RUNTIME = Template('''
+# SQLite queries, run on a small pool of read-only connections
+SQLITE_BATCH_ROWS = 512
+
+SQLITE_CACHED_STATEMENTS = 256
+
+
+def sqlite_value(value: Any) -> Any:
+    """JSON form of a column value json cannot encode itself (BLOBs become base64)"""
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Unsupported column value: {value!r}")
+
+
+class SqlitePool:
+    """
+    Read-only connections to one database file, one per worker thread. Every
+    connection keeps a cache of prepared statements keyed on the SQL text, so
+    each query is compiled once per connection instead of once per call.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        self.size = size
+        self.local = threading.local()
+        self.connections = 0
+        self.executor = None
+
+    def enable_wal(self) -> None:
+        """Switch the database to WAL once, so readers and a writer never block each other"""
+        try:
+            connection = sqlite3.connect("file:" + urllib.parse.quote(self.path) + "?mode=rw", uri=True)
+            try:
+                connection.execute("PRAGMA journal_mode = WAL")
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            pass  # A read-only file still serves reads in its current journal mode
+
+    def connection(self) -> sqlite3.Connection:
+        """The read-only connection of the calling worker thread"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                "file:" + urllib.parse.quote(self.path) + "?mode=ro", uri=True,
+                check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS
+            )
+            connection.execute("PRAGMA query_only = ON")
+            self.local.connection = connection
+            self.connections += 1
+        return connection
+
+    async def call(self, func, *args) -> Any:
+        """Run func(*args) on one of the pool's threads"""
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(self.size, thread_name_prefix="sqlite")
+            self.executor.submit(self.enable_wal)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def query(self, sql: str, params: dict, max_rows: int) -> str:
+        """Run a query on the pool and return its rows as JSON"""
+        return await self.call(self.run, sql, params, max_rows)
+
+    def run(self, sql: str, params: dict, max_rows: int) -> str:
+        """Fetch at most max_rows rows in batches, encoding each batch as soon as it is read"""
+        cursor = self.connection().execute(sql, params)
+        try:
+            columns = [column[0] for column in cursor.description or ()]
+            parts = []
+            remaining = max_rows
+            while remaining:
+                rows = cursor.fetchmany(min(SQLITE_BATCH_ROWS, remaining))
+                if not rows:
+                    break
+                parts.append(json.dumps(rows, separators=(",", ":"), default=sqlite_value)[1:-1])
+                remaining -= len(rows)
+            truncated = remaining == 0 and cursor.fetchone() is not None
+        finally:
+            cursor.close()
+        return '{"columns":%s,"rows":[%s],"truncated":%s}' % (
+            json.dumps(columns), ",".join(parts), "true" if truncated else "false"
+        )
+
+
+SQLITE_POOLS: dict[str, SqlitePool] = {}
+
+
+def sqlite_pool(database: str, size: int) -> SqlitePool:
+    """The pool of a database file, shared by every query against it; the first size given wins"""
+    pool = SQLITE_POOLS.get(database)
+    if pool is None:
+        pool = SQLITE_POOLS[database] = SqlitePool(database, size)
+    return pool
+
+
+class SqliteQuery:
+    """One parameterized query of a resource or tool"""
+
+    __slots__ = ("pool", "sql", "max_rows", "uri_pattern")
+
+    def __init__(self, database: str, sql: str, pool_size: int, max_rows: int, uri_pattern: str | None = None):
+        self.pool = sqlite_pool(database, pool_size)
+        self.sql = sql
+        self.max_rows = max_rows
+        self.uri_pattern = re.compile(uri_pattern) if uri_pattern is not None else None
+
+    async def fetch(self, params: dict) -> list[TextContent]:
+        """Run the query with named parameters and return the rows as one JSON text"""
+        try:
+            text = await self.pool.query(self.sql, params, self.max_rows)
+        except sqlite3.ProgrammingError as e:
+            raise ValueError(str(e)) from None
+        return [TextContent(type="text", text=text)]
+
+    async def read(self, uri: str) -> list[TextContent]:
+        """
+        Bind the {placeholders} of the resource URI and its ?query parameters, then fetch.
+        Values are bound as text: INTEGER columns and LIMIT convert them, and keys such as
+        "01234" keep their leading zeros.
+        """
+        path, _, query = uri.partition("?")
+        match = self.uri_pattern.match(path)
+        if match is None:
+            raise ValueError(f"Unknown resource: {uri}")
+        params = dict(urllib.parse.parse_qsl(query))
+        for name, value in match.groupdict().items():
+            params[name] = urllib.parse.unquote(value)
+        return await self.fetch(params)
+''')
+
+SQLITE_QUERY = Template('''
+{{query_name}} = SqliteQuery(
+    {{database}},
+    {{sql}},
+    pool_size={{pool_size}},
+    max_rows={{max_rows}}{{uri_pattern}}
+)
+''')
+
+SQLITE_TOOL_FUNCTION = Template('''{{request}}
+{{validator}}{{decorators}}{{function_def}} {{func_name}}(arguments: Any) -> list[TextContent]:
+    ""{{tool_doc}}""
+{{validation}}{{lazy_imports}}    return await {{request_name}}.fetch(arguments or {})
+''')
+
+SQLITE_RESOURCE_DEFINITION = Template('''
+    Resource(
+        uri="{{res_uri}}",
+        name="{{res_name}}",
+        description="{{res_desc}}",
+        mimeType="application/json"
+    ),''')
+
+SQLITE_RESOURCE_FUNCTION = Template('''{{query}}
+
+@resource_route({{prefix_literal}}, "application/json")
+{{cache_decorator}}async def {{func_name}}(uri: str) -> list[TextContent]:
+    ""{{res_doc}}""
+    return await {{query_name}}.read(uri)
+''')
+
+
+def sqlite_settings(item: dict, label: str) -> tuple[str, str, int, int]:
+    """
+    Read and check the fields shared by sqlite resources and tools.
+
+    Returns:
+        (database, query, pool_size, max_rows)
+
+    Raises:
+        ValueError: If a field is missing or has an unsupported value
+    """
+    database = item.get("database")
+    query = item.get("query")
+    pool_size = item.get("pool_size", DEFAULT_POOL_SIZE)
+    max_rows = item.get("max_rows", DEFAULT_MAX_ROWS)
+
+    if not isinstance(database, str) or not database:
+        raise ValueError(f"{label}: sqlite items need a 'database' file")
+    if not isinstance(query, str) or not re.match(r"\s*(SELECT|WITH)\b", query, re.IGNORECASE):
+        raise ValueError(f"{label}: sqlite 'query' must be a single SELECT (or WITH ... SELECT) statement")
+    if not is_positive_int(pool_size):
+        raise ValueError(f"{label}: pool_size must be a positive integer")
+    if not is_positive_int(max_rows):
+        raise ValueError(f"{label}: max_rows must be a positive integer")
+    return database, query, pool_size, max_rows
+
+
+def uri_route(uri: str) -> tuple[str, str]:
+    """
+    Split a resource URI template such as "db://users/{id}" into its route prefix
+    (the text before the first placeholder) and a regex matching the path of a URI.
+
+    Raises:
+        ValueError: If a placeholder is not a Python identifier
+    """
+    prefix, literals, pattern = None, "", []
+    try:
+        fields = list(Formatter().parse(uri))
+    except ValueError:
+        raise ValueError(f"Resource {uri}: malformed URI template") from None
+    for literal, field, _, _ in fields:
+        literals += literal
+        pattern.append(re.escape(literal))
+        if field is None:
+            continue
+        if not field.isidentifier():
+            raise ValueError(f"Resource {uri}: URI placeholder {{{field}}} must be an identifier")
+        if prefix is None:
+            prefix = literals
+        pattern.append(f"(?P<{field}>[^/]+)")
+    return (uri if prefix is None else prefix), "^" + "".join(pattern) + "$"
+
+
+def render_sqlite_query(query_name: str, item: dict, label: str, uri_pattern: Optional[str] = None) -> str:
+    """Render the SqliteQuery(...) constant of a resource or tool"""
+    database, query, pool_size, max_rows = sqlite_settings(item, label)
+    return SQLITE_QUERY.render(
+        query_name=query_name,
+        database=encode_string(database),
+        sql=encode_string(query),
+        pool_size=str(pool_size),
+        max_rows=str(max_rows),
+        uri_pattern=f",\n    uri_pattern={encode_string(uri_pattern)}" if uri_pattern is not None else ""
+    )
+
+
+def render_sqlite_request(tool: dict) -> tuple[str, str]:
+    """Return the (constant name, SqliteQuery(...) definition) of a sqlite tool"""
+    tool_name = str(tool.get("name", "example_tool"))
+    if tool.get("executor", "inline") != "inline":
+        raise ValueError(f"Tool {tool_name}: sqlite tools run on their own connection pool and cannot use an executor")
+    query_name = python_identifier("query", tool_name, upper=True)
+    return query_name, render_sqlite_query(query_name, tool, f"Tool {tool_name}")
+
+
+def render_sqlite_definition(resource: dict) -> str:
+    """Render the catalog entry of a sqlite resource"""
+    sqlite_settings(resource, f"Resource {resource.get('uri', 'resource://example')}")
+    return SQLITE_RESOURCE_DEFINITION.render(
+        res_uri=str(resource.get("uri", "resource://example")),
+        res_name=str(resource.get("name", "Example Resource")),
+        res_desc=str(resource.get("description", "Example resource"))
+    )
+
+
+def render_sqlite_function(resource: dict, cache_decorator: str) -> str:
+    """Render the query constant and routed function of a sqlite resource"""
+    res_uri = str(resource.get("uri", "resource://example"))
+    prefix, uri_pattern = uri_route(res_uri)
+    query_name = python_identifier("query", res_uri, upper=True)
+    return SQLITE_RESOURCE_FUNCTION.render(
+        query=render_sqlite_query(query_name, resource, f"Resource {res_uri}", uri_pattern),
+        query_name=query_name,
+        prefix_literal=encode_string(prefix),
+        cache_decorator=cache_decorator,
+        func_name=python_identifier("resource", res_uri),
+        res_doc=encode_string(str(resource.get("description", "Example resource")))
+    )
+
+
+def render_sqlite_runtime(features) -> str:
+    """Render the SQLite pool runtime, or nothing if no resource or tool uses it"""
+    return SQLITE_RUNTIME.render() if "sqlite" in features else ""
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Template Engine - A tiny compiled template engine for MCP code emission.
+Templates are parsed once (usually at import time) into literal chunks and
+named slots, then compiled into a plain Python function that joins them.
+"""
+
+import json
+import math
+import re
+import zlib
+from typing import Any, Callable, Iterator, Optional
+
+# Placeholder syntax: {{field_name}} (no spaces, identifier characters only)
+FIELD_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+# C-accelerated JSON string encoder (the same one json.dumps uses). Its output
+# is also a valid Python string literal, which makes it safe for emitted code.
+encode_string = json.encoder.encode_basestring_ascii
+
+IDENTIFIER_UNSAFE = re.compile(r"[^0-9A-Za-z_]")
+
+# Numeric range keywords a parameter may declare, copied into its inputSchema
+RANGE_KEYWORDS = ("minimum", "maximum")
+
+
+def range_bounds(param: dict) -> dict:
+    """
+    Return the minimum/maximum bounds a parameter declares.
+
+    Raises:
+        ValueError: If a bound is not a finite number (NaN and infinities have
+            no JSON or Python literal to publish or check them with)
+    """
+    bounds = {}
+    for key in RANGE_KEYWORDS:
+        bound = param.get(key)
+        if bound is None:
+            continue
+        if type(bound) not in (int, float) or not math.isfinite(bound):
+            raise ValueError(f"Parameter '{param.get('name')}': {key} must be a finite number, got {bound!r}")
+        bounds[key] = bound
+    return bounds
+
+
+class Template:
+    """A text template compiled once into a render function"""
+
+    def __init__(self, source: str):
+        self.source = source
+
+        parts = FIELD_PATTERN.split(source)
+        self.literals = tuple(parts[0::2])
+        self.fields = tuple(parts[1::2])
+        self._render = self._compile()
+
+    def _compile(self):
+        """Compile the parsed template into a single join expression"""
+        items = []
+        for index, literal in enumerate(self.literals):
+            if literal:
+                items.append(f"_L[{index}]")
+            if index < len(self.fields):
+                items.append(f"_c[{self.fields[index]!r}]")
+
+        source = f"def _render(_c):\n    return ''.join(({', '.join(items)},))\n"
+        namespace = {"_L": self.literals}
+        exec(compile(source, "<template>", "exec"), namespace)
+        return namespace["_render"]
+
+    def render(self, **context: str) -> str:
+        """Render the template with the given field values"""
+        return self._render(context)
+
+    def render_map(self, context: dict) -> str:
+        """Render the template from an existing mapping of field values"""
+        return self._render(context)
+
+    def stream(self, write: Callable[[str], Any], context: dict) -> None:
+        """
+        Write the template chunk by chunk instead of building one string.
+
+        Field values may be strings or iterables of strings; iterables are
+        consumed lazily, so large sections never exist in memory at once.
+        """
+        for chunk in self.iter_chunks(context):
+            write(chunk)
+
+    def iter_chunks(self, context: dict) -> Iterator[str]:
+        """Yield the rendered template chunk by chunk (see stream)"""
+        literals = self.literals
+        for index, field in enumerate(self.fields):
+            if literals[index]:
+                yield literals[index]
+            value = context[field]
+            if isinstance(value, str):
+                yield value
+            else:
+                yield from value
+        if literals[-1]:
+            yield literals[-1]
+
+    def __repr__(self) -> str:
+        return f"Template(fields={self.fields!r})"
+
+
+def render_input_schema(params: list[dict]) -> str:
+    """
+    Render a tool inputSchema exactly as json.dumps(schema, indent=16) would.
+
+    json.dumps falls back to the pure-Python encoder whenever indent is set,
+    which dominates generation time for large configs. The schema shape is
+    fixed, so the layout is emitted directly and only the leaf strings go
+    through the C string encoder.
+    """
+    properties = {
+        p["name"]: (p.get("type", "string"), p.get("description", ""))
+        for p in params
+    }
+    required = [p["name"] for p in params if p.get("required", False)]
+    enums = {p["name"]: p["enum"] for p in params if p.get("enum") is not None}
+    bounds = {}
+    for p in params:
+        param_bounds = range_bounds(p)
+        if param_bounds:
+            bounds[p["name"]] = param_bounds
+
+    # Enums, ranges and anything that is not a plain string take the generic (slow) path
+    if enums or bounds:
+        return _dump_input_schema(properties, required, enums, bounds)
+    for key, (param_type, param_desc) in properties.items():
+        if not (type(key) is str and type(param_type) is str and type(param_desc) is str):
+            return _dump_input_schema(properties, required)
+    for key in required:
+        if type(key) is not str:
+            return _dump_input_schema(properties, required)
+
+    if properties:
+        body = ",\n".join([
+            f'                                {encode_string(key)}: {{\n'
+            f'                                                "type": {encode_string(param_type)},\n'
+            f'                                                "description": {encode_string(param_desc)}\n'
+            f'                                }}'
+            for key, (param_type, param_desc) in properties.items()
+        ])
+        properties_json = "{\n" + body + "\n                }"
+    else:
+        properties_json = "{}"
+
+    if required:
+        body = ",\n".join([f"                                {encode_string(key)}" for key in required])
+        required_json = "[\n" + body + "\n                ]"
+    else:
+        required_json = "[]"
+
+    return (
+        '{\n                "type": "object",\n'
+        f'                "properties": {properties_json},\n'
+        f'                "required": {required_json}\n'
+        '}'
+    )
+
+
+def _dump_input_schema(properties: dict, required: list, enums: Optional[dict] = None,
+                       bounds: Optional[dict] = None) -> str:
+    """Generic inputSchema rendering through json.dumps"""
+    enums = enums or {}
+    bounds = bounds or {}
+    schema: dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            key: {
+                "type": param_type, "description": param_desc,
+                **({"enum": enums[key]} if key in enums else {}), **bounds.get(key, {})
+            }
+            for key, (param_type, param_desc) in properties.items()
+        },
+        "required": required
+    }
+    return json.dumps(schema, indent=16)
+
+
+def python_identifier(prefix: str, name: str, upper: bool = False) -> str:
+    """
+    Derive a stable Python identifier from an arbitrary config name.
+
+    Names that need sanitizing get a CRC suffix, so e.g. 'get-data' and
+    'get_data' never collide and the result does not depend on item order.
+    With upper=True the identifier is an upper-case constant name; names that
+    upper-casing changes get the suffix too, so 'Users' and 'users' stay apart.
+    """
+    name = str(name)
+    identifier = IDENTIFIER_UNSAFE.sub("_", name)
+    if identifier != name or (upper and identifier.upper() != identifier):
+        identifier = f"{identifier}_{zlib.crc32(name.encode('utf-8')):08x}"
+    identifier = f"{prefix}_{identifier}"
+    return identifier.upper() if upper else identifier
@@ -5,22 +5,68 @@ Creates example servers to verify the generator works correctly
 """
 
 import asyncio
+import base64
+import contextlib
+import gc
+import io
 import json
+import os
 import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Optional
 import importlib.util
 
 # Add parent directory to path to import the server module
 sys.path.insert(0, str(Path(__file__).parent))
 
 # Mock MCP imports since we only need to test template generation
+class MockType:
+    def __init__(self, **fields): self.__dict__.update(fields)
+
+def strict_model(name: str, *required: str):
+    """Mock of an mcp.types model that, like the pydantic original, fails without its required fields"""
+    def __init__(self, **fields):
+        missing = [field for field in required if field not in fields]
+        if missing:
+            raise TypeError(f"{name} is missing required fields {missing}")
+        self.__dict__.update(fields)
+    return type(name, (MockType,), {"__init__": __init__})
+
+# Module-level names, so results of tools offloaded to a process pool can be pickled
+Tool = strict_model("Tool", "name", "inputSchema")
+TextContent = strict_model("TextContent", "type", "text")
+Resource = strict_model("Resource", "uri", "name")
+EmbeddedResource = strict_model("EmbeddedResource", "type", "resource")
+ReadResourceContents = strict_model("ReadResourceContents", "content", "mime_type")
+
+class ListToolsRequest(MockType): pass
+class ListResourcesRequest(MockType): pass
+class ListPromptsRequest(MockType): pass
+class ServerResult:
+    def __init__(self, root): self.root = root
+class McpError(Exception):
+    def __init__(self, error): super().__init__(error.message); self.error = error
+
 class MockServer:
-    def __init__(self, name): pass
-    def list_tools(self): return lambda f: f
-    def call_tool(self): return lambda f: f
-    def list_resources(self): return lambda f: f
+    def __init__(self, name): self.request_handlers = {}
+    def _listing(self, request_type):
+        def decorator(func):
+            async def handler(request): return await func()
+            self.request_handlers[request_type] = handler
+            return func
+        return decorator
+    def list_tools(self): return self._listing(ListToolsRequest)
+    def call_tool(self, **options): return lambda f: f
+    def list_resources(self): return self._listing(ListResourcesRequest)
     def read_resource(self): return lambda f: f
-    def list_prompts(self): return lambda f: f
+    def subscribe_resource(self): return lambda f: f
+    def unsubscribe_resource(self): return lambda f: f
+    def get_capabilities(self, *args): return MockType(resources=MockType(subscribe=False))
+    def list_prompts(self): return self._listing(ListPromptsRequest)
     def get_prompt(self): return lambda f: f
 
 sys.modules['mcp'] = type(sys)('mcp')
@@ -28,15 +74,98 @@ sys.modules['mcp.server'] = type(sys)('mcp.server')
 sys.modules['mcp.server'].Server = MockServer
 sys.modules['mcp.server.stdio'] = type(sys)('mcp.server.stdio')
 sys.modules['mcp.server.stdio'].stdio_server = lambda: None
+sys.modules['mcp.server.lowlevel'] = type(sys)('mcp.server.lowlevel')
+sys.modules['mcp.server.lowlevel.helper_types'] = type(sys)('mcp.server.lowlevel.helper_types')
+sys.modules['mcp.server.lowlevel.helper_types'].ReadResourceContents = ReadResourceContents
 sys.modules['mcp.types'] = type(sys)('mcp.types')
-sys.modules['mcp.types'].Tool = object
-sys.modules['mcp.types'].TextContent = object
-sys.modules['mcp.types'].ImageContent = object
-sys.modules['mcp.types'].EmbeddedResource = object
-sys.modules['mcp.types'].LoggingLevel = object
+sys.modules['mcp.types'].Tool = Tool
+sys.modules['mcp.types'].TextContent = TextContent
+sys.modules['mcp.types'].ImageContent = MockType
+sys.modules['mcp.types'].Resource = Resource
+sys.modules['mcp.types'].EmbeddedResource = EmbeddedResource
+sys.modules['mcp.types'].LoggingLevel = MockType
+sys.modules['mcp.types'].ListToolsRequest = ListToolsRequest
+sys.modules['mcp.types'].ListResourcesRequest = ListResourcesRequest
+sys.modules['mcp.types'].ListPromptsRequest = ListPromptsRequest
+sys.modules['mcp.types'].ListToolsResult = MockType
+sys.modules['mcp.types'].ListResourcesResult = MockType
+sys.modules['mcp.types'].ListPromptsResult = MockType
+sys.modules['mcp.types'].ServerResult = ServerResult
+sys.modules['mcp.types'].ErrorData = MockType
+sys.modules['mcp.types'].INVALID_PARAMS = -32602
+sys.modules['mcp.shared'] = type(sys)('mcp.shared')
+sys.modules['mcp.shared.exceptions'] = type(sys)('mcp.shared.exceptions')
+sys.modules['mcp.shared.exceptions'].McpError = McpError
 
 # Now import the server module
-from server import MCPTemplate
+from server import MCPTemplate, MCPGenerator
+from template_engine import Template, python_identifier, render_input_schema
+from validator_templates import validator_name
+import generation_cache
+from generation_cache import GenerationCache, cache_key
+import server as server_module
+from incremental import FragmentCache, diff_configs
+import server_templates
+from archive import iter_zip, server_archive_files
+from batch import generate_batch, batch_archive_files, get_process_pool, pool_size, render_server_sharded, shutdown_process_pool
+
+
+# Loads a generated server against the installed mcp package in a fresh process and
+# reports what its registered request handlers answer
+SDK_PROBE = """
+import asyncio, importlib.util, json, logging, sys
+import mcp.types as types
+
+async def probe(path, requests):
+    spec = importlib.util.spec_from_file_location("probed_server", path)
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    handlers = server.app.request_handlers
+    report = {"warnings": []}
+    recorder = logging.Handler(logging.WARNING)
+    recorder.emit = lambda record: report["warnings"].append(record.getMessage())
+    logging.getLogger("mcp").addHandler(recorder)
+    # Calls go first: a call that arrives before any listing is what fills the SDK's tool cache on demand
+    for name, arguments in requests.get("calls", []):
+        request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments))
+        result = await handlers[types.CallToolRequest](request)
+        report.setdefault("calls", []).append([result.root.isError, [content.text for content in result.root.content]])
+    if types.ListToolsRequest in handlers:
+        result = await handlers[types.ListToolsRequest](types.ListToolsRequest(method="tools/list"))
+        report["tools"] = [tool.name for tool in result.root.tools]
+    if types.ListResourcesRequest in handlers:
+        result = await handlers[types.ListResourcesRequest](types.ListResourcesRequest(method="resources/list"))
+        report["resources"] = [str(resource.uri) for resource in result.root.resources]
+    for uri in requests.get("reads", []):
+        request = types.ReadResourceRequest(method="resources/read", params=types.ReadResourceRequestParams(uri=uri))
+        result = await handlers[types.ReadResourceRequest](request)
+        report.setdefault("reads", {})[uri] = [[content.mimeType, content.text] for content in result.root.contents]
+    print(json.dumps(report))
+
+asyncio.run(probe(sys.argv[1], json.loads(sys.argv[2])))
+"""
+
+
+def probe_with_sdk(files: dict, directory: Path, requests: Optional[dict] = None) -> dict:
+    """
+    Write a generated server into directory and probe it with the real mcp package.
+    requests may list "reads" (URIs) and "calls" ([name, arguments] pairs) to send.
+    """
+    import subprocess
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "server.py"
+    path.write_text(files["server.py"])
+    result = subprocess.run([sys.executable, "-c", SDK_PROBE, str(path), json.dumps(requests or {})], capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def load_generated(code: str, module_name: str = "generated_server"):
+    """Execute generated server code as a module (against the mocked mcp package)"""
+    module = type(sys)(module_name)
+    module.__file__ = str(Path(tempfile.gettempdir()) / f"{module_name}.py")
+    exec(compile(code, f"{module_name}.py", "exec"), module.__dict__)
+    return module
 
 
 async def test_generate_calculator():
@@ -260,6 +389,1725 @@ async def test_validation():
     return True
 
 
+async def test_template_engine():
+    """Test the compiled template engine against the reference encoders"""
+    print("\n" + "=" * 60)
+    print("TEST 5: Compiled Template Engine")
+    print("=" * 60)
+
+    try:
+        template = Template("Hello {{name}}, {{greeting}} {{name}}!")
+        assert template.fields == ("name", "greeting", "name")
+        assert template.render(name="MCP", greeting="welcome") == "Hello MCP, welcome MCP!"
+
+        parameter_sets = [
+            [],
+            [{"name": "query", "type": "string", "description": "Search query", "required": True}],
+            [{"name": "café", "description": 'quote " and\nnewline'}, {"name": "café", "type": "number"}],
+            [{"name": "flags", "type": ["string", "null"], "required": True}]
+        ]
+        for params in parameter_sets:
+            schema = {
+                "type": "object",
+                "properties": {
+                    p["name"]: {"type": p.get("type", "string"), "description": p.get("description", "")}
+                    for p in params
+                },
+                "required": [p["name"] for p in params if p.get("required", False)]
+            }
+            assert render_input_schema(params) == json.dumps(schema, indent=16)
+
+        files = MCPTemplate.full_server("engine-server", "Engine test", {
+            "tools": [{"name": "search", "description": "Search", "parameters": parameter_sets[1]}],
+            "resources": [{"uri": "data://x", "name": "X", "description": "X data"}],
+            "prompts": [{"name": "analyze", "description": "Analyze"}]
+        })
+        compile(files["server.py"], "server.py", "exec")
+
+        # The benchmark baseline renders the same servers; run() raises if the outputs differ
+        import benchmark_templates
+        results = benchmark_templates.run([10, 200], 0.01)
+        assert [row["template"] for row in results] == ["basic_tool_server", "full_server"] * 2
+
+        print("\n✅ Template engine output matches the reference encoders")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_generation_cache():
+    """Test the content-addressed generation cache"""
+    print("\n" + "=" * 60)
+    print("TEST 6: Generation Cache")
+    print("=" * 60)
+
+    try:
+        config = {"tools": [{"name": "add", "description": "Add", "parameters": []}]}
+        reordered = {"tools": [{"parameters": [], "description": "Add", "name": "add"}]}
+        key = cache_key("calc", "Calculator", "tool", config)
+        assert key == cache_key("calc", "Calculator", "tool", reordered)
+        assert key != cache_key("calc", "Calculator", "full", config)
+        # Keys that do not shape the server (as MCPGenerator configs carry them) leave the key alone
+        assert key == cache_key("calc", "Calculator", "tool", {**config, "name": "calc", "type": "tool", "prompts": []})
+        assert key != cache_key("calc", "Calculator", "tool", {**config, "metrics": True})
+        # Editing a template changes every key, so older generated files are never served
+        source_version = generation_cache.TEMPLATE_VERSION
+        try:
+            generation_cache.TEMPLATE_VERSION = "0" * 64
+            assert key != cache_key("calc", "Calculator", "tool", config)
+        finally:
+            generation_cache.TEMPLATE_VERSION = source_version
+        assert source_version == generation_cache.template_version()
+
+        # Byte-bounded LRU eviction
+        cache = GenerationCache(max_bytes=100)
+        cache.put("a", {"f": "x" * 40})
+        cache.put("b", {"f": "x" * 40})
+        assert cache.get("a") is not None
+        cache.put("c", {"f": "x" * 40})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        stats = cache.stats()
+        assert stats["hits"] == 3 and stats["misses"] == 1 and stats["evictions"] == 1
+        assert stats["bytes"] <= 100
+
+        # Disk tier survives a fresh in-memory cache
+        with tempfile.TemporaryDirectory() as cache_dir:
+            GenerationCache(cache_dir=cache_dir).put(key, {"server.py": "print('hi')"})
+            cold = GenerationCache(cache_dir=cache_dir)
+            assert cold.get(key) == {"server.py": "print('hi')"}
+            assert cold.stats()["disk_hits"] == 1
+
+        first = MCPTemplate.generate("calc", "Calculator", "tool", config)
+        second = MCPTemplate.generate("calc", "Calculator", "tool", reordered)
+        assert first == second == MCPTemplate.basic_tool_server("calc", "Calculator", config["tools"])
+
+        # MCPGenerator shares the entries of the MCP tool and the web UI
+        hits = server_module.generation_cache.hits
+        generated = MCPGenerator().generate_from_config({**config, "name": "calc", "description": "Calculator", "type": "tool"})
+        assert generated == first["server.py"] and server_module.generation_cache.hits == hits + 1
+
+        print("\n✅ Generation cache hits, evicts and persists correctly")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_incremental_regeneration():
+    """Test that regenerate only re-renders changed items"""
+    print("\n" + "=" * 60)
+    print("TEST 7: Incremental Regeneration")
+    print("=" * 60)
+
+    try:
+        previous = {
+            "name": "big-server",
+            "description": "Many tools",
+            "type": "full",
+            "tools": [
+                {"name": f"tool_{i}", "description": f"Tool {i}", "parameters": [{"name": "x", "type": "number"}]}
+                for i in range(50)
+            ],
+            "resources": [{"uri": "data://a", "name": "A", "description": "A data"}],
+            "prompts": [{"name": "summarize", "description": "Summarize"}]
+        }
+        generator = MCPGenerator()
+        generator.regenerate({}, previous)
+        assert generator.fragments.rendered == 52
+
+        edited = json.loads(json.dumps(previous))
+        edited["tools"][10]["description"] = "Edited tool"
+        edited["tools"].append({"name": "tool_new", "description": "New tool", "parameters": []})
+        del edited["tools"][0]
+
+        code = generator.regenerate(previous, edited)
+        assert generator.fragments.rendered == 54
+        assert code == generator.generate_from_config(edited)
+        assert "tool_0" not in code and "Edited tool" in code
+
+        diff = diff_configs(previous, edited, "full")
+        assert diff["tools"]["added"] == ["tool_new"]
+        assert diff["tools"]["removed"] == ["tool_0"]
+        assert diff["tools"]["changed"] == ["tool_10"]
+        assert len(diff["tools"]["unchanged"]) == 48 and diff["prompts"]["unchanged"] == ["summarize"]
+
+        # The documented flow: generate_from_config fills the fragment cache, regenerate renders the edit only
+        generator = MCPGenerator()
+        readme_flow = dict(previous, name="readme-flow")
+        generator.generate_from_config(readme_flow)
+        assert generator.fragments.rendered == 52
+        code = generator.regenerate(readme_flow, dict(edited, name="readme-flow"))
+        assert (generator.fragments.rendered, generator.fragments.reused) == (54, 50), vars(generator.fragments)
+        assert code == generator.generate_from_config(dict(edited, name="readme-flow"))
+
+        # An identity that occurs twice cannot be paired up, so it is re-rendered
+        twice = dict(edited, tools=edited["tools"] + [dict(edited["tools"][0], description="Second copy")])
+        assert diff_configs(twice, twice, "full")["tools"]["changed"] == [edited["tools"][0]["name"]]
+        assert "Second copy" in generator.regenerate(twice, twice)
+
+        # Servers sharing a generator and a tool name keep their own fragments
+        generator = MCPGenerator()
+        server_a = {"name": "server-a", "type": "tool", "validate_arguments": False, "tools": [
+            {"name": "search", "description": "Search A", "parameters": [{"name": "query", "type": "string"}]}
+        ]}
+        server_b = dict(server_a, name="server-b", tools=[
+            {"name": "search", "description": "Search B", "parameters": [{"name": "page", "type": "integer"}]}
+        ])
+        generator.generate_from_config(server_a)
+        generator.generate_from_config(server_b)
+        code = generator.regenerate(server_a, dict(server_a, tools=server_a["tools"] + [{"name": "extra", "parameters": []}]))
+        assert "Search A" in code and "Search B" not in code and '"page"' not in code
+        # Within one scope, an edited item with the same identity is re-rendered, never reused
+        cache = FragmentCache()
+        cache.render("tool", "tools", server_a["tools"][0], server_templates.DEFAULT_OPTIONS)
+        assert "Search B" in cache.render("tool", "tools", server_b["tools"][0], server_templates.DEFAULT_OPTIONS)[0]
+
+        # discard finds an item's entries for every option set through the identity index, eviction included
+        cache = FragmentCache(max_entries=3)
+        tool = {"name": "t", "description": "T", "parameters": []}
+        for dispatch in ("chain", "dict"):
+            cache.render("tool", "tools", tool, dict(server_templates.DEFAULT_OPTIONS, dispatch=dispatch))
+        cache.render("tool", "tools", dict(tool, name="u"), server_templates.DEFAULT_OPTIONS)
+        cache.render("tool", "tools", dict(tool, name="v"), server_templates.DEFAULT_OPTIONS)
+        assert len(cache) == 3
+        cache.discard("tool", "tools", "t")
+        assert len(cache) == 2
+        cache.discard("tool", "tools", "u")
+        cache.discard("tool", "tools", "missing")
+        assert len(cache) == 1
+
+        print("\n✅ Regeneration re-rendered only the edited tools")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_streaming_output():
+    """Test that streamed output matches the dict-returning API"""
+    print("\n" + "=" * 60)
+    print("TEST 8: Streaming Writer")
+    print("=" * 60)
+
+    try:
+        config = {
+            "tools": [{"name": f"tool_{i}", "description": "Tool", "parameters": [{"name": "q"}]} for i in range(20)],
+            "resources": [{"uri": "data://a", "name": "A", "description": "A data", "type": "json"}],
+            "prompts": []
+        }
+        for server_type in ("tool", "resource", "full"):
+            expected = MCPTemplate.generate("stream-server", "Streaming", server_type, config)
+            buffer = io.StringIO()
+            MCPTemplate.stream("stream-server", "Streaming", server_type, config, buffer)
+            assert buffer.getvalue() == expected["server.py"]
+
+        # Stream every file straight into zip entries
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            written = server_templates.stream_files(
+                "stream-server", "Streaming", "full", config,
+                lambda filename: io.TextIOWrapper(zip_file.open(f"stream-server/{filename}", "w"), encoding="utf-8")
+            )
+        with zipfile.ZipFile(archive) as zip_file:
+            for filename in written:
+                content = zip_file.read(f"stream-server/{filename}").decode("utf-8")
+                assert content == expected[filename]
+
+        print("\n✅ Streamed output is identical to the generated files")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_in_memory_archive():
+    """Test building server zips straight from the in-memory files dict"""
+    print("\n" + "=" * 60)
+    print("TEST 9: In-Memory Archive")
+    print("=" * 60)
+
+    try:
+        files = MCPTemplate.generate("zip-server", "Zip test", "tool", {
+            "tools": [{"name": f"tool_{i}", "description": "Tool", "parameters": []} for i in range(2000)]
+        })
+        chunks = list(iter_zip(server_archive_files("zip-server", files)))
+        assert len(chunks) > 1
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+            assert zip_file.testzip() is None
+            for filename, content in files.items():
+                assert zip_file.read(f"zip-server/{filename}").decode("utf-8") == content
+
+        print("\n✅ Streamed zip round-trips every generated file")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_batch_generation():
+    """Test parallel batch generation on the process pool"""
+    print("\n" + "=" * 60)
+    print("TEST 10: Batch Generation")
+    print("=" * 60)
+
+    try:
+        jobs = [
+            {
+                "name": f"batch-server-{i}",
+                "description": f"Batch server {i}",
+                "server_type": "full",
+                "config": {"tools": [{"name": f"tool_{j}", "description": "Tool", "parameters": []} for j in range(100)]}
+            }
+            for i in range(4)
+        ]
+        jobs.append({"name": "broken", "description": "Bad type", "server_type": "nope"})
+        jobs.append(dict(jobs[0]))
+
+        cache = GenerationCache()
+        results = await generate_batch(jobs, cache=cache)
+        assert [result["success"] for result in results] == [True, True, True, True, False, False]
+        assert results[5]["message"].startswith("Duplicate server name")
+        for job, result in zip(jobs[:4], results):
+            assert result["files"] == MCPTemplate.full_server(job["name"], job["description"], job["config"])
+
+        archive_files = batch_archive_files(results)
+        assert len(archive_files) == 4 * 3 and "batch-server-3/server.py" in archive_files
+
+        # A second run is served entirely from the cache
+        results = await generate_batch(jobs[:4], cache=cache)
+        assert all(result["message"] == "Served from cache" for result in results)
+
+        # A worker that dies breaks the pool; the next batch runs on a fresh one
+        killed = get_process_pool().submit(os._exit, 1)
+        try:
+            killed.result()
+            raise AssertionError("The worker survived os._exit")
+        except BrokenProcessPool:
+            pass
+        results = await generate_batch([dict(job, name=f"{job['name']}-again") for job in jobs[:4]])
+        assert all(result["success"] for result in results), results
+
+        for setting, expected in (("3", 3), ("", os.cpu_count() or 1), ("0", os.cpu_count() or 1), ("two", None), ("-1", None)):
+            os.environ["MCP_GENERATOR_WORKERS"] = setting
+            try:
+                assert pool_size() == expected, setting
+            except ValueError as e:
+                assert expected is None and "MCP_GENERATOR_WORKERS" in str(e) and repr(setting) in str(e), e
+            finally:
+                del os.environ["MCP_GENERATOR_WORKERS"]
+
+        print("\n✅ Batch generated every valid server in order")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+    finally:
+        shutdown_process_pool()
+
+
+async def test_sharded_rendering():
+    """Test that sharded rendering is byte-identical to serial rendering"""
+    print("\n" + "=" * 60)
+    print("TEST 11: Sharded Rendering")
+    print("=" * 60)
+
+    try:
+        config = {
+            "tools": [{"name": f"tool_{i}", "description": f"Tool {i}", "parameters": [{"name": "q"}]} for i in range(1500)],
+            "resources": [{"uri": f"data://r{i}", "name": f"R{i}", "description": "R"} for i in range(600)],
+            "prompts": [{"name": f"prompt_{i}", "description": "P"} for i in range(10)]
+        }
+        for server_type in ("tool", "resource", "full"):
+            serial = server_templates.render_server("shard-server", "Sharded", server_type, config)
+            sharded = render_server_sharded("shard-server", "Sharded", server_type, config, workers=2)
+            assert sharded == serial
+
+        killed = get_process_pool().submit(os._exit, 1)
+        try:
+            killed.result()
+        except BrokenProcessPool:
+            pass
+        assert render_server_sharded("shard-server", "Sharded", "full", config, workers=2) == serial, "A broken pool was reused"
+
+        print("\n✅ Sharded output matches serial rendering byte for byte")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+    finally:
+        shutdown_process_pool()
+
+
+async def test_benchmark_gate():
+    """Test the benchmark suite and its regression gate"""
+    print("\n" + "=" * 60)
+    print("TEST 12: Benchmark Regression Gate")
+    print("=" * 60)
+
+    try:
+        import benchmark_suite
+
+        results = [benchmark_suite.measure("stream", "full", 10, repeat=1)]
+        assert results[0]["scenario"] == "stream/full/10"
+        assert results[0]["output_bytes"] > 0 and results[0]["peak_memory_bytes"] > 0
+
+        baseline = [{"scenario": "stream/full/10", "wall_time_s": 1.0, "peak_memory_bytes": 1000, "output_bytes": 1000}]
+        current = [{"scenario": "stream/full/10", "wall_time_s": 1.05, "peak_memory_bytes": 1200, "output_bytes": 1000}]
+        regressions = benchmark_suite.compare(current, baseline, threshold=10, min_time_delta=0.002)
+        assert len(regressions) == 1 and "peak_memory_bytes" in regressions[0]
+        assert benchmark_suite.compare(current, baseline, threshold=25, min_time_delta=0.002) == []
+
+        print("\n✅ Regression gate flags only scenarios above the threshold")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_dict_dispatch():
+    """Test that dict dispatch routes every tool like the if/elif chain"""
+    print("\n" + "=" * 60)
+    print("TEST 13: Dict Dispatch")
+    print("=" * 60)
+
+    try:
+        tools = [{"name": f"tool_{i}", "description": f"Tool {i}", "parameters": [{"name": "q"}]} for i in range(200)]
+        tools.append({"name": "get-data", "description": "Dashed name", "parameters": []})
+
+        for server_type in ("tool", "full"):
+            chain = load_generated(
+                MCPTemplate.generate("chain-server", "Chain", server_type, {"tools": tools})["server.py"]
+            )
+            files = MCPTemplate.generate("dict-server", "Dict", server_type, {"tools": tools, "dispatch": "dict"})
+            dispatch = load_generated(files["server.py"])
+
+            assert list(dispatch.TOOL_HANDLERS) == [tool["name"] for tool in tools]
+            assert "if name ==" not in files["server.py"]
+            for name in ("tool_0", "tool_199", "get-data"):
+                expected = await chain.call_tool(name, {"q": 1})
+                result = await dispatch.call_tool(name, {"q": 1})
+                assert result[0].text == expected[0].text
+            try:
+                await dispatch.call_tool("missing", {})
+                raise AssertionError("Unknown tool was dispatched")
+            except ValueError as e:
+                assert "Unknown tool: missing" in str(e)
+
+            compile(files["benchmark_dispatch.py"], "benchmark_dispatch.py", "exec")
+            assert "benchmark_dispatch.py" in files["README.md"]
+
+        result = MCPGenerator().generate_server("bad-dispatch", "Bad", "tool", "./test-output", {"dispatch": "switch"})
+        assert not result["success"] and "dispatch" in result["message"]
+
+        print("\n✅ Dict dispatch matches chain dispatch for every tool")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_resource_router():
+    """Test longest-prefix resource routing at scale"""
+    print("\n" + "=" * 60)
+    print("TEST 14: Resource Router")
+    print("=" * 60)
+
+    try:
+        resources = [{"uri": f"data://r{i}", "name": f"R{i}", "description": "R"} for i in range(10_000)]
+        resources.append({"uri": "data://r1", "name": "Duplicate", "description": "Declared twice"})
+
+        for server_type in ("resource", "full"):
+            files = MCPTemplate.generate("router-server", "Router", server_type, {"resources": resources})
+            assert "uri.startswith" not in files["server.py"]
+            generated = load_generated(files["server.py"])
+
+            for resource in resources[:-1]:
+                handler = generated.RESOURCE_ROUTER.match(resource["uri"] + "/item")
+                assert handler.__name__ == python_identifier("resource", resource["uri"])
+
+            # Overlapping prefixes resolve to the longest one, not the first declared
+            result = await generated.read_resource("data://r105/x")
+            assert result[0].content in ("Sample data for R105", "Resource R105 data")
+            assert result[0].mime_type == "text/plain"
+            # A prefix declared twice keeps its first declaration
+            result = await generated.read_resource("data://r1")
+            assert result[0].content in ("Sample data for R1", "Resource R1 data")
+            # The SDK hands over pydantic URLs, which give a bare file:// host a "/" path
+            assert generated.request_uri("file://notes/?chunk=2") == "file://notes?chunk=2"
+            assert generated.request_uri("file://notes/") == "file://notes"
+            assert generated.request_uri("file:///tmp/notes/") == "file:///tmp/notes/"
+            assert generated.request_uri("db://users/") == "db://users/"
+            try:
+                await generated.read_resource("other://r1")
+                raise AssertionError("Unknown resource was routed")
+            except ValueError as e:
+                assert "Unknown resource" in str(e)
+
+        print("\n✅ 10k resources route to their longest declared prefix")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_import_time_catalogs():
+    """Test that listings are built once and served from the cache"""
+    print("\n" + "=" * 60)
+    print("TEST 15: Import-Time Catalogs")
+    print("=" * 60)
+
+    try:
+        config = {
+            "tools": [{"name": f"tool_{i}", "description": f"Tool {i}", "parameters": [{"name": "q"}]} for i in range(100)],
+            "resources": [{"uri": f"data://r{i}", "name": f"R{i}", "description": "R"} for i in range(10)],
+            "prompts": [{"name": f"prompt_{i}", "description": "P"} for i in range(3)]
+        }
+        generated = load_generated(MCPTemplate.generate("catalog-server", "Catalogs", "full", config)["server.py"])
+
+        assert await generated.list_tools() is generated.TOOLS
+        assert [tool.name for tool in generated.TOOLS] == [tool["name"] for tool in config["tools"]]
+        assert len(generated.RESOURCES) == 10 and len(generated.PROMPTS) == 3
+
+        for request_type, catalog in (
+            (ListToolsRequest, generated.TOOLS),
+            (ListResourcesRequest, generated.RESOURCES),
+            (ListPromptsRequest, generated.PROMPTS)
+        ):
+            handler = generated.app.request_handlers[request_type]
+            first = await handler(request_type())
+            assert first is catalog and await handler(request_type()) is first
+
+        empty = load_generated(MCPTemplate.generate("empty-server", "Empty", "full", {})["server.py"])
+        assert empty.TOOLS == [] and empty.RESOURCES == [] and empty.PROMPTS == []
+
+        print("\n✅ Catalogs are built at import and listing results are reused")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_compiled_validators():
+    """Test the generated per-tool argument validators"""
+    print("\n" + "=" * 60)
+    print("TEST 16: Compiled Validators")
+    print("=" * 60)
+
+    try:
+        tool = {
+            "name": "convert",
+            "description": "Convert a temperature",
+            "parameters": [
+                {"name": "value", "type": "number", "required": True},
+                {"name": "unit", "type": "string", "enum": ["celsius", "fahrenheit"], "required": True},
+                {"name": "precision", "type": "integer"},
+                {"name": "verbose", "type": "boolean"}
+            ]
+        }
+        files = MCPTemplate.generate("validated-server", "Validated", "tool", {"tools": [tool]})
+        generated = load_generated(files["server.py"])
+        validate = generated.validate_convert
+
+        assert validate({"value": "21.5", "unit": "celsius", "precision": 2.0, "verbose": "true"}) == {
+            "value": 21.5, "unit": "celsius", "precision": 2, "verbose": True
+        }
+        arguments = {"value": 3, "unit": "fahrenheit"}
+        assert validate(arguments) == arguments and validate(arguments) is not arguments
+
+        for bad, message in (
+            ({"unit": "celsius"}, "missing required argument 'value'"),
+            ({"value": "hot", "unit": "celsius"}, "'value' must be a number"),
+            ({"value": 1, "unit": "kelvin"}, "must be one of celsius, fahrenheit"),
+            ({"value": 1, "unit": "celsius", "precision": 1.5}, "'precision' must be an integer")
+        ):
+            try:
+                await generated.call_tool("convert", bad)
+                raise AssertionError(f"Accepted invalid arguments {bad}")
+            except generated.ToolArgumentError as e:
+                assert message in str(e), str(e)
+
+        schema = json.loads(render_input_schema(tool["parameters"]))
+        assert schema["properties"]["unit"]["enum"] == ["celsius", "fahrenheit"]
+
+        days = {"name": "days", "type": "integer", "minimum": 1, "maximum": 14}
+        bounded = load_generated(MCPTemplate.generate("bounded", "Bounded", "tool", {"tools": [
+            {"name": "forecast", "parameters": [days]}
+        ]})["server.py"], "bounded_server")
+        assert bounded.validate_forecast({"days": "14"}) == {"days": 14}
+        for value in (0, 15):
+            try:
+                bounded.validate_forecast({"days": value})
+                raise AssertionError(f"days={value} passed its bounds")
+            except bounded.ToolArgumentError:
+                pass
+        # Bounds without a JSON or Python literal are rejected when the server is generated
+        for bound in (float("nan"), float("inf"), float("-inf"), "5"):
+            try:
+                MCPTemplate.generate("bad-bounds", "Bad", "tool", {"tools": [
+                    {"name": "forecast", "parameters": [dict(days, maximum=bound)]}
+                ]})
+                raise AssertionError(f"maximum {bound!r} was accepted")
+            except ValueError as e:
+                assert "maximum must be a finite number" in str(e), str(e)
+
+        # Tools whose names differ only by case keep their own enum constants
+        cased = load_generated(MCPTemplate.generate("cased", "Cased", "tool", {"tools": [
+            {"name": "Convert", "parameters": [{"name": "unit", "type": "string", "enum": ["K"]}]},
+            {"name": "convert", "parameters": [{"name": "unit", "type": "string", "enum": ["C"]}]}
+        ]})["server.py"], "cased_validated_server")
+        validators = [getattr(cased, validator_name(name)) for name in ("Convert", "convert")]
+        assert validators[0]({"unit": "K"}) == {"unit": "K"} and validators[1]({"unit": "C"}) == {"unit": "C"}
+
+        unvalidated = MCPTemplate.generate("plain-server", "Plain", "tool", {"tools": [tool], "validate_arguments": False})
+        assert "ToolArgumentError" not in unvalidated["server.py"]
+
+        import benchmark_validation
+        results = benchmark_validation.run(calls=2000)
+        assert [row["case"] for row in results] == ["typed", "coerced"]
+        assert results[0]["speedup"] > 1
+
+        print("\n✅ Validators coerce, reject and beat generic schema validation")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_tool_result_cache():
+    """Test per-tool LRU/TTL caching and in-flight call merging"""
+    print("\n" + "=" * 60)
+    print("TEST 17: Tool Result Cache")
+    print("=" * 60)
+
+    try:
+        tools = [
+            {"name": "add", "description": "Add", "cache": {"ttl": 0.2, "max_entries": 2},
+             "parameters": [{"name": "a", "type": "number", "required": True}, {"name": "b", "type": "number", "required": True}]},
+            {"name": "now", "description": "Uncached", "parameters": []}
+        ]
+        for dispatch in ("chain", "dict"):
+            files = MCPTemplate.generate("cached-server", "Cached", "full", {"tools": tools, "dispatch": dispatch})
+            generated = load_generated(files["server.py"])
+
+            # Count executions of tool bodies through the TextContent they build
+            executions = []
+            generated.TextContent = lambda **fields: executions.append(fields) or MockType(**fields)
+
+            results = await asyncio.gather(*[generated.call_tool("add", {"a": 1, "b": 2}) for _ in range(5)])
+            assert len(executions) == 1 and all(result is results[0] for result in results)
+
+            # Canonicalized arguments: coerced values and key order share one entry
+            await generated.call_tool("add", {"b": "2", "a": "1"})
+            assert len(executions) == 1
+
+            await generated.call_tool("add", {"a": 2, "b": 2})
+            await generated.call_tool("add", {"a": 3, "b": 2})
+            stats = generated.TOOL_CACHES["add"].stats()
+            assert stats["misses"] == 3 and stats["merged"] == 4 and stats["hits"] == 1 and stats["evictions"] == 1
+
+            await asyncio.sleep(0.25)
+            await generated.call_tool("add", {"a": 3, "b": 2})
+            assert len(executions) == 4
+
+            report = await generated.call_tool("__cache_stats__", {})
+            assert json.loads(report[0].text)["add"]["misses"] == 4
+            assert "__cache_stats__" in [tool.name for tool in generated.TOOLS]
+            assert "now" not in generated.TOOL_CACHES
+
+        plain = MCPTemplate.generate("plain-server", "Plain", "tool", {"tools": tools[1:]})
+        assert "ToolResultCache" not in plain["server.py"] and "__cache_stats__" not in plain["server.py"]
+
+        result = MCPGenerator().generate_server("bad-cache", "Bad", "tool", "./test-output", {"tools": [{"name": "x", "cache": {"ttl": 0}}]})
+        assert not result["success"] and "ttl" in result["message"]
+
+        print("\n✅ Cached tools merge in-flight calls and honour TTL and LRU limits")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_executor_offload():
+    """Test concurrency limits and thread/process offloading"""
+    print("\n" + "=" * 60)
+    print("TEST 18: Executor Offload")
+    print("=" * 60)
+
+    generated = None
+    try:
+        tools = [
+            {"name": "slow", "description": "Blocking", "executor": "thread", "concurrency": 2, "max_queue": 1, "parameters": []},
+            {"name": "crunch", "description": "CPU heavy", "executor": "process", "parameters": [{"name": "n", "type": "integer"}]},
+            {"name": "fast", "description": "Inline", "parameters": []}
+        ]
+        files = MCPTemplate.generate("offload-server", "Offload", "tool", {"tools": tools})
+
+        # Import from a real file so the process pool can pickle work functions by reference
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "offload_server.py"
+            path.write_text(files["server.py"])
+            spec = importlib.util.spec_from_file_location("offload_server", path)
+            generated = importlib.util.module_from_spec(spec)
+            sys.modules["offload_server"] = generated
+            spec.loader.exec_module(generated)
+
+        def blocking_work(arguments):
+            time.sleep(0.3)
+            return [MockType(type="text", text="slow done")]
+        generated.work_slow = blocking_work
+
+        slow_calls = [asyncio.ensure_future(generated.call_tool("slow", {})) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        assert generated.TOOL_LIMITERS["slow"].stats()["running"] == 2
+
+        # The inline tool is unaffected while the blocking tool is saturated
+        start = time.perf_counter()
+        await generated.call_tool("fast", {})
+        assert time.perf_counter() - start < 0.05
+
+        outcomes = await asyncio.gather(*slow_calls, return_exceptions=True)
+        rejected = [outcome for outcome in outcomes if isinstance(outcome, generated.ToolBusyError)]
+        assert len(rejected) == 1 and generated.TOOL_LIMITERS["slow"].rejected == 1
+        assert sum(1 for outcome in outcomes if isinstance(outcome, list) and outcome[0].text == "slow done") == 3
+
+        result = await generated.call_tool("crunch", {"n": "7"})
+        assert result[0].text == "Executed crunch"
+
+        try:
+            MCPTemplate.generate("bad-server", "Bad", "tool", {"tools": [{"name": "x", "executor": "gpu"}]})
+            raise AssertionError("Unknown executor was accepted")
+        except ValueError as e:
+            assert "executor" in str(e)
+
+        print("\n✅ Limits queue and reject calls, and offloaded tools keep the loop free")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+    finally:
+        if generated is not None:
+            for executor in generated._executors.values():
+                executor.shutdown()
+        sys.modules.pop("offload_server", None)
+
+
+async def test_tool_deadlines():
+    """Test per-tool timeouts, their structured errors and cancellation"""
+    print("\n" + "=" * 60)
+    print("TEST 19: Tool Deadlines")
+    print("=" * 60)
+
+    generated = None
+    try:
+        tools = [
+            {"name": "fetch", "description": "Slow upstream", "executor": "thread", "timeout_ms": 50, "parameters": []},
+            {"name": "quick", "description": "Fast", "timeout_ms": 1000, "parameters": []}
+        ]
+        files = MCPTemplate.generate("deadline-server", "Deadlines", "tool", {"tools": tools, "dispatch": "dict"})
+        generated = load_generated(files["server.py"])
+
+        stopped_early = []
+
+        def slow_work(arguments):
+            for _ in range(100):
+                if generated.tool_cancelled():
+                    stopped_early.append(True)
+                    break
+                time.sleep(0.01)
+            return [MockType(type="text", text="late")]
+        generated.work_fetch = slow_work
+
+        try:
+            await generated.call_tool("fetch", {})
+            raise AssertionError("Slow tool did not time out")
+        except generated.ToolTimeoutError as e:
+            assert json.loads(str(e)) == {"error": "timeout", "tool": "fetch", "timeout_ms": 50}
+
+        await generated.call_tool("quick", {})
+        await asyncio.sleep(0.05)
+        assert stopped_early, "Worker thread was not told about the cancellation"
+
+        report = json.loads((await generated.call_tool("__timeout_stats__", {}))[0].text)
+        assert report["fetch"]["timeouts"] == 1 and report["fetch"]["calls"] == 1
+        assert report["quick"]["timeouts"] == 0 and report["quick"]["slowest_ms"] < 1000
+
+        try:
+            MCPTemplate.generate("bad-server", "Bad", "tool", {"tools": [{"name": "x", "timeout_ms": -5}]})
+            raise AssertionError("Negative timeout was accepted")
+        except ValueError as e:
+            assert "timeout_ms" in str(e)
+
+        print("\n✅ Timeouts raise structured errors, are counted and cancel worker threads")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+    finally:
+        if generated is not None:
+            for executor in generated._executors.values():
+                executor.shutdown()
+
+
+async def test_http_transport():
+    """Test the HTTP/SSE entry point and load-test recipe of HTTP-capable servers"""
+    print("\n" + "=" * 60)
+    print("TEST 20: HTTP Transport")
+    print("=" * 60)
+
+    try:
+        tools = [{"name": "ping", "description": "Ping", "parameters": []}]
+
+        stdio_files = MCPTemplate.generate("stdio-server", "Stdio", "tool", {"tools": tools})
+        assert "load_test.py" not in stdio_files and "create_http_app" not in stdio_files["server.py"]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = MCPGenerator().generate_server(
+                "http-server", "HTTP", "tool", tmp, {"tools": tools}, transport="both"
+            )
+            assert result["success"], result["message"]
+            output = Path(result["output_dir"])
+            code = (output / "server.py").read_text()
+            readme = (output / "README.md").read_text()
+            requirements = (output / "requirements.txt").read_text()
+            compile((output / "load_test.py").read_text(), "load_test.py", "exec")
+
+        assert "uvicorn" in requirements and "## Load Test" in readme and "--workers 4" in readme
+
+        generated = load_generated(code)
+        parser = generated.build_parser()
+        assert parser.parse_args([]).transport == "stdio"
+        args = parser.parse_args(["--transport", "http", "--workers", "4", "--keep-alive", "30"])
+        assert (args.transport, args.workers, args.keep_alive, args.port) == ("http", 4, 30, 8000)
+        assert callable(generated.create_http_app) and callable(generated.run_http)
+
+        http_code = MCPTemplate.generate("http-only", "HTTP", "resource", {"transport": "http"})["server.py"]
+        assert load_generated(http_code).build_parser().parse_args([]).transport == "http"
+
+        try:
+            MCPTemplate.generate("bad-server", "Bad", "tool", {"tools": tools, "transport": "grpc"})
+            raise AssertionError("Unknown transport was accepted")
+        except ValueError as e:
+            assert "transport" in str(e)
+
+        print("\n✅ HTTP entry point, worker/keep-alive flags and load-test recipe are generated")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_metrics():
+    """Test call metrics, their JSON and Prometheus exports and their overhead"""
+    print("\n" + "=" * 60)
+    print("TEST 21: Call Metrics")
+    print("=" * 60)
+
+    try:
+        config = {
+            "tools": [{"name": "echo", "description": "Echo", "parameters": []}],
+            "resources": [{"uri": "data://items", "name": "Items"}],
+            "prompts": [{"name": "summarize", "description": "Summarize"}],
+            "metrics": True,
+            "transport": "both"
+        }
+        files = MCPTemplate.generate("metrics-server", "Metrics", "full", config)
+        assert "@instrumented" not in MCPTemplate.generate("plain-server", "Plain", "full", {**config, "metrics": False})["server.py"]
+        generated = load_generated(files["server.py"])
+
+        for _ in range(3):
+            await generated.call_tool("echo", {})
+        for bad_call in (generated.call_tool("missing", {}), generated.get_prompt("missing", {})):
+            try:
+                await bad_call
+            except ValueError:
+                pass
+        await generated.read_resource("data://items")
+        await generated.get_prompt("summarize", {})
+
+        snapshot = json.loads((await generated.call_tool("__metrics__", {}))[0].text)
+        assert snapshot["tool"]["echo"]["calls"] == 3 and snapshot["tool"]["echo"]["errors"] == 0
+        assert snapshot["tool"]["missing"]["errors"] == 1
+        assert snapshot["prompt"]["missing"]["errors"] == 1 and snapshot["prompt"]["summarize"]["calls"] == 1
+        assert sum(snapshot["tool"]["echo"]["buckets_ms"].values()) == 3
+
+        resource = json.loads((await generated.read_resource("metrics://server"))[0].content)
+        assert resource["resource"]["data://items"]["calls"] == 1
+        assert any(r.uri == "metrics://server" for r in generated.RESOURCES)
+
+        text = generated.metrics_prometheus()
+        assert 'mcp_calls_total{kind="tool",name="echo"} 3' in text
+        assert 'mcp_call_duration_seconds_bucket{kind="tool",name="echo",le="+Inf"} 3' in text
+        assert "/metrics" in files["server.py"]
+
+        # Per-call overhead of the wrapper around a trivial handler
+        async def handler(name, arguments):
+            return name
+        wrapped = generated.instrumented("tool")(handler)
+        calls = 20000
+        start = time.perf_counter()
+        for _ in range(calls):
+            await handler("bench", None)
+        bare = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(calls):
+            await wrapped("bench", None)
+        overhead_ns = (time.perf_counter() - start - bare) / calls * 1e9
+        print(f"Instrumentation overhead: {overhead_ns:.0f} ns/call")
+        assert overhead_ns < 20_000, "Instrumentation is too slow to leave on"
+
+        print("\n✅ Calls, errors and latency histograms are recorded and exported")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_lazy_imports():
+    """Test deferred per-tool imports and the --startup-report breakdown"""
+    print("\n" + "=" * 60)
+    print("TEST 22: Lazy Imports and Startup Report")
+    print("=" * 60)
+
+    try:
+        tools = [
+            {"name": "palette", "description": "Colors", "imports": ["colorsys", "from fractions import Fraction"], "parameters": []},
+            {"name": "render", "description": "Offloaded", "executor": "thread", "imports": ["wave as w"], "parameters": []}
+        ]
+        code = MCPTemplate.generate("lazy-server", "Lazy", "tool", {"tools": tools})["server.py"]
+        header = code.split("# Initialize the MCP server")[0]
+        assert "colorsys" not in header and "import sys" in header
+        assert '"palette": ("colorsys", "fractions",),' in code and '"render": ("wave",),' in code
+        assert "def work_render(arguments: Any) -> list[TextContent]:\n    \"\"\"Offloaded\"\"\"\n    import wave as w\n" in code
+
+        was_loaded = "colorsys" in sys.modules
+        sys.modules.pop("colorsys", None)
+        generated = load_generated(code)
+        assert "colorsys" not in sys.modules, "Deferred import ran at startup"
+        await generated.call_tool("palette", {})
+        assert "colorsys" in sys.modules, "Deferred import did not run on the first call"
+        if not was_loaded:
+            sys.modules.pop("colorsys", None)
+
+        for bad in (["os; import shutil"], ["from . import x"], ["os, sys"], "numpy"):
+            try:
+                MCPTemplate.generate("bad-server", "Bad", "tool", {"tools": [{"name": "x", "imports": bad}]})
+                raise AssertionError(f"Invalid imports {bad!r} were accepted")
+            except ValueError:
+                pass
+
+        # The report parses `python -X importtime` output of a probe interpreter
+        import subprocess
+        importtime = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       900 |       1500 | site",
+            "@startup",
+            "import time:       200 |        200 |     json.decoder",
+            "import time:       300 |        700 |   json",
+            "import time:      4000 |      50000 | lazy_server",
+            "@deferred",
+            "import time:      2500 |       2500 | colorsys"
+        ])
+        real_run = subprocess.run
+        subprocess.run = lambda *args, **kwargs: subprocess.CompletedProcess(args, 0, "", importtime)
+        output = io.StringIO()
+        real_stdout, sys.stdout = sys.stdout, output
+        try:
+            generated.__file__ = str(Path(tempfile.gettempdir()) / "lazy_server.py")
+            generated.startup_report()
+        finally:
+            subprocess.run = real_run
+            sys.stdout = real_stdout
+        report = output.getvalue()
+        assert "Server import: 50.0 ms" in report and "0.7 ms  json\n" in report and "json.decoder" not in report
+        assert "4.0 ms  lazy_server (module body)" in report
+        assert "Deferred to first tool call: 2.5 ms" in report and "colorsys" in report
+        print(report)
+
+        print("✅ Tool imports are deferred to the first call and startup time is itemized")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_cursor_pagination():
+    """Test cursor-paginated listings served from prebuilt pages"""
+    print("\n" + "=" * 60)
+    print("TEST 23: Cursor Pagination")
+    print("=" * 60)
+
+    try:
+        config = {
+            "tools": [{"name": f"tool_{i}", "description": "Paged", "parameters": []} for i in range(5)],
+            "resources": [{"uri": f"data://r{i}", "name": f"R{i}"} for i in range(3)],
+            "page_size": 2
+        }
+        files = MCPTemplate.generate("paged-server", "Paged", "full", config)
+        # The newest mcp release any part needs: call_tool(validate_input=False) (1.10)
+        assert files["requirements.txt"] == "mcp>=1.10.0\n", files["requirements.txt"]
+        paged_resources = MCPTemplate.generate("paged-resources", "Paged", "resource", config)
+        assert paged_resources["requirements.txt"] == "mcp>=1.3.0\n", "resources need ReadResourceContents (mcp 1.3)"
+        paged_tools = MCPTemplate.generate("paged-tools", "Paged", "tool", {**config, "validate_arguments": False})
+        assert paged_tools["requirements.txt"] == "mcp>=1.0.0\n", paged_tools["requirements.txt"]
+        generated = load_generated(files["server.py"])
+        list_tools = generated.app.request_handlers[ListToolsRequest]
+
+        names, cursor, pages = [], None, []
+        while True:
+            page = (await list_tools(MockType(params=MockType(cursor=cursor)))).root
+            pages.append(page)
+            names += [tool.name for tool in page.tools]
+            cursor = page.nextCursor
+            if cursor is None:
+                break
+        assert names == [f"tool_{i}" for i in range(5)] and len(pages) == 3
+        assert (await list_tools(MockType(params=MockType(cursor="1")))).root is pages[1], "Page was rebuilt"
+        assert (await list_tools(None)).root is pages[0]
+
+        for bad_cursor in ("3", "-1", "abc"):
+            try:
+                await list_tools(MockType(params=MockType(cursor=bad_cursor)))
+                raise AssertionError(f"Cursor {bad_cursor!r} was accepted")
+            except McpError as e:
+                assert e.error.code == -32602
+
+        resources = (await generated.app.request_handlers[ListResourcesRequest](None)).root
+        assert len(resources.resources) == 2 and resources.nextCursor == "1"
+        prompts = (await generated.app.request_handlers[ListPromptsRequest](None)).root
+        assert prompts.prompts == [] and prompts.nextCursor is None
+
+        try:
+            MCPTemplate.generate("bad-server", "Bad", "tool", {"page_size": 0})
+            raise AssertionError("page_size 0 was accepted")
+        except ValueError as e:
+            assert "page_size" in str(e)
+
+        print("\n✅ Listings are paged by cursor from prebuilt pages")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_file_resources():
+    """Test mmap-backed file resources with chunked and byte-range reads"""
+    print("\n" + "=" * 60)
+    print("TEST 24: File Resources")
+    print("=" * 60)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "app.log"
+            log.write_bytes(b"".join([b"line %04d\n" % i for i in range(1000)]))
+            resources = [
+                {"uri": "file://logs/app", "name": "App log", "type": "file", "path": str(log), "chunk_size": 100},
+                {"uri": "file://logs/raw", "name": "Raw", "type": "file", "path": str(log), "encoding": "base64"}
+            ]
+            files = MCPTemplate.resource_server("file-server", "Files", resources)
+            generated = load_generated(files["server.py"])
+
+            async def read(uri):
+                return (await generated.read_resource(uri))[0].content
+
+            assert json.loads(await read("file://logs/app?stat")) == {"size": 10000, "chunk_size": 100, "chunks": 100}
+            assert await read("file://logs/app") == (await read("file://logs/app?chunk=0"))
+            assert await read("file://logs/app?chunk=3") == "".join([f"line {i:04d}\n" for i in range(30, 40)])
+            assert await read("file://logs/app?offset=10&length=9") == "line 0001"
+            assert len(await read("file://logs/app?offset=0&length=5000")) == 100, "length was not capped at chunk_size"
+            try:
+                await read("file://logs/app?chunk=100")
+                raise AssertionError("A chunk past the end of the file was served")
+            except ValueError as e:
+                assert "10000 bytes" in str(e)
+            assert base64.b64decode(await read("file://logs/raw?offset=0&length=4")) == b"line"
+            assert any(r.mimeType == "application/octet-stream" for r in generated.RESOURCES)
+
+            with open(log, "ab") as file:
+                file.write(b"appended\n")
+            assert json.loads(await read("file://logs/app?stat"))["size"] == 10009
+            assert await read("file://logs/app?offset=10000") == "appended\n"
+
+            for bad_uri in ("file://logs/app?offset=-5", "file://logs/app?chunk=x"):
+                try:
+                    await read(bad_uri)
+                    raise AssertionError(f"{bad_uri} was accepted")
+                except ValueError:
+                    pass
+            # Chunks of multibyte text never split a character and join back into the file
+            text = "".join([f"zeile {i} — grüße, 日本語 🙂\n" for i in range(200)])
+            (Path(tmp) / "utf8.txt").write_text(text, encoding="utf-8")
+            utf8 = load_generated(MCPTemplate.resource_server("utf8-server", "UTF-8", [
+                {"uri": "file://utf8", "name": "UTF-8", "type": "file", "path": str(Path(tmp) / "utf8.txt"), "chunk_size": 7}
+            ])["server.py"], "utf8_server")
+            chunks = json.loads((await utf8.read_resource("file://utf8?stat"))[0].content)["chunks"]
+            parts = [(await utf8.read_resource(f"file://utf8?chunk={i}"))[0].content for i in range(chunks)]
+            assert "\ufffd" not in "".join(parts) and "".join(parts) == text, "A chunk split a UTF-8 character"
+            assert (await utf8.read_resource("file://utf8?offset=1&length=0"))[0].content == ""
+            for mapped in list(generated.FILE_RESOURCES.values()) + list(utf8.FILE_RESOURCES.values()):
+                mapped.mapped.close()
+
+        try:
+            MCPTemplate.resource_server("bad-server", "Bad", [{"uri": "file://x", "type": "file"}])
+            raise AssertionError("File resource without a path was accepted")
+        except ValueError as e:
+            assert "path" in str(e)
+
+        import benchmark_file_resources
+        results = {row["mode"]: row for row in benchmark_file_resources.run(size_mb=4, chunk_kb=256, requests=4)}
+        assert results["mmap/scan"]["served_bytes"] == results["read_text/scan"]["served_bytes"]
+        assert results["mmap/chunk"]["served_bytes"] == results["read_text/chunk"]["served_bytes"]
+
+        print("\n✅ Files are served in chunks and byte ranges through mmap")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_resource_cache():
+    """Test cached resources: version tags, stale-while-revalidate and change notifications"""
+    print("\n" + "=" * 60)
+    print("TEST 25: Resource Cache and Change Notifications")
+    print("=" * 60)
+
+    class Session:
+        def __init__(self): self.updated = []
+        async def send_resource_updated(self, uri): self.updated.append(uri)
+
+    try:
+        resources = [
+            {"uri": "data://live", "name": "Live", "cache": {"ttl": 0.05, "stale_while_revalidate": 60}},
+            {"uri": "data://plain", "name": "Plain"}
+        ]
+        files = MCPTemplate.resource_server("cached-server", "Cached", resources)
+        code = files["server.py"]
+        assert '@cached_resource("data://live", ttl=0.05, stale_while_revalidate=60.0, max_entries=1024)' in code
+        assert code.count("@cached_resource(") == 1
+        assert "SUBSCRIBERS" not in MCPTemplate.resource_server("plain", "Plain", resources[1:])["server.py"]
+
+        generated = load_generated(code)
+        assert generated.app.get_capabilities().resources.subscribe is True
+        cache = generated.RESOURCE_CACHES["data://live"]
+        version = {"value": 1}
+
+        async def load(uri):
+            return [generated.TextContent(type="text", text=f"{uri} v{version['value']} " + "x" * 4096)]
+        cache.load = load
+
+        async def read(uri):
+            return (await generated.read_resource(uri))[0].content
+
+        # A full garbage collection during the burst can outlast the 50 ms TTL; run it first
+        gc.collect()
+        first = await read("data://live")
+        assert await asyncio.gather(*[read("data://live") for _ in range(100)]) == [first] * 100
+        assert cache.loads == 1, f"{cache.loads} loads for 101 fresh reads"
+        tag = json.loads(await read("data://live?version"))
+        assert tag["uri"] == "data://live" and len(tag["etag"]) == 16
+        assert len(await read("data://live?version")) < len(first) / 40
+
+        # Past the ttl the stale copy is served at once while one background load runs
+        version["value"] = 2
+        await asyncio.sleep(0.06)
+        assert await read("data://live") == first
+        await asyncio.sleep(0.01)
+        assert await read("data://live") != first
+        assert json.loads(await read("data://live?version"))["etag"] != tag["etag"]
+        assert cache.stats()["stale_hits"] >= 1 and cache.changes == 1
+
+        # Subscribers hear about changes only, not about every reload
+        session = Session()
+        generated.app.request_context = MockType(session=session)
+        await generated.subscribe_resource("data://live")
+        await asyncio.sleep(0.2)
+        loads = cache.loads
+        assert loads >= 3 and session.updated == [], "Reloads without a change sent notifications"
+        version["value"] = 3
+        await asyncio.sleep(0.1)
+        assert session.updated == ["data://live"], session.updated
+        await generated.unsubscribe_resource("data://live")
+        await asyncio.sleep(0.1)
+        assert not cache.watchers, "Watcher kept running without subscribers"
+
+        try:
+            MCPTemplate.resource_server("bad", "Bad", [{"uri": "data://x", "cache": {"ttl": 0}}])
+            raise AssertionError("Resource cache with ttl 0 was accepted")
+        except ValueError as e:
+            assert "ttl" in str(e)
+
+        print("\n✅ Cached resources reload only when stale and notify only on change")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_http_tools():
+    """Test http tools: URL templating, argument mapping, pooled client and bounded retries"""
+    print("\n" + "=" * 60)
+    print("TEST 26: Pooled HTTP Tools")
+    print("=" * 60)
+
+    try:
+        def http_tools(base_url):
+            return [
+                {
+                    "name": "get_user", "kind": "http", "url": base_url + "/users/{user_id}",
+                    "parameters": [
+                        {"name": "user_id", "type": "string", "required": True},
+                        {"name": "fields", "type": "string"}
+                    ]
+                },
+                {
+                    "name": "create_user", "kind": "http", "method": "POST", "url": base_url + "/users",
+                    "headers": {"x-api-key": "secret"},
+                    "parameters": [{"name": "name", "type": "string"}, {"name": "dry_run", "type": "boolean"}],
+                    "arguments": {"dry_run": "query"}
+                },
+                {"name": "flaky", "kind": "http", "url": base_url + "/flaky/a", "retries": 2},
+                {"name": "flaky_no_retry", "kind": "http", "url": base_url + "/flaky/b", "retries": 0},
+                # Names that differ only by case must not share a request constant
+                {"name": "Get", "kind": "http", "url": base_url + "/case/upper"},
+                {"name": "get", "kind": "http", "url": base_url + "/case/lower"}
+            ]
+
+        files = MCPTemplate.basic_tool_server("api-server", "API", http_tools("http://127.0.0.1:1"))
+        code = files["server.py"]
+        assert 'path=("user_id",),\n    query=("fields",),' in code
+        assert 'query=("dry_run",),\n    body=("name",),\n    headers={"x-api-key": "secret"},' in code
+        assert "httpx" in files["requirements.txt"]
+        assert "import httpx" not in code.split("def shared_http_client")[0], "httpx imported at startup"
+        assert "HttpRequest" not in MCPTemplate.basic_tool_server("plain", "Plain", [{"name": "x"}])["server.py"]
+
+        bad_tools = [
+            {"name": "no_url", "kind": "http"},
+            {"name": "bad_placeholder", "kind": "http", "url": "http://x/{missing}"},
+            {"name": "bad_method", "kind": "http", "url": "http://x", "method": "TRACE"},
+            {"name": "offloaded", "kind": "http", "url": "http://x", "executor": "thread"}
+        ]
+        for bad_tool in bad_tools:
+            try:
+                MCPTemplate.basic_tool_server("bad", "Bad", [bad_tool])
+                raise AssertionError(f"{bad_tool['name']} was accepted")
+            except ValueError:
+                pass
+        try:
+            server_templates.render_server("bad", "Bad", "tool", {"tools": [], "http_pool": {"max_connections": 0}})
+            raise AssertionError("http_pool with max_connections 0 was accepted")
+        except ValueError as e:
+            assert "max_connections" in str(e)
+
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            print("\n⚠️  httpx is not installed; skipped calls against the stand-in server")
+            print("\n✅ HTTP tools generate with a pooled client and bounded retries")
+            return True
+
+        import benchmark_http_tools
+        stand_in, base_url = benchmark_http_tools.start_stand_in_server(flaky_failures=2)
+        try:
+            generated = load_generated(MCPTemplate.basic_tool_server("api", "API", http_tools(base_url))["server.py"])
+
+            result = json.loads((await generated.call_tool("get_user", {"user_id": "a/b", "fields": "name"}))[0].text)
+            assert result == {"path": "/users/a%2Fb", "query": {"fields": "name"}}, result
+            result = json.loads((await generated.call_tool("create_user", {"name": "Ada", "dry_run": True}))[0].text)
+            assert result == {"path": "/users?dry_run=true", "json": {"name": "Ada"}}, result
+            for _ in range(5):
+                await generated.call_tool("get_user", {"user_id": "1"})
+            assert len(stand_in.connections) == 1, f"{len(stand_in.connections)} connections for sequential calls"
+
+            assert json.loads((await generated.call_tool("Get", {}))[0].text)["path"] == "/case/upper"
+            assert json.loads((await generated.call_tool("get", {}))[0].text)["path"] == "/case/lower"
+            assert json.loads((await generated.call_tool("flaky", {}))[0].text)["path"] == "/flaky/a"
+            assert stand_in.flaky_counts["/flaky/a"] == 3
+            try:
+                await generated.call_tool("flaky_no_retry", {})
+                raise AssertionError("A 503 without retries was not reported")
+            except generated.HttpToolError as e:
+                assert "503" in str(e)
+            await generated.HTTP_CLIENT.aclose()
+        finally:
+            stand_in.shutdown()
+            stand_in.server_close()
+
+        results = {row["mode"]: row for row in await benchmark_http_tools.run(calls=40, concurrency=4)}
+        pooled, per_call = results["pooled"], results["per-call client"]
+        print(f"\n  pooled: {pooled['calls_per_s']} calls/s over {pooled['connections']} connections")
+        print(f"  per-call client: {per_call['calls_per_s']} calls/s over {per_call['connections']} connections")
+        assert pooled["connections"] <= 4 and per_call["connections"] == 40
+        assert pooled["calls_per_s"] > per_call["calls_per_s"]
+
+        print("\n✅ HTTP tools share one keep-alive client and retry within bounds")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_sqlite_kind():
+    """Test sqlite resources and tools: URI/argument binding, pooled WAL readers and row streaming"""
+    print("\n" + "=" * 60)
+    print("TEST 27: SQLite Resources and Tools")
+    print("=" * 60)
+
+    import sqlite3
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = str(Path(tmp) / "app.db")
+            connection = sqlite3.connect(database)
+            connection.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT, avatar BLOB)")
+            connection.executemany(
+                "INSERT INTO users VALUES (?, ?, ?)", [(i, f"user {i}", b"\x00\x01" if i == 1 else None) for i in range(1, 20001)]
+            )
+            connection.execute("CREATE TABLE zips (zip TEXT PRIMARY KEY, city TEXT)")
+            connection.execute("INSERT INTO zips VALUES ('01234', 'Springfield')")
+            connection.commit()
+            connection.close()
+
+            config = {
+                "resources": [
+                    {"uri": "db://users/{id}", "name": "User", "type": "sqlite", "database": database,
+                     "query": "SELECT id, name, avatar FROM users WHERE id = :id"},
+                    {"uri": "db://zip/{zip}", "name": "Zip", "type": "sqlite", "database": database,
+                     "query": "SELECT city FROM zips WHERE zip = :zip"},
+                    {"uri": "db://users", "name": "Users", "type": "sqlite", "database": database,
+                     "query": "SELECT id, name FROM users ORDER BY id LIMIT :limit", "max_rows": 5000}
+                ],
+                "tools": [
+                    {"name": "find_users", "kind": "sqlite", "database": database, "pool_size": 2,
+                     "query": "SELECT id FROM users WHERE name LIKE :pattern ORDER BY id",
+                     "parameters": [{"name": "pattern", "type": "string", "required": True}]},
+                    # Names that differ only by case must not share a query constant
+                    {"name": "Zips", "kind": "sqlite", "database": database, "query": "SELECT city FROM zips", "parameters": []},
+                    {"name": "zips", "kind": "sqlite", "database": database, "query": "SELECT zip FROM zips", "parameters": []}
+                ],
+                "prompts": []
+            }
+            files = MCPTemplate.full_server("db-server", "DB", config)
+            code = files["server.py"]
+            assert '@resource_route("db://users/", "application/json")' in code and '@resource_route("db://users", "application/json")' in code
+            assert "TODO" not in code.split("# Resource implementations")[1].split("@app.read_resource")[0]
+            generated = load_generated(code)
+
+            async def read(uri):
+                return json.loads((await generated.read_resource(uri))[0].content)
+
+            user = await read("db://users/1")
+            assert user == {"columns": ["id", "name", "avatar"], "rows": [[1, "user 1", "AAE="]], "truncated": False}, user
+            assert (await read("db://users/42"))["rows"] == [[42, "user 42", None]]
+            assert (await read("db://users/999999"))["rows"] == []
+            assert (await read("db://zip/01234"))["rows"] == [["Springfield"]], "A zero-padded TEXT key missed"
+            page = await read("db://users?limit=3")
+            assert page["rows"] == [[1, "user 1"], [2, "user 2"], [3, "user 3"]] and not page["truncated"]
+            large = await read("db://users?limit=20000")
+            assert len(large["rows"]) == 5000 and large["truncated"], "max_rows did not cap a large result"
+            try:
+                await read("db://users")
+                raise AssertionError("A query with an unbound parameter ran")
+            except ValueError as e:
+                assert "limit" in str(e)
+
+            result = json.loads((await generated.call_tool("find_users", {"pattern": "user 1999_"}))[0].text)
+            assert result["rows"] == [[i] for i in range(19990, 20000)], result
+            for tool_name, row in (("Zips", ["Springfield"]), ("zips", ["01234"])):
+                result = json.loads((await generated.call_tool(tool_name, {}))[0].text)
+                assert result["rows"] == [row], (tool_name, result)
+
+            pool = generated.SQLITE_POOLS[database]
+            await asyncio.gather(*[generated.read_resource(f"db://users/{i}") for i in range(1, 200)])
+            assert pool.connections <= 4, f"{pool.connections} connections for a pool of 4"
+            check = sqlite3.connect(database)
+            assert check.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            check.close()
+
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    pool.executor, pool.run, "DELETE FROM users", {}, 10
+                )
+                raise AssertionError("A pooled connection accepted a write")
+            except sqlite3.OperationalError:
+                pass
+
+            start = time.perf_counter()
+            for i in range(1, 1001):
+                await generated.read_resource(f"db://users/{i}")
+            pooled = (time.perf_counter() - start) / 1000 * 1e6
+
+            def connect_per_call(i):
+                per_call = sqlite3.connect(database)
+                try:
+                    return per_call.execute("SELECT id, name, avatar FROM users WHERE id = ?", (i,)).fetchall()
+                finally:
+                    per_call.close()
+            start = time.perf_counter()
+            for i in range(1, 1001):
+                await asyncio.to_thread(connect_per_call, i)
+            per_call = (time.perf_counter() - start) / 1000 * 1e6
+            print(f"\n  point lookup: {pooled:.0f} µs pooled, {per_call:.0f} µs with a connection per call")
+            pool.executor.shutdown()
+
+        for bad in (
+            {"uri": "db://x", "type": "sqlite", "query": "SELECT 1"},
+            {"uri": "db://x", "type": "sqlite", "database": "a.db", "query": "DELETE FROM users"},
+            {"uri": "db://x/{bad-name}", "type": "sqlite", "database": "a.db", "query": "SELECT 1"}
+        ):
+            try:
+                MCPTemplate.resource_server("bad", "Bad", [bad])
+                raise AssertionError(f"{bad} was accepted")
+            except ValueError:
+                pass
+
+        print("\n✅ SQLite resources and tools query a pooled read-only WAL database")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_search_tools():
+    """Test search tools: FTS5 ranking and snippets, incremental refresh and the prebuild script"""
+    print("\n" + "=" * 60)
+    print("TEST 28: Full-Text Search Tools")
+    print("=" * 60)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp) / "docs"
+            docs.mkdir()
+            (docs / "install.md").write_text("# Installing\n\nRun pip install to set up the generator.\n")
+            (docs / "caching.md").write_text("# Caching\n\nResults are cached. The cache keeps warm results for repeat calls.\n")
+            (docs / "notes.bin").write_text("cache cache cache")
+            corpus = docs / "records.jsonl"
+            corpus.write_text("".join([
+                json.dumps({"id": f"r{i}", "title": f"record {i}", "text": f"entry number {i} about sqlite"}) + "\n"
+                for i in range(200)
+            ]) + "not json\n")
+
+            config = {
+                "tools": [
+                    {"name": "search_docs", "description": "Search the docs", "kind": "search",
+                     "source": str(docs), "index": str(Path(tmp) / "docs.db")}
+                ],
+                "resources": [],
+                "prompts": []
+            }
+            files = MCPTemplate.full_server("search-server", "Search", config)
+            assert "build_search_index.py" in files and "python build_search_index.py" in files["README.md"]
+            generated = load_generated(files["server.py"])
+            schema = generated.TOOLS[0].inputSchema
+            assert schema["required"] == ["query"] and set(schema["properties"]) == {"query", "limit"}, schema
+
+            async def search(arguments):
+                return json.loads((await generated.call_tool("search_docs", arguments))[0].text)["results"]
+
+            results = await search({"query": "cache"})
+            assert [hit["ref"] for hit in results] == ["caching.md"], results
+            assert results[0]["title"] == "Caching" and "[cache]" in results[0]["snippet"].lower(), results
+            assert results[0]["score"] > 0
+            assert [hit["ref"] for hit in await search({"query": "entry 17 sqlite"})] == ["r17"]
+            assert len(await search({"query": "sqlite", "limit": 5})) == 5
+            assert schema["properties"]["limit"]["minimum"] == 1 and schema["properties"]["limit"]["maximum"] == 100
+            for limit in (0, 1000):
+                try:
+                    await search({"query": "sqlite", "limit": limit})
+                    raise AssertionError(f"limit {limit} passed validation")
+                except generated.ToolArgumentError:
+                    pass
+            index = generated.SEARCH_INDEXES["search_docs"]
+            assert len(json.loads((await index.search({"query": "sqlite", "limit": 1000}))[0].text)["results"]) == 100
+            assert len(json.loads((await index.search({"query": "sqlite", "limit": -1}))[0].text)["results"]) == 1
+            try:
+                await search({"query": "?!"})
+                raise AssertionError("A query without words ran")
+            except ValueError:
+                pass
+
+            refresh = lambda: index.pool.call(index.refresh)
+            assert await refresh() == {"added": 0, "updated": 0, "appended": 0, "removed": 0, "unchanged": 3, "documents": 0}
+            (docs / "install.md").write_text("# Installing\n\nUse uv or pip to install it.\n")
+            with open(corpus, "a") as file:
+                file.write(json.dumps({"id": "late", "title": "late record", "text": "appended afterwards"}) + "\n")
+                file.write(json.dumps({"id": "last", "title": "last record", "text": "no newline after it"}))
+            (docs / "caching.md").unlink()
+            stats = await refresh()
+            assert stats == {"added": 0, "updated": 1, "appended": 1, "removed": 1, "unchanged": 0, "documents": 3}, stats
+            assert [hit["ref"] for hit in await search({"query": "appended"})] == ["late"]
+            assert [hit["ref"] for hit in await search({"query": "newline"})] == ["last"]
+            assert await search({"query": "cache"}) == []
+            assert [hit["ref"] for hit in await search({"query": "uv"})] == ["install.md"]
+            index.pool.executor.shutdown()
+
+            # Names that differ only by case must not share an index constant
+            cases = (("Notes", "upper"), ("notes", "lower"))
+            for _, case in cases:
+                (Path(tmp) / case).mkdir()
+                (Path(tmp) / case / f"{case}.md").write_text(f"# {case}\n\nshared term\n")
+            cased = load_generated(MCPTemplate.basic_tool_server("cased", "Cased", [
+                {"name": name, "kind": "search", "source": str(Path(tmp) / case), "index": str(Path(tmp) / f"{case}.db")}
+                for name, case in cases
+            ])["server.py"], "cased_search_server")
+            for name, case in cases:
+                hits = json.loads((await cased.call_tool(name, {"query": "shared"}))[0].text)["results"]
+                assert [hit["ref"] for hit in hits] == [f"{case}.md"], (name, hits)
+                cased.SEARCH_INDEXES[name].pool.executor.shutdown()
+
+            rebuilt = load_generated(files["server.py"])
+            sys.modules["server"] = rebuilt
+            try:
+                script = load_generated(files["build_search_index.py"], "build_search_index")
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    await script.main()
+            finally:
+                del sys.modules["server"]
+            assert '"unchanged": 2' in output.getvalue(), output.getvalue()
+            rebuilt.SEARCH_INDEXES["search_docs"].pool.executor.shutdown()
+
+        for bad in (
+            {"name": "s", "kind": "search"},
+            {"name": "s", "kind": "search", "source": "docs", "limit": 0},
+            {"name": "s", "kind": "search", "source": "docs", "extensions": "md"},
+            {"name": "s", "kind": "search", "source": "docs", "executor": "thread"}
+        ):
+            try:
+                MCPTemplate.basic_tool_server("bad", "Bad", [bad])
+                raise AssertionError(f"{bad} was accepted")
+            except ValueError:
+                pass
+
+        from benchmark_search import run as run_search_benchmark
+        results = await run_search_benchmark(5000, 3)
+        assert results["appended_documents"] == 1000 and results["unchanged_files"] == 1
+        print(f"\n  5,000 documents: rare term {results['queries']['rare']['p50_ms']:.2f} ms, "
+              f"linear scan {results['linear_scan_ms']:.0f} ms")
+
+        print("\n✅ Search tools rank snippets from an incrementally refreshed FTS5 index")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_record_resources():
+    """Test jsonl resources: sidecar offset index, reuse across processes, appends and rewrites"""
+    print("\n" + "=" * 60)
+    print("TEST 29: JSONL Record Resources")
+    print("=" * 60)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "records.jsonl"
+            data.write_text("".join([json.dumps({"id": f"r{i}", "n": i}) + "\n" for i in range(5000)]) + "not json\n")
+            config = {
+                "resources": [
+                    {"uri": "data://records/{id}", "name": "Records", "type": "jsonl", "path": str(data)},
+                    {"uri": "data://users/{user}", "name": "Users", "type": "jsonl", "path": str(data),
+                     "key": "n", "index": str(Path(tmp) / "by-n.idx")}
+                ],
+                "tools": [],
+                "prompts": []
+            }
+            files = MCPTemplate.full_server("records-server", "Records", config)
+            code = files["server.py"]
+            assert '@resource_route("data://records/", "application/json")' in code
+            generated = load_generated(code)
+
+            async def read(module, uri):
+                return json.loads((await module.read_resource(uri))[0].content)
+
+            assert await read(generated, "data://records/r42") == {"id": "r42", "n": 42}
+            assert await read(generated, "data://users/4999") == {"id": "r4999", "n": 4999}
+            records = generated.RECORD_FILES["data://records/{id}"]
+            assert records.stats == {"loaded": 0, "appended": 0, "rebuilds": 1}, records.stats
+            assert Path(str(data) + ".idx").exists() and (Path(tmp) / "by-n.idx").exists()
+            for missing in ("data://records/nope", "data://records/not%20json"):
+                try:
+                    await generated.read_resource(missing)
+                    raise AssertionError(f"{missing} was served")
+                except ValueError:
+                    pass
+
+            with open(data, "a") as file:
+                file.write(json.dumps({"id": "r42", "n": -42}) + "\n" + json.dumps({"id": "late", "n": 5000}) + "\n")
+                file.write('{"id": "partial"')
+            assert await read(generated, "data://records/late") == {"id": "late", "n": 5000}
+            assert await read(generated, "data://records/r42") == {"id": "r42", "n": -42}, "A later record did not win"
+            assert records.stats == {"loaded": 0, "appended": 2, "rebuilds": 1}, records.stats
+            try:
+                await generated.read_resource("data://records/partial")
+                raise AssertionError("A partly written record was served")
+            except ValueError:
+                pass
+
+            # A complete final record is served before the writer ends its line
+            with open(data, "a") as file:
+                file.write(', "n": 5001}')
+            assert await read(generated, "data://records/partial") == {"id": "partial", "n": 5001}
+            with open(data, "a") as file:
+                file.write("\n" + json.dumps({"id": "next", "n": 5002}))
+            assert await read(generated, "data://records/next") == {"id": "next", "n": 5002}
+            assert await read(generated, "data://records/partial") == {"id": "partial", "n": 5001}
+            assert records.stats == {"loaded": 0, "appended": 4, "rebuilds": 1}, records.stats
+
+            restarted = load_generated(code, "restarted_server")
+            assert await read(restarted, "data://records/r4999") == {"id": "r4999", "n": 4999}
+            reloaded = restarted.RECORD_FILES["data://records/{id}"]
+            assert reloaded.stats == {"loaded": 5003, "appended": 0, "rebuilds": 0}, reloaded.stats
+
+            data.write_text("".join([json.dumps({"id": f"r{i}", "n": i * 2}) + "\n" for i in range(5000)]))
+            assert await read(restarted, "data://records/r7") == {"id": "r7", "n": 14}
+            assert reloaded.stats["rebuilds"] == 1
+
+            # Swapping records far from the end keeps the size and indexed tail; the key check catches it
+            lines = data.read_text().splitlines(keepends=True)
+            lines[1], lines[2] = lines[2], lines[1]
+            data.write_text("".join(lines))
+            assert await read(restarted, "data://records/r1") == {"id": "r1", "n": 2}
+            assert reloaded.stats["rebuilds"] == 2, reloaded.stats
+
+        for bad in (
+            {"uri": "data://records/{id}", "type": "jsonl"},
+            {"uri": "data://records", "type": "jsonl", "path": "a.jsonl"},
+            {"uri": "data://{kind}/{id}", "type": "jsonl", "path": "a.jsonl"},
+            {"uri": "data://records/{id}", "type": "jsonl", "path": "a.jsonl", "key": ""}
+        ):
+            try:
+                MCPTemplate.resource_server("bad", "Bad", [bad])
+                raise AssertionError(f"{bad} was accepted")
+            except ValueError:
+                pass
+
+        from benchmark_record_resources import run as run_record_benchmark
+        small, large = await run_record_benchmark([1000, 100000], 2000)
+        print(f"\n  lookup p50: {small['lookup_p50_us']:.1f} µs at 1,000 records, "
+              f"{large['lookup_p50_us']:.1f} µs at 100,000 (scan: {large['scan_last_ms']:.0f} ms)")
+        assert large["lookup_p50_us"] < small["lookup_p50_us"] * 3, "Lookups slowed down with file size"
+
+        print("\n✅ JSONL records are served through a persistent, incrementally extended offset index")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
+async def test_real_sdk():
+    """Test generated servers against the installed mcp package instead of the mocks"""
+    print("\n" + "=" * 60)
+    print("TEST 30: Generated Servers on the Real MCP SDK")
+    print("=" * 60)
+
+    import subprocess
+    if subprocess.run([sys.executable, "-c", "import mcp.types"], capture_output=True).returncode != 0:
+        print("\n⚠️  mcp is not installed; skipped loading generated servers with the real SDK")
+        return True
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "notes.txt").write_text("hello\n")
+            (tmp / "records.jsonl").write_text(json.dumps({"id": "r1", "n": 1}) + "\n")
+            import sqlite3
+            connection = sqlite3.connect(tmp / "app.db")
+            connection.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            connection.execute("INSERT INTO users VALUES (1, 'ada')")
+            connection.commit()
+            connection.close()
+
+            tools = [{"name": "add", "description": "Add", "parameters": [
+                {"name": "a", "type": "integer", "required": True}, {"name": "b", "type": "integer", "required": True}
+            ]}]
+            resources = [
+                {"uri": "data://plain", "name": "Plain", "description": "Plain data"},
+                {"uri": "file://notes", "name": "Notes", "type": "file", "path": str(tmp / "notes.txt")},
+                {"uri": "db://users/{id}", "name": "User", "type": "sqlite", "database": str(tmp / "app.db"),
+                 "query": "SELECT id, name FROM users WHERE id = :id"},
+                {"uri": "data://records/{id}", "name": "Records", "type": "jsonl", "path": str(tmp / "records.jsonl")}
+            ]
+            servers = {
+                "tool": MCPTemplate.basic_tool_server("sdk-tool", "SDK", tools),
+                "resource": MCPTemplate.resource_server("sdk-resource", "SDK", resources),
+                "full": MCPTemplate.full_server("sdk-full", "SDK", {
+                    "tools": tools, "resources": resources, "prompts": [], "metrics": True
+                }),
+                # "add" is on the second page
+                "paged": MCPTemplate.generate("sdk-paged", "SDK", "tool", {
+                    "tools": [{**tools[0], "name": "sub"}, *tools], "page_size": 1
+                })
+            }
+            # Resource.uri is a pydantic AnyUrl: a bare host gains a "/" and braces are percent-encoded
+            uris = ["data://plain", "file://notes/", "db://users/%7Bid%7D", "data://records/%7Bid%7D"]
+            # Reads arrive as AnyUrl too, so file://notes?offset=0&length=5 is requested as file://notes/?offset=0&length=5
+            reads = ("data://plain", "file://notes", "file://notes?offset=0&length=5", "db://users/1", "data://records/r1")
+            # "2" only reaches the compiled validator, which coerces it, if the SDK skips its own jsonschema pass
+            calls = [["add", {"a": "2", "b": 3}], ["add", {"a": "two", "b": 3}]]
+            reports = {
+                server_type: probe_with_sdk(files, tmp / server_type, {
+                    "reads": reads if server_type in ("resource", "full") else [],
+                    "calls": calls if server_type != "resource" else []
+                })
+                for server_type, files in servers.items()
+            }
+            assert reports["tool"]["tools"] == ["add"], reports["tool"]
+            assert reports["paged"]["tools"] == ["sub"], reports["paged"]
+            # The SDK warns "Tool 'add' not listed" when a call misses its tool cache
+            for server_type, report in reports.items():
+                assert report["warnings"] == [], (server_type, report["warnings"])
+            for server_type in ("tool", "full", "paged"):
+                (coerced_error, _), (invalid_error, invalid_text) = reports[server_type]["calls"]
+                assert coerced_error is False, reports[server_type]
+                assert invalid_error is True and "must be an integer" in invalid_text[0], reports[server_type]
+            assert reports["resource"]["resources"] == uris, reports["resource"]
+            assert reports["full"]["resources"] == uris + ["metrics://server"], reports["full"]
+            for server_type in ("resource", "full"):
+                contents = reports[server_type]["reads"]
+                assert contents["data://plain"][0][0] == "text/plain", contents
+                assert contents["file://notes"] == [["text/plain", "hello\n"]], contents
+                assert contents["file://notes?offset=0&length=5"] == [["text/plain", "hello"]], contents
+                assert contents["db://users/1"][0][0] == "application/json", contents
+                assert json.loads(contents["db://users/1"][0][1])["rows"] == [[1, "ada"]], contents
+                assert json.loads(contents["data://records/r1"][0][1]) == {"id": "r1", "n": 1}, contents
+
+        print("\n✅ Generated servers import and list their catalogs with the installed mcp package")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        return False
+
+
 async def main():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -270,7 +2118,33 @@ async def main():
         ("Calculator Server", test_generate_calculator),
         ("Weather Resource Server", test_generate_weather_resource),
         ("Full-Featured Server", test_generate_full_server),
-        ("Configuration Validation", test_validation)
+        ("Configuration Validation", test_validation),
+        ("Template Engine", test_template_engine),
+        ("Generation Cache", test_generation_cache),
+        ("Incremental Regeneration", test_incremental_regeneration),
+        ("Streaming Writer", test_streaming_output),
+        ("In-Memory Archive", test_in_memory_archive),
+        ("Batch Generation", test_batch_generation),
+        ("Sharded Rendering", test_sharded_rendering),
+        ("Benchmark Regression Gate", test_benchmark_gate),
+        ("Dict Dispatch", test_dict_dispatch),
+        ("Resource Router", test_resource_router),
+        ("Import-Time Catalogs", test_import_time_catalogs),
+        ("Compiled Validators", test_compiled_validators),
+        ("Tool Result Cache", test_tool_result_cache),
+        ("Executor Offload", test_executor_offload),
+        ("Tool Deadlines", test_tool_deadlines),
+        ("HTTP Transport", test_http_transport),
+        ("Call Metrics", test_metrics),
+        ("Lazy Imports", test_lazy_imports),
+        ("Cursor Pagination", test_cursor_pagination),
+        ("File Resources", test_file_resources),
+        ("Resource Cache", test_resource_cache),
+        ("HTTP Tools", test_http_tools),
+        ("SQLite Kind", test_sqlite_kind),
+        ("Search Tools", test_search_tools),
+        ("Record Resources", test_record_resources),
+        ("Real MCP SDK", test_real_sdk)
     ]
 
     results = []
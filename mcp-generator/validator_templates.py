@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Validator Templates - Emit specialized argument validators for generated tools.
+Each tool's parameters are turned into straight-line Python at generation time:
+one exact type check per declared argument, with coercion, enum and range checks only
+on the slow path, so a valid call never interprets a JSON Schema at runtime.
+"""
+
+from template_engine import Template, encode_string, python_identifier, range_bounds
+
+# Exact type test per JSON Schema type; a mismatch falls back to the coercer
+TYPE_CHECKS = {
+    "string": "type(value) is not str",
+    "number": "type(value) is not int and type(value) is not float",
+    "integer": "type(value) is not int",
+    "boolean": "type(value) is not bool",
+    "array": "type(value) is not list",
+    "object": "type(value) is not dict"
+}
+
+# Failing comparison and message wording per range keyword
+RANGE_CHECKS = {"minimum": ("<", "at least"), "maximum": (">", "at most")}
+
+# Shared runtime emitted once into servers with validated tools. It has no
+# dependencies, so it can also be executed on its own (see benchmark_validation.py).
+VALIDATION_RUNTIME = Template('''
+# Argument validation, compiled per tool from its inputSchema
+class ToolArgumentError(ValueError):
+    """Raised when tool arguments do not match the tool's inputSchema"""
+
+
+def _invalid(tool: str, field: str, expected: str, value: Any) -> ToolArgumentError:
+    return ToolArgumentError(f"{tool}: argument '{field}' must be {expected}, got {value!r}")
+
+
+def _coerce_string(tool: str, field: str, value: Any) -> str:
+    if type(value) is int or type(value) is float:
+        return str(value)
+    raise _invalid(tool, field, "a string", value)
+
+
+def _coerce_number(tool: str, field: str, value: Any) -> float:
+    if type(value) is str:
+        try:
+            return int(value) if value.lstrip("-").isdigit() else float(value)
+        except ValueError:
+            pass
+    raise _invalid(tool, field, "a number", value)
+
+
+def _coerce_integer(tool: str, field: str, value: Any) -> int:
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if type(value) is str:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise _invalid(tool, field, "an integer", value)
+
+
+_BOOLEAN_STRINGS = {"true": True, "false": False, "1": True, "0": False}
+
+
+def _coerce_boolean(tool: str, field: str, value: Any) -> bool:
+    if type(value) is str and value.lower() in _BOOLEAN_STRINGS:
+        return _BOOLEAN_STRINGS[value.lower()]
+    if type(value) is int and value in (0, 1):
+        return bool(value)
+    raise _invalid(tool, field, "a boolean", value)
+
+
+def _coerce_array(tool: str, field: str, value: Any) -> list:
+    if type(value) is tuple:
+        return list(value)
+    if type(value) is str:
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = None
+        if type(parsed) is list:
+            return parsed
+    raise _invalid(tool, field, "an array", value)
+
+
+def _coerce_object(tool: str, field: str, value: Any) -> dict:
+    if type(value) is str:
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            parsed = None
+        if type(parsed) is dict:
+            return parsed
+    raise _invalid(tool, field, "an object", value)
+''')
+
+VALIDATOR = Template('''{{enum_constants}}def {{func_name}}(arguments: Any) -> dict:
+    """Validate and coerce the arguments of {{tool_name}}"""
+    if type(arguments) is not dict:
+        if arguments is not None:
+            raise ToolArgumentError({{not_object_message}})
+        arguments = {}
+    else:
+        arguments = dict(arguments)
+{{checks}}    return arguments
+
+
+''')
+
+
+def python_literal(value) -> str:
+    """Render a JSON-compatible enum value as a Python literal"""
+    if type(value) is str:
+        return encode_string(value)
+    return repr(value)
+
+
+def render_parameter_check(tool_name: str, constant_prefix: str, index: int, param: dict) -> tuple[str, str]:
+    """Return the (module-level constants, function body) validating one parameter"""
+    field = str(param["name"])
+    key = encode_string(field)
+    param_type = param.get("type", "string")
+    enum = param.get("enum")
+    required = param.get("required", False)
+
+    checks = []
+    if type(param_type) is str and param_type in TYPE_CHECKS:
+        checks += [
+            f"if {TYPE_CHECKS[param_type]}:",
+            f"    value = arguments[{key}] = _coerce_{param_type}({encode_string(tool_name)}, {key}, value)"
+        ]
+
+    constants = ""
+    if isinstance(enum, list) and enum:
+        constant = f"{constant_prefix}_{index}_ENUM"
+        members = ", ".join([python_literal(v) for v in enum])
+        try:
+            frozenset(enum)
+            constants = f"{constant} = frozenset(({members},))\n"
+        except TypeError:
+            constants = f"{constant} = ({members},)\n"
+        message = f"{tool_name}: argument '{field}' must be one of {', '.join([str(v) for v in enum])}, got "
+        checks += [
+            f"if value not in {constant}:",
+            f"    raise ToolArgumentError({encode_string(message)} + repr(value))"
+        ]
+
+    if param_type in ("integer", "number"):
+        for keyword, bound in range_bounds(param).items():
+            operator, wording = RANGE_CHECKS[keyword]
+            message = f"{tool_name}: argument '{field}' must be {wording} {bound}, got "
+            checks += [
+                f"if value {operator} {bound!r}:",
+                f"    raise ToolArgumentError({encode_string(message)} + repr(value))"
+            ]
+
+    if required:
+        missing = encode_string(f"{tool_name}: missing required argument '{field}'")
+        lines = [f"value = arguments.get({key})", "if value is None:", f"    raise ToolArgumentError({missing})", *checks]
+    elif checks:
+        lines = [f"value = arguments.get({key})", "if value is not None:", *[f"    {line}" for line in checks]]
+    else:
+        return "", ""
+
+    return constants, "".join([f"    {line}\n" for line in lines])
+
+
+def validator_name(tool_name: str) -> str:
+    """Name of the generated validator of a tool"""
+    return python_identifier("validate", tool_name)
+
+
+def render_validator(tool: dict) -> str:
+    """Render the specialized validation-and-coercion function of one tool"""
+    tool_name = str(tool.get("name", "example_tool"))
+    func_name = validator_name(tool_name)
+    constant_prefix = python_identifier("validate", tool_name, upper=True)
+
+    constants, checks = [], []
+    for index, param in enumerate(tool.get("parameters", [])):
+        param_constants, param_checks = render_parameter_check(tool_name, constant_prefix, index, param)
+        constants.append(param_constants)
+        checks.append(param_checks)
+
+    return VALIDATOR.render(
+        enum_constants="".join(constants),
+        func_name=func_name,
+        tool_name=tool_name,
+        not_object_message=encode_string(f"{tool_name}: arguments must be an object"),
+        checks="".join(checks)
+    )
@@ -7,15 +7,14 @@ A modern web interface with Claude AI integration for intelligent MCP server gen
 import asyncio
 import json
 import os
-import shutil
 import sys
-import tempfile
-import zipfile
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
@@ -52,7 +51,9 @@ sys.modules['mcp.types'].ImageContent = object
 sys.modules['mcp.types'].EmbeddedResource = object
 sys.modules['mcp.types'].LoggingLevel = object
 
-from server import MCPTemplate
+from server import MCPTemplate, generation_cache
+from archive import iter_zip, server_archive_files
+from batch import generate_batch, batch_archive_files, batch_status
 
 # Initialize FastAPI app
 app = FastAPI(title="MCP Generator Web UI", version="1.0.0")
@@ -66,6 +67,18 @@ templates_path.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 templates = Jinja2Templates(directory=str(templates_path))
 
+# Generated files waiting for download: zip filename -> {archive path: content}
+MAX_PREPARED_DOWNLOADS = 256
+prepared_downloads: OrderedDict[str, Dict[str, str]] = OrderedDict()
+
+
+def store_download(zip_filename: str, archive_files: Dict[str, str]) -> None:
+    """Keep generated files in memory for a later zip download"""
+    prepared_downloads[zip_filename] = archive_files
+    prepared_downloads.move_to_end(zip_filename)
+    while len(prepared_downloads) > MAX_PREPARED_DOWNLOADS:
+        prepared_downloads.popitem(last=False)
+
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -314,19 +327,8 @@ async def generate_with_claude_api(request: Dict[str, Any]):
                 "message": f"❌ {error}"
             }, status_code=500)
 
-        # Create temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        server_dir = temp_dir / name
-        server_dir.mkdir(parents=True, exist_ok=True)
-
-        # Write server.py
-        (server_dir / "server.py").write_text(code)
-
-        # Write requirements.txt
         requirements = "mcp>=1.0.0\nanthropic>=0.18.0\n"
-        (server_dir / "requirements.txt").write_text(requirements)
 
-        # Write README.md
         readme = f"""# {name}
 
 Generated by MCP Generator with Claude AI 🤖
@@ -374,18 +376,14 @@ The server communicates via stdio protocol.
 
 Generated with ❤️ by [MCP Generator](https://github.com/your-repo/mcp-generator)
 """
-        (server_dir / "README.md").write_text(readme)
 
-        # Create zip file
+        # Keep the files in memory until they are downloaded
         zip_filename = f"{name}.zip"
-        zip_path = temp_dir / zip_filename
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in server_dir.rglob('*'):
-                if file_path.is_file():
-                    zipf.write(file_path, file_path.relative_to(temp_dir))
-
-        # Store for download
-        temp_files[zip_filename] = str(zip_path)
+        store_download(zip_filename, server_archive_files(name, {
+            "server.py": code,
+            "requirements.txt": requirements,
+            "README.md": readme
+        }))
 
         return JSONResponse({
             "success": True,
@@ -426,49 +424,27 @@ async def generate_server(request: Dict[str, Any]):
         if not server_type:
             raise HTTPException(status_code=400, detail="Server type is required")
 
-        # Generate files based on server type
-        if server_type == "tool":
-            tools = config.get("tools", [])
-            files = MCPTemplate.basic_tool_server(name, description, tools)
-        elif server_type == "resource":
-            resources = config.get("resources", [])
-            files = MCPTemplate.resource_server(name, description, resources)
-        elif server_type == "full":
-            files = MCPTemplate.full_server(name, description, config)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown server type: {server_type}")
-
-        # Create temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        server_dir = temp_dir / name
-        server_dir.mkdir(parents=True, exist_ok=True)
-
-        # Write files
-        for filename, content in files.items():
-            (server_dir / filename).write_text(content)
+        # Generate files (served from the shared cache for repeated configs)
+        try:
+            files = MCPTemplate.generate(name, description, server_type, config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        # Create zip file
-        zip_path = temp_dir / f"{name}.zip"
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in server_dir.rglob('*'):
-                if file_path.is_file():
-                    zipf.write(file_path, file_path.relative_to(temp_dir))
+        # Keep the files in memory until they are downloaded
+        zip_filename = f"{name}.zip"
+        store_download(zip_filename, server_archive_files(name, files))
 
         return JSONResponse({
             "success": True,
             "message": f"Server '{name}' generated successfully!",
-            "download_url": f"/api/download/{zip_path.name}",
-            "files": list(files.keys()),
-            "temp_path": str(zip_path)
+            "download_url": f"/api/download/{zip_filename}",
+            "files": list(files.keys())
         })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# Store temp files for download
-temp_files = {}
-
 @app.post("/api/generate-and-prepare")
 async def generate_and_prepare(request: Dict[str, Any]):
     """Generate server and prepare for download"""
@@ -486,37 +462,15 @@ async def generate_and_prepare(request: Dict[str, Any]):
         if not server_type:
             raise HTTPException(status_code=400, detail="Server type is required")
 
-        # Generate files
-        if server_type == "tool":
-            tools = config.get("tools", [])
-            files = MCPTemplate.basic_tool_server(name, description, tools)
-        elif server_type == "resource":
-            resources = config.get("resources", [])
-            files = MCPTemplate.resource_server(name, description, resources)
-        elif server_type == "full":
-            files = MCPTemplate.full_server(name, description, config)
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown server type: {server_type}")
-
-        # Create temporary directory
-        temp_dir = Path(tempfile.mkdtemp())
-        server_dir = temp_dir / name
-        server_dir.mkdir(parents=True, exist_ok=True)
-
-        # Write files
-        for filename, content in files.items():
-            (server_dir / filename).write_text(content)
+        # Generate files (served from the shared cache for repeated configs)
+        try:
+            files = MCPTemplate.generate(name, description, server_type, config)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-        # Create zip file
+        # Keep the files in memory until they are downloaded
         zip_filename = f"{name}.zip"
-        zip_path = temp_dir / zip_filename
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in server_dir.rglob('*'):
-                if file_path.is_file():
-                    zipf.write(file_path, file_path.relative_to(temp_dir))
-
-        # Store for download
-        temp_files[zip_filename] = str(zip_path)
+        store_download(zip_filename, server_archive_files(name, files))
 
         return JSONResponse({
             "success": True,
@@ -532,24 +486,59 @@ async def generate_and_prepare(request: Dict[str, Any]):
         }, status_code=500)
 
 
-@app.get("/api/download/{filename}")
-async def download_file(filename: str):
-    """Download generated server zip file"""
-    if filename not in temp_files:
-        raise HTTPException(status_code=404, detail="File not found")
+@app.post("/api/generate-batch")
+async def generate_batch_api(request: Dict[str, Any]):
+    """Generate many servers in parallel and prepare one combined download"""
+    try:
+        servers = request.get("servers")
+
+        # Validation
+        if not isinstance(servers, list) or not servers:
+            raise HTTPException(status_code=400, detail="A non-empty 'servers' list is required")
+
+        results = await generate_batch(servers, cache=generation_cache)
+        succeeded = sum(1 for result in results if result["success"])
+
+        zip_filename = None
+        if succeeded:
+            zip_filename = f"mcp-servers-{uuid.uuid4().hex[:8]}.zip"
+            store_download(zip_filename, batch_archive_files(results))
+
+        return JSONResponse({
+            "success": succeeded == len(results),
+            "message": f"✅ Generated {succeeded}/{len(results)} servers",
+            "filename": zip_filename,
+            "results": batch_status(results)
+        })
 
-    file_path = temp_files[filename]
+    except HTTPException:
+        raise
+    except Exception as e:
+        return JSONResponse({
+            "success": False,
+            "message": f"❌ Error: {str(e)}"
+        }, status_code=500)
 
-    if not Path(file_path).exists():
+
+@app.get("/api/download/{filename}")
+async def download_file(filename: str):
+    """Stream the generated server zip, compressed on the fly from memory"""
+    if filename not in prepared_downloads:
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(
-        file_path,
+    return StreamingResponse(
+        iter_zip(prepared_downloads[filename]),
         media_type="application/zip",
-        filename=filename
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Generation cache hit/miss counters"""
+    return JSONResponse(generation_cache.stats())
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint"""